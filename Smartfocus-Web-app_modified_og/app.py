@@ -1,22 +1,30 @@
-from flask import Flask, render_template, request, jsonify, redirect, session,current_app
-import threading
+from flask import Flask, render_template, request, jsonify, redirect, session,current_app,Response
+from flask_sock import Sock
 import traceback
-import pandas as pd
 import os
-import csv
 import subprocess
 import sys
-from werkzeug.security import generate_password_hash,check_password_hash
 from datetime import datetime,timedelta
 
 from smart_focus.focus.no_camera import NoCameraFocusTracker
 from smart_focus.focus.camera import CameraFocusTracker
-from smart_focus.utils.logger import init_logger
-from smart_focus.analytics.graphs import build_focus_graph
-from smart_focus.analytics.reports import get_weekly_report, get_monthly_report
+from smart_focus.focus.registry import SessionRegistry
+from smart_focus.focus.inference import InferencePool
+from smart_focus.focus.frame_gate import DEFAULT_MAX_SKIP, DEFAULT_THRESHOLD
+from smart_focus.utils.logger import init_logger, on_session_logged, flush_logger
+from smart_focus.analytics.cache import AnalyticsCache
+from smart_focus.analytics.dashboard import build_analytics
+from smart_focus.analytics.curves import DEFAULT_RESOLUTION, curve_cache_info, session_curve
 from smart_focus.utils.distraction_detector import DistractionDetector
-from smart_focus.analytics.reports import get_focus_heatmap
-from smart_focus.database.db import init_db, get_connection
+from smart_focus.utils.title_rules import title_rules
+from smart_focus.utils.notifier import DEFAULT_BACKENDS, make_backends, notifier, alert_inbox
+from smart_focus.utils.hashing import HASH_METHOD, HasherBusy, PasswordHasher
+from smart_focus.database.db import init_db, db_path, connect
+from smart_focus.database.users import UserStore, migrate_users_csv
+from smart_focus.database.export import FORMATS, export
+from smart_focus.database.import_csv import migrate_timeline_csv
+from smart_focus.database.history import session_page, user_activities
+from smart_focus.database.notes import NoteStore, migrate_notes_json, PAGE_SIZE as NOTES_PAGE_SIZE
 
 def format_time(seconds):
     seconds=int(seconds)
@@ -45,17 +53,72 @@ def get_focus_label(score):
 # ---------------------------
 app = Flask(__name__)
 app.secret_key = "smartfocus-secret-key"
+sock = Sock(app)
+
+# Frame change gate (per deployment; threshold 0 turns it off)
+app.config["FRAME_GATE_THRESHOLD"] = float(os.environ.get("SMARTFOCUS_FRAME_GATE_THRESHOLD", DEFAULT_THRESHOLD))
+app.config["FRAME_GATE_MAX_SKIP"] = int(os.environ.get("SMARTFOCUS_FRAME_GATE_MAX_SKIP", DEFAULT_MAX_SKIP))
 
 DATA_DIR = os.path.join(app.root_path, "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
-init_logger(DATA_DIR)
+init_db(db_path(DATA_DIR))
+
+# Status transitions live in timeline_events (timeline.csv is imported once)
+migrate_timeline_csv(DATA_DIR)
+
+# Computed analytics per user, dropped when that user logs a session
+analytics_cache = AnalyticsCache()
+on_session_logged(analytics_cache.invalidate)
+
+# write_behind (default) or sync; the CSV files are optional exports
+init_logger(
+    DATA_DIR,
+    mode=os.environ.get("SMARTFOCUS_LOG_MODE", "write_behind"),
+    sessions_csv=os.environ.get("SMARTFOCUS_SESSIONS_CSV") == "1",
+    timeline_csv=os.environ.get("SMARTFOCUS_TIMELINE_CSV") == "1"
+)
+
+# One running session per logged-in user
+registry = SessionRegistry()
+registry.start_reaper()
+
+# Shared FaceMesh workers, started on the first camera session
+# (not at import: spawned worker processes re-import this module)
+inference_pool = InferencePool()
+
+# Users allowed to export everyone's data (comma-separated names)
+ADMINS = {u.strip() for u in os.environ.get("SMARTFOCUS_ADMINS", "").split(",") if u.strip()}
+
+def admin_denied():
+    """Error response unless an admin is logged in (None if allowed)."""
+    if "user" not in session:
+        return redirect("/login")
+    if session["user"] not in ADMINS:
+        return jsonify({"status": "forbidden"}), 403
+    return None
+
+# Rows per page on /history, /activity and /api/sessions
+HISTORY_PAGE_SIZE = 25
+
+# Accounts live in smartfocus.db (users.csv is imported once)
+migrate_users_csv(DATA_DIR)
+users = UserStore(DATA_DIR)
+
+# Password hashing runs on its own bounded pool, not request threads
+hasher = PasswordHasher(method=os.environ.get("SMARTFOCUS_HASH_METHOD", HASH_METHOD))
+
+# Hub notes (notes_<user>.json files are imported once)
+migrate_notes_json(DATA_DIR)
+notes = NoteStore(DATA_DIR)
+
+# Distraction rules per deployment, re-read when the file changes
+title_rules.load(os.environ.get("SMARTFOCUS_TITLE_RULES", os.path.join(DATA_DIR, "title_rules.json")))
 
-tracker = None
-session_result = None
-session_thread = None
+# Alert delivery: any of sound, desktop, web, log (comma-separated)
+notifier.set_backends(make_backends(os.environ.get("SMARTFOCUS_NOTIFY_BACKENDS", DEFAULT_BACKENDS)))
 
-USERS_FILE = os.path.join(DATA_DIR, "users.csv")
+TOO_MANY_ATTEMPTS = ("Too many attempts, please try again in a moment", 429)
 
 # ---------------------------
 # ROOT → redirect based on auth
@@ -79,31 +142,17 @@ def register():
         confirm_password=request.form["confirm_password"]
         if password != confirm_password:
             return "Passwords do not match"
-        hashed_password=generate_password_hash(password)
-
-        # Create file with header if not exists
-        file_exists = os.path.exists(USERS_FILE)
-        if file_exists:
-            with open(USERS_FILE, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    if row["user"] == user:
-                        return "User already exists"
-
-        with open(USERS_FILE, "a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow([
-                    "user",
-                    "email",
-                    "password"
-                ])
-            writer.writerow([
-                user,
-                email,
-                hashed_password
-                
-            ])
+        if users.exists(user):
+            return "User already exists"
+
+        try:
+            hashed_password=hasher.hash(password, request.remote_addr, user)
+        except HasherBusy:
+            return TOO_MANY_ATTEMPTS
+
+        # UNIQUE index settles concurrent sign-ups for the same name
+        if not users.create(user, email, hashed_password):
+            return "User already exists"
 
         return redirect("/login")
 
@@ -117,17 +166,25 @@ def login():
     if request.method == "POST":
         user = request.form["user"].strip().lower().replace(" ", "")
         password=request.form['password']
-        if not os.path.exists(USERS_FILE):
-            return redirect("/register")
-
-        with open(USERS_FILE, newline="", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row['user']==user and check_password_hash(row['password'],password):
-                    session['user']=user
-                    return redirect("/hub")
-
-        return "Invalid username or password"
+        account = users.get(user)
+        if not account:
+            # No accounts yet: sign up first
+            if not users.any():
+                return redirect("/register")
+            return "Invalid username or password"
+
+        try:
+            if not hasher.verify(account['password'], password, request.remote_addr, user):
+                return "Invalid username or password"
+
+            # Upgrade hashes made with older / different parameters
+            if hasher.needs_rehash(account['password']):
+                users.set_password(user, hasher.rehash(password, request.remote_addr, user))
+        except HasherBusy:
+            return TOO_MANY_ATTEMPTS
+
+        session['user']=user
+        return redirect("/hub")
 
     return render_template("login.html")
 
@@ -137,42 +194,49 @@ def hub():
         return redirect("/login")
 
     user = session["user"]
-    sessions_file = os.path.join(DATA_DIR, "sessions.csv")
 
     today_focus = 0
     weekly_avg = 0
     last_score = 0
     streak = 0
 
-    if os.path.exists(sessions_file):
-        df = pd.read_csv(sessions_file)
-        user_df = df[df["user"] == user]
-
-        if not user_df.empty:
-
-            last_score = int(user_df.iloc[-1]["focus_score"])
-
-            user_df["date"] = pd.to_datetime(user_df["timestamp"]).dt.date
+    conn = connect(DATA_DIR)
+
+    last = conn.execute("""
+    SELECT focus_score FROM sessions
+    WHERE user=? ORDER BY timestamp DESC LIMIT 1
+    """, (user,)).fetchone()
+
+    if last:
+        last_score = int(last["focus_score"])
+
+        today = datetime.now().date()
+
+        # Newest day first; the streak only needs the first few rows
+        days = conn.execute("""
+        SELECT date, focused_seconds FROM daily_focus
+        WHERE user=? ORDER BY date DESC
+        """, (user,))
+
+        current = today
+        for row in days:
+            if row["date"] == today.strftime("%Y-%m-%d"):
+                today_focus = format_time(int(row["focused_seconds"]))
+            if row["date"] == current.strftime("%Y-%m-%d"):
+                streak += 1
+                current = current - timedelta(days=1)
+            else:
+                break
+
+        last7 = conn.execute("""
+        SELECT AVG(focused_seconds) FROM (
+            SELECT focused_seconds FROM sessions
+            WHERE user=? ORDER BY timestamp DESC LIMIT 7
+        )
+        """, (user,)).fetchone()[0]
+        weekly_avg = format_time(int(last7))
 
-            today = datetime.now().date()
-            today_df = user_df[user_df["date"] == today]
-
-            if not today_df.empty:
-                today_focus = format_time(int(today_df["focused_seconds"].sum()))
-
-            last7 = user_df.tail(7)
-            weekly_avg = format_time(int(last7["focused_seconds"].mean()))
-
-            user_df = user_df.sort_values("date", ascending=False)
-            dates = user_df["date"].unique()
-
-            current = today
-            for d in dates:
-                if d == current:
-                    streak += 1
-                    current = current - timedelta(days=1)
-                else:
-                    break
+    conn.close()
 
     return render_template(
         "hub.html",
@@ -187,25 +251,17 @@ def analytics_dashboard():
     if "user" not in session:
         return redirect("/login")
 
-    graph_data = build_focus_graph(DATA_DIR, session["user"])
-    weekly = get_weekly_report(DATA_DIR, session["user"])
-    monthly = get_monthly_report(DATA_DIR, session["user"])
-    heatmap=get_focus_heatmap(DATA_DIR,session['user'])
+    return render_template("analytics.html", **get_analytics(session["user"]))
 
-    records = []
-    sessions_file = os.path.join(DATA_DIR, "sessions.csv")
-    if os.path.exists(sessions_file):
-        df = pd.read_csv(sessions_file)
-        records = df[df["user"] == session["user"]].to_dict(orient="records")
+def get_analytics(user):
+    return analytics_cache.get(user, lambda: build_analytics(DATA_DIR, user))
 
-    return render_template(
-        "analytics.html",
-        graph_data=graph_data,
-        weekly=weekly,
-        monthly=monthly,
-        heatmap=heatmap,
-        records=records
-    )
+@app.route("/analytics-cache-stats")
+def analytics_cache_stats():
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify({**analytics_cache.stats(), "session_curves": curve_cache_info()})
 
 # ---------------------------
 # DASHBOARD (MAIN APP)
@@ -234,26 +290,33 @@ def logout():
 # ---------------------------
 @app.route("/start", methods=["POST"])
 def start():
-    global tracker, session_result, session_thread,detector
-    if tracker is not None:
-        return jsonify({"status":"already_running"})
     try:
         if "user" not in session:
             return jsonify({"status": "not_logged_in"}), 401
 
-        data = request.get_json(force=True)
         user = session["user"]
+        if user in registry:
+            return jsonify({"status":"already_running"})
+
+        data = request.get_json(force=True)
         goal_seconds = int(data.get("goal_seconds", 0))
         goal_hours = goal_seconds / 3600
         mode = data.get("mode", "").strip().lower()
         activity=data.get("activity","general")
         topic=data.get('topic','').lower()
 
-        session_result = None
         print(f"▶ Starting session | user={user}, goal={goal_seconds}, mode={mode}")
 
         if mode == "camera":
-            tracker = CameraFocusTracker(user, goal_hours,activity=activity,topic=topic)
+            tracker = CameraFocusTracker(
+                user,
+                goal_hours,
+                activity=activity,
+                topic=topic,
+                pool=inference_pool.start(),
+                gate_threshold=app.config["FRAME_GATE_THRESHOLD"],
+                gate_max_skip=app.config["FRAME_GATE_MAX_SKIP"]
+            )
         else:
             tracker = NoCameraFocusTracker(
                 user,
@@ -263,47 +326,56 @@ def start():
                 activity=activity,
                 topic=topic
             )
-            session_thread = threading.Thread(
-                target=run_session,
-                daemon=True
-            )
-            session_thread.start()
-        return jsonify({"status": "started"})
+
+        entry = registry.add(user, tracker)
+        if entry is None:
+            # Lost a race with a parallel /start for the same user
+            tracker.running = False
+            return jsonify({"status":"already_running"})
+
+        # No-camera: listeners + shared scheduler tick, returns at once
+        if not isinstance(tracker, CameraFocusTracker):
+            tracker.start()
+
+        session["session_id"] = entry.session_id
+        return jsonify({"status": "started", "session_id": entry.session_id})
 
     except Exception as e:
         traceback.print_exc()
         return jsonify({"status": "error", "message": str(e)}), 500
 
-def run_session():
-    global session_result, tracker
-    try:
-        with app.app_context():
-            if tracker and not isinstance(tracker, CameraFocusTracker):
-                tracker.start()
-    except Exception:
-        traceback.print_exc()
+def current_tracker():
+    """Tracker of the logged-in user's running session (or None)."""
+    if "user" not in session:
+        return None
+    return registry.get_tracker(session["user"], session.get("session_id"))
 
 # ---------------------------
 # STOP SESSION
 # ---------------------------
 @app.route("/stop", methods=["POST"])
 def stop():
-    global tracker, session_result
     print("Stop route hit ")
-    if tracker:
-        print('tracker exists')
-        session_result = tracker.stop()
-        print('session result:')
-        tracker = None
+    if "user" not in session:
+        return jsonify({"status": "not_logged_in"}), 401
+
+    user = session["user"]
+    session_result = registry.stop(user, session.get("session_id"))
+    if session_result is None:
+        session_result = registry.get_result(user)
     return jsonify({"status": "stopped", "result": session_result})
 
 @app.route("/live-stats")
 def live_stats():
-    global tracker
+    tracker = current_tracker()
 
     if not tracker:
         return jsonify({"status": "no_session","auto_stopped":False})
 
+    return jsonify(build_live_stats(tracker))
+
+def build_live_stats(tracker):
+    """Live stats payload (consumes any pending alert)."""
     session_obj = tracker.session
 
     response= {
@@ -311,19 +383,22 @@ def live_stats():
         "distracted_seconds": int(session_obj.distracted_seconds),
         "focus_score": session_obj.calculate_score(),
         "auto_stopped":getattr(tracker,"auto_stopped",False),
-        "alert":getattr(tracker,"alert_message",None)
+        "alert":alert_inbox.pop(tracker.session.user_name)
     }
-    tracker.alert_message=None
     if getattr(tracker,"auto_stopped",False):
         response['result']=getattr(tracker,"last_summary",None)
-    return jsonify(response)
+    return response
 
 # ---------------------------
 # RESULT
 # ---------------------------
 @app.route("/result")
 def result():
-    global tracker,session_result
+    if "user" not in session:
+        return redirect("/login")
+
+    tracker = current_tracker()
+    session_result = registry.get_result(session["user"])
     result_data=None
     alert_message=None
     
@@ -350,34 +425,146 @@ def graph():
     if "user" not in session:
         return redirect("/login")
 
-    graph_data = build_focus_graph(DATA_DIR, session["user"])
+    graph_data = get_analytics(session["user"])["graph_data"]
     return render_template("graph.html", graph_data=graph_data)
 
 # ---------------------------
 # HISTORY
 # ---------------------------
+def session_filters():
+    """cursor / activity / mode / limit query args shared by the history views."""
+    return {
+        "cursor": request.args.get("cursor") or None,
+        "activity": request.args.get("activity") or None,
+        "mode": request.args.get("mode") or None,
+        "limit": request.args.get("limit", HISTORY_PAGE_SIZE, type=int)
+    }
+
 @app.route("/history")
 def history():
-    if not os.path.exists(os.path.join(DATA_DIR, "sessions.csv")):
-        return render_template("history.html", records=[])
+    if "user" not in session:
+        return redirect("/login")
 
-    df = pd.read_csv(os.path.join(DATA_DIR, "sessions.csv"))
-    return render_template("history.html", records=df.to_dict(orient="records"))
+    filters = session_filters()
+    try:
+        records, next_cursor = session_page(DATA_DIR, session["user"], **filters)
+    except ValueError:
+        return "Invalid cursor", 400
+
+    return render_template(
+        "history.html",
+        records=records,
+        next_cursor=next_cursor,
+        filters=filters
+    )
+
+@app.route("/session-curve/<int:session_id>")
+def session_curve_data(session_id):
+    """Per-bucket focus of one session; ?resolution=<seconds> (default 60)."""
+    if "user" not in session:
+        return jsonify({"status": "not_logged_in"}), 401
+
+    resolution = request.args.get("resolution", DEFAULT_RESOLUTION, type=int)
+    curve = session_curve(DATA_DIR, session["user"], session_id, resolution)
+    if curve is None:
+        return jsonify({"status": "not_found"}), 404
+
+    return jsonify(curve)
+
+@app.route("/api/sessions")
+def api_sessions():
+    """JSON variant of /history: ?cursor=&activity=&mode=&limit="""
+    if "user" not in session:
+        return jsonify({"status": "not_logged_in"}), 401
+
+    try:
+        records, next_cursor = session_page(DATA_DIR, session["user"], **session_filters())
+    except ValueError:
+        return jsonify({"status": "bad_cursor"}), 400
+
+    return jsonify({"sessions": records, "next_cursor": next_cursor})
 
 # ---------------------------
 # CAMERA FRAME
 # ---------------------------
 @app.route("/frame", methods=["POST"])
 def receive_frame():
+    """
+    Accepts a camera frame as either
+      - raw JPEG/WebP bytes (application/octet-stream, image/*)
+      - multipart form upload with a `frame` Blob
+      - legacy JSON {"frame": "data:image/jpeg;base64,..."}
+    """
+    tracker = current_tracker()
     if not tracker or not isinstance(tracker, CameraFocusTracker):
         return jsonify({"status": "no camera session"})
 
-    data = request.get_json()
-    frame = data.get("frame")
-    if not frame:
+    if request.mimetype == "application/json":
+        data = request.get_json()
+        frame = data.get("frame")
+        if not frame:
+            return jsonify({"status": "no frame"})
+        return jsonify(tracker.process_frame(frame))
+
+    if request.mimetype == "multipart/form-data":
+        blob = request.files.get("frame")
+        buf = blob.read() if blob else b""
+    else:
+        buf = request.get_data(cache=False)
+
+    if not buf:
         return jsonify({"status": "no frame"})
 
-    return jsonify(tracker.process_frame(frame))
+    return jsonify(tracker.process_frame_bytes(buf))
+
+@app.route("/auth-metrics")
+def auth_metrics():
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify(hasher.metrics())
+
+@app.route("/inference-metrics")
+def inference_metrics():
+    denied = admin_denied()
+    if denied:
+        return denied
+    return jsonify(inference_pool.metrics())
+
+# ---------------------------
+# CAMERA STREAM (WebSocket)
+# ---------------------------
+# How often the socket wakes up to check for new stats
+STREAM_PUSH_INTERVAL = 0.25
+
+@sock.route("/stream")
+def stream(ws):
+    """
+    One persistent channel per camera session.
+      up:   binary messages = raw JPEG/WebP frames
+      down: JSON stats, pushed whenever they change
+    """
+    entry = registry.get(session["user"], session.get("session_id")) if "user" in session else None
+    tracker = entry.tracker if entry else None
+    if not tracker or not isinstance(tracker, CameraFocusTracker):
+        ws.send(json.dumps({"status": "no camera session"}))
+        return
+
+    last_sent = None
+    while True:
+        msg = ws.receive(timeout=STREAM_PUSH_INTERVAL)
+        # The open stream replaces /live-stats polling: keep the reaper away
+        entry.touch()
+        if isinstance(msg, (bytes, bytearray)) and msg:
+            tracker.process_frame_bytes(msg)
+
+        payload = {**tracker.stats(), **build_live_stats(tracker)}
+        if payload != last_sent:
+            ws.send(json.dumps(payload))
+            last_sent = payload
+
+        if not tracker.running:
+            break
 
 # ---------------------------
 # WEEKLY REPORT
@@ -387,7 +574,7 @@ def weekly_report():
     if "user" not in session:
         return redirect("/login")
 
-    report = get_weekly_report(DATA_DIR, session["user"])
+    report = get_analytics(session["user"])["weekly"]
     return render_template("weekly.html", report=report)
 
 # ---------------------------
@@ -398,11 +585,10 @@ def monthly_report():
     if "user" not in session:
         return redirect("/login")
 
-    report = get_monthly_report(DATA_DIR, session["user"])
+    report = get_analytics(session["user"])["monthly"]
     return render_template("monthly.html", report=report)
 
 import json
-from datetime import datetime
 
 @app.route("/save-note", methods=["POST"])
 def save_note():
@@ -416,41 +602,22 @@ def save_note():
     if not content:
         return jsonify({"status": "empty"}), 400
 
-    file_path = os.path.join(DATA_DIR, f"notes_{user}.json")
-
-    notes = []
-
-    if os.path.exists(file_path):
-        with open(file_path, "r") as f:
-            notes = json.load(f)
-
-    note = {
-        "id": len(notes) + 1,
-        "content": content,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")
-    }
-
-    notes.append(note)
-
-    with open(file_path, "w") as f:
-        json.dump(notes, f, indent=4)
+    note = notes.add(user, content)
 
-    return jsonify({"status": "saved"})
+    return jsonify({"status": "saved", "note": note})
 
 
 @app.route("/get-notes")
 def get_notes():
+    """Newest first; pass ?before=<next_before> for the next page."""
     if "user" not in session:
-        return jsonify([])
+        return jsonify({"notes": [], "next_before": None})
 
-    user = session["user"]
-    file_path = os.path.join(DATA_DIR, f"notes_{user}.json")
-
-    if os.path.exists(file_path):
-        with open(file_path, "r") as f:
-            return jsonify(json.load(f))
+    before = request.args.get("before", type=int)
+    limit = request.args.get("limit", NOTES_PAGE_SIZE, type=int)
 
-    return jsonify([])
+    page, next_before = notes.page(session["user"], before, limit)
+    return jsonify({"notes": page, "next_before": next_before})
 
 
 @app.route("/delete-note/<int:note_id>", methods=["POST"])
@@ -458,67 +625,73 @@ def delete_note(note_id):
     if "user" not in session:
         return jsonify({"status": "not_logged_in"}), 401
 
-    user = session["user"]
-    file_path = os.path.join(DATA_DIR, f"notes_{user}.json")
-
-    if not os.path.exists(file_path):
+    if not notes.delete(session["user"], note_id):
         return jsonify({"status": "not_found"}), 404
 
-    with open(file_path, "r") as f:
-        notes = json.load(f)
-
-    notes = [n for n in notes if n["id"] != note_id]
-
-    with open(file_path, "w") as f:
-        json.dump(notes, f, indent=4)
-
     return jsonify({"status": "deleted"})
 
-@app.route("/activity")
-def activity():
-
+# ---------------------------
+# EXPORT (streamed CSV / Parquet)
+# ---------------------------
+@app.route("/export/<table>")
+def export_data(table):
+    """
+    /export/sessions or /export/timeline
+      ?format=csv|parquet  &start=YYYY-MM-DD  &end=YYYY-MM-DD
+      ?user=<name>|all     (admins only; default is your own data)
+    """
     if "user" not in session:
         return redirect("/login")
 
-    import sqlite3
+    user = session["user"]
+    requested = request.args.get("user")
+    if requested and requested != user:
+        if user not in ADMINS:
+            return jsonify({"status": "forbidden"}), 403
+        user = None if requested == "all" else requested
 
-    conn = sqlite3.connect(os.path.join(DATA_DIR,"smartfocus.db"))
-    conn.row_factory = sqlite3.Row
-    cur = conn.cursor()
+    fmt = request.args.get("format", "csv")
 
-    activity = request.args.get("activity")
+    # timeline rows may still be queued in the write-behind logger
+    if table == "timeline" and not flush_logger():
+        print("export: timeline may miss events still queued in the logger")
 
-    cur.execute("""
-    SELECT DISTINCT activity
-    FROM sessions
-    WHERE user=?
-    """,(session["user"],))
+    try:
+        stream = export(
+            DATA_DIR, table, fmt, user,
+            request.args.get("start"), request.args.get("end")
+        )
+    except (ValueError, RuntimeError) as e:
+        return jsonify({"status": "error", "error": str(e)}), 400
+
+    mimetype, ext = FORMATS[fmt]
+    filename = f"{table}_{user or 'all'}.{ext}"
+    return Response(
+        stream,
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
 
-    activities = [row["activity"] for row in cur.fetchall()]
+@app.route("/activity")
+def activity():
 
-    if activity:
-        cur.execute("""
-        SELECT *
-        FROM sessions
-        WHERE user=? AND activity=?
-        ORDER BY timestamp DESC
-        """,(session["user"],activity))
-    else:
-        cur.execute("""
-        SELECT *
-        FROM sessions
-        WHERE user=?
-        ORDER BY timestamp DESC
-        """,(session["user"],))
+    if "user" not in session:
+        return redirect("/login")
 
-    sessions = cur.fetchall()
+    filters = session_filters()
+    try:
+        sessions, next_cursor = session_page(DATA_DIR, session["user"], **filters)
+    except ValueError:
+        return "Invalid cursor", 400
 
-    conn.close()
+    activities = user_activities(DATA_DIR, session["user"])
 
     return render_template(
         "activity.html",
         sessions=sessions,
-        activities=activities
+        activities=activities,
+        next_cursor=next_cursor,
+        filters=filters
     )
 
 @app.route("/platform-analytics")
@@ -527,33 +700,25 @@ def platform_analytics():
     if "user" not in session:
         return redirect("/login")
 
-    import sqlite3
-    import pandas as pd
-
-    conn = sqlite3.connect(os.path.join(DATA_DIR,"smartfocus.db"))
-
-    df = pd.read_sql_query(
-        "SELECT * FROM sessions WHERE user=?",
-        conn,
-        params=(session["user"],)
-    )
-
+    conn = connect(DATA_DIR)
+    rows = conn.execute("""
+    SELECT activity, sessions,
+           focused_seconds / 60.0 AS total_focus,
+           CAST(score_total AS REAL) / sessions AS avg_score
+    FROM activity_focus
+    WHERE user=?
+    ORDER BY activity
+    """, (session["user"],)).fetchall()
     conn.close()
 
-    if df.empty:
+    if not rows:
         return render_template("platform.html", data=None)
 
-    df["focused_minutes"] = df["focused_seconds"] / 60
-
-    result = df.groupby("activity").agg(
-        sessions=("activity","count"),
-        total_focus=("focused_minutes","sum"),
-        avg_score=("focus_score","mean")
-    ).reset_index()
+    result = [dict(r) for r in rows]
 
     return render_template(
         "platform.html",
-        data=result.to_dict(orient="records")
+        data=result
     )
 
 # ---------------------------
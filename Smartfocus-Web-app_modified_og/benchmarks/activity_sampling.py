@@ -0,0 +1,60 @@
+"""
+Input-event cost: per-event status logic vs ActivitySampler.
+
+Replays a burst of mouse-move events through the old on_activity path
+(timestamp + _set_status on every event) and through the sampler
+callback, and reports the cost per event on the listener thread.
+
+Run from the app folder:
+    python -m benchmarks.activity_sampling
+"""
+
+import time
+
+from smart_focus.focus.activity import ActivitySampler
+
+
+EVENTS = 500000
+
+
+class LegacyTracker:
+    """The per-event path NoCameraFocusTracker used before the sampler."""
+
+    def __init__(self):
+        self.last_activity_time = 0.0
+        self.last_status = None
+        self.is_idle = False
+
+    def on_activity(self, *args):
+        self.last_activity_time = time.time()
+        if self.is_idle:
+            self.is_idle = False
+        self._set_status("Focused")
+
+    def _set_status(self, status):
+        status = status.strip().capitalize()
+        if status != self.last_status:
+            self.last_status = status
+
+
+def per_event_ns(callback):
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        callback(i, i)
+    return (time.perf_counter() - start) * 1e9 / EVENTS
+
+
+def main():
+    legacy = per_event_ns(LegacyTracker().on_activity)
+
+    sampler = ActivitySampler()
+    sampled = per_event_ns(sampler.on_mouse)
+    sampler.sample()
+
+    print(f"{EVENTS} mouse events")
+    print(f"  on_activity  {legacy:6.0f} ns/event")
+    print(f"  sampler      {sampled:6.0f} ns/event   (counted {sampler.mouse_events})")
+
+
+if __name__ == "__main__":
+    main()
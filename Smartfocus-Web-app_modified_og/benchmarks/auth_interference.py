@@ -0,0 +1,72 @@
+"""
+Login burst vs live traffic: inline hashing vs PasswordHasher pool.
+
+A "live session" thread does a small CPU job every 20 ms (stand-in for
+/frame and /stats work) while LOGINS threads each hash one password.
+Prints the live job's latency histogram for both modes.
+
+Run from the app folder:
+    python -m benchmarks.auth_interference
+"""
+
+import threading
+import time
+
+from werkzeug.security import generate_password_hash
+
+from smart_focus.utils.hashing import HASH_METHOD, LatencyHistogram, PasswordHasher
+
+
+LOGINS = 16
+LIVE_PERIOD = 0.02
+
+
+def live_work():
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+
+def run(name, hash_fn):
+    hist = LatencyHistogram()
+    done = threading.Event()
+
+    def live():
+        while not done.is_set():
+            start = time.perf_counter()
+            live_work()
+            hist.record(time.perf_counter() - start)
+            time.sleep(LIVE_PERIOD)
+
+    live_thread = threading.Thread(target=live)
+    live_thread.start()
+    time.sleep(0.2)
+
+    start = time.perf_counter()
+    logins = [threading.Thread(target=hash_fn, args=(f"password{i}",)) for i in range(LOGINS)]
+    for t in logins:
+        t.start()
+    for t in logins:
+        t.join()
+    burst = time.perf_counter() - start
+
+    done.set()
+    live_thread.join()
+
+    snap = hist.snapshot()
+    print(f"{name:<7} burst {burst:5.2f} s   live avg {snap['avg_ms']:6.2f} ms")
+    print("        " + "  ".join(f"{k}:{v}" for k, v in snap["buckets"].items() if v))
+
+
+def main():
+    print(f"{LOGINS} concurrent logins ({HASH_METHOD})")
+    run("inline", lambda pw: generate_password_hash(pw, method=HASH_METHOD))
+
+    hasher = PasswordHasher(max_pending=LOGINS)
+    run("pool", hasher.hash)
+    print(f"pool workers={hasher.workers}  {hasher.metrics()['queue_wait']}")
+
+
+if __name__ == "__main__":
+    main()
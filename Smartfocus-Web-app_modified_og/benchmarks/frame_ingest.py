@@ -0,0 +1,62 @@
+"""
+Frame ingestion benchmark: base64 JSON vs raw JPEG bytes.
+
+Compares bytes on the wire and server CPU per frame for the two
+/frame modes (decode only, FaceMesh excluded).
+
+Run from the app folder:
+    python -m benchmarks.frame_ingest
+"""
+
+import base64
+import json
+import time
+
+import cv2
+import numpy as np
+
+from smart_focus.focus.camera import decode_frame_base64, decode_frame_bytes
+
+
+FRAMES = 200
+WIDTH, HEIGHT = 640, 480
+
+
+def make_frame():
+    # Smooth gradient + noise compresses roughly like a webcam image
+    y, x = np.mgrid[0:HEIGHT, 0:WIDTH]
+    img = np.stack([x % 256, y % 256, (x + y) % 256], axis=-1).astype(np.uint8)
+    noise = np.random.default_rng(0).integers(0, 24, img.shape, dtype=np.uint8)
+    return cv2.add(img, noise)
+
+
+def bench(label, payload, decode):
+    start = time.process_time()
+    for _ in range(FRAMES):
+        frame = decode(payload)
+    cpu_ms = (time.process_time() - start) * 1000 / FRAMES
+    assert frame is not None and frame.shape == (HEIGHT, WIDTH, 3)
+    print(f"{label:<10} {len(payload):>10} B/frame {cpu_ms:>8.3f} ms CPU/frame")
+    return cpu_ms
+
+
+def main():
+    ok, jpeg = cv2.imencode(".jpg", make_frame())
+    jpeg = jpeg.tobytes()
+
+    data_url = "data:image/jpeg;base64," + base64.b64encode(jpeg).decode()
+    json_body = json.dumps({"frame": data_url}).encode()
+
+    def decode_json(body):
+        return decode_frame_base64(json.loads(body)["frame"])
+
+    print(f"{FRAMES} frames, {WIDTH}x{HEIGHT} JPEG")
+    b64_ms = bench("base64", json_body, decode_json)
+    raw_ms = bench("binary", jpeg, decode_frame_bytes)
+
+    print(f"wire size: {len(jpeg) / len(json_body):.2%} of base64")
+    print(f"cpu time:  {raw_ms / b64_ms:.2%} of base64")
+
+
+if __name__ == "__main__":
+    main()
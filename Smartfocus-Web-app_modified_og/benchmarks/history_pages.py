@@ -0,0 +1,87 @@
+"""
+History pagination benchmark: first vs deep pages.
+
+Fills a temp database with N sessions for one user (plus noise from
+other users) and times session_page() at the start and near the end.
+
+Run from the app folder:
+    python -m benchmarks.history_pages
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from smart_focus.database.db import init_db
+from smart_focus.database.history import session_page
+
+
+SIZES = [1000, 10000, 100000]
+ACTIVITIES = ["coding", "leetcode", "reading", "general"]
+REPEAT = 50
+
+
+def fill(data_dir, n):
+    start = datetime(2024, 1, 1)
+    rows = []
+    for i in range(n):
+        for user in ("bench", f"other{i % 10}"):
+            rows.append((
+                (start + timedelta(minutes=30 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                user,
+                "camera" if i % 2 else "no-camera",
+                ACTIVITIES[i % len(ACTIVITIES)],
+                1.0, 1500, 300, 25, 60, i % 3 == 0, 1800
+            ))
+
+    conn = sqlite3.connect(os.path.join(data_dir, "smartfocus.db"))
+    with conn:
+        conn.executemany("""
+        INSERT INTO sessions (
+            timestamp, user, mode, activity, goal_hours, focused_seconds,
+            distracted_seconds, focused_minutes, focus_score, goal_achieved,
+            total_seconds
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    conn.close()
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def deep_cursor(data_dir, **filters):
+    # Walk to roughly the last page once, return its cursor
+    cursor, last = None, None
+    while True:
+        _, cursor = session_page(data_dir, "bench", cursor, limit=200, **filters)
+        if cursor is None:
+            return last
+        last = cursor
+
+
+def run(n):
+    with tempfile.TemporaryDirectory() as data_dir:
+        init_db(os.path.join(data_dir, "smartfocus.db"))
+        fill(data_dir, n)
+
+        for label, filters in (("all", {}), ("activity", {"activity": "coding"})):
+            deep = deep_cursor(data_dir, **filters)
+            first_ms = timed_ms(lambda: session_page(data_dir, "bench", **filters))
+            deep_ms = timed_ms(lambda: session_page(data_dir, "bench", deep, **filters))
+            print(f"{n:>7} sessions  {label:<9} first page {first_ms:6.2f} ms   last page {deep_ms:6.2f} ms")
+
+
+def main():
+    for n in SIZES:
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
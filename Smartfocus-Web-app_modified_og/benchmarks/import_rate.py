@@ -0,0 +1,88 @@
+"""
+Importer benchmark: rows/s and peak memory for a large sessions.csv,
+plus an interrupted run that resumes from its checkpoint.
+
+Run from the app folder:
+    python -m benchmarks.import_rate
+"""
+
+import csv
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from unittest import mock
+
+from smart_focus.database import import_csv as importer
+from smart_focus.database.import_csv import import_csv
+
+
+ROWS = 500000
+CHUNK_ROWS = 50000
+
+
+def write_sessions_csv(path, n):
+    start = datetime(2023, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "timestamp", "user", "mode", "activity", "goal_hours",
+            "focused_seconds", "distracted_seconds", "focused_minutes",
+            "focus_score", "goal_achieved", "total_seconds"
+        ])
+        for i in range(n):
+            writer.writerow([
+                (start + timedelta(seconds=97 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+                f"user{i % 500}", "camera", "coding", 1.0,
+                1500, 300, 25, 83, i % 3 == 0, 1800
+            ])
+
+
+def count(data_dir):
+    conn = sqlite3.connect(os.path.join(data_dir, "smartfocus.db"))
+    n = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+    conn.close()
+    return n
+
+
+def main():
+    with tempfile.TemporaryDirectory() as data_dir:
+        csv_path = os.path.join(data_dir, "sessions.csv")
+        write_sessions_csv(csv_path, ROWS)
+        print(f"{ROWS} rows, {os.path.getsize(csv_path) / 1e6:.0f} MB csv")
+
+        # 1) Interrupted after the second chunk, then resumed
+        real_save = importer._save_checkpoint
+        calls = []
+
+        def save_then_crash(path, checkpoint):
+            real_save(path, checkpoint)
+            calls.append(checkpoint)
+            if len(calls) == 2:
+                raise KeyboardInterrupt
+
+        with mock.patch.object(importer, "_save_checkpoint", save_then_crash):
+            try:
+                import_csv("sessions", csv_path, data_dir, CHUNK_ROWS)
+            except KeyboardInterrupt:
+                print(f"interrupted with {count(data_dir)} rows stored")
+
+        import_csv("sessions", csv_path, data_dir, CHUNK_ROWS)
+        print(f"after resume: {count(data_dir)} rows stored")
+
+        # 2) Full re-import (every row is an upsert hit)
+        start = time.perf_counter()
+        import_csv("sessions", csv_path, data_dir, CHUNK_ROWS)
+        print(f"re-import: {ROWS / (time.perf_counter() - start):,.0f} rows/s")
+
+        # 3) Same again under tracemalloc (slower; memory only)
+        tracemalloc.start()
+        import_csv("sessions", csv_path, data_dir, CHUNK_ROWS)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"peak python memory during import: {peak / 1e6:.1f} MB")
+
+if __name__ == "__main__":
+    main()
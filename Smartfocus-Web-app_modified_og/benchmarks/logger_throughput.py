@@ -0,0 +1,66 @@
+"""
+Logger throughput benchmark: sync vs write-behind.
+
+Measures how long callers of log_timeline / log_session are blocked
+and the end-to-end time until everything is on disk.
+
+Run from the app folder:
+    python -m benchmarks.logger_throughput
+"""
+
+import os
+import tempfile
+import time
+
+from smart_focus.database.db import init_db
+from smart_focus.utils import logger
+
+
+TIMELINE_EVENTS = 5000
+SESSIONS = 500
+
+SUMMARY = {
+    "user": "bench",
+    "mode": "camera",
+    "activity": "general",
+    "goal_hours": 1.0,
+    "focused_seconds": 1800,
+    "distracted_seconds": 600,
+    "focused_minutes": 30,
+    "focus_score": 37,
+    "goal_achieved": False,
+    "total_seconds": 2400
+}
+
+
+def run(mode):
+    with tempfile.TemporaryDirectory() as data_dir:
+        init_db(os.path.join(data_dir, "smartfocus.db"))
+        logger.init_logger(data_dir, mode=mode)
+
+        start = time.perf_counter()
+        for i in range(TIMELINE_EVENTS):
+            logger.log_timeline("bench", "camera", "Focused" if i % 2 else "Distracted")
+        for _ in range(SESSIONS):
+            logger.log_session(SUMMARY)
+        caller = time.perf_counter() - start
+
+        logger.flush_logger()
+        total = time.perf_counter() - start
+        logger.shutdown_logger()
+
+    events = TIMELINE_EVENTS + SESSIONS
+    print(
+        f"{mode:<13} caller {caller * 1e6 / events:>8.1f} us/event"
+        f"   durable {events / total:>10.0f} events/s"
+    )
+
+
+def main():
+    print(f"{TIMELINE_EVENTS} timeline events + {SESSIONS} sessions")
+    run("sync")
+    run("write_behind")
+
+
+if __name__ == "__main__":
+    main()
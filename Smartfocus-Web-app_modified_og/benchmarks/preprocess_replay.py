@@ -0,0 +1,90 @@
+"""
+Replay recorded frames with and without FramePreprocessor.
+
+Checks that the per-frame eyes-open / head-turn decisions are identical
+and reports FaceMesh time for both runs.
+
+Run from the app folder with a folder of recorded JPEG frames
+(played back in file-name order):
+    python -m benchmarks.preprocess_replay path/to/frames
+"""
+
+import glob
+import os
+import sys
+import time
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from smart_focus.focus.camera import frame_flags
+from smart_focus.focus.landmarks import from_mesh
+from smart_focus.focus.preprocess import FramePreprocessor
+
+
+def decide(found):
+    """Score every frame with a face in one batched call."""
+    faces = [lm for lm in found if lm is not None]
+    if not faces:
+        return [("no_face",)] * len(found)
+
+    eyes_open, turned = frame_flags(np.stack(faces))
+    flags = iter(zip(eyes_open.tolist(), turned.tolist()))
+    return [("no_face",) if lm is None else next(flags) for lm in found]
+
+
+def run(frames, preprocessor):
+    face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True)
+    found = []
+    busy = 0.0
+
+    for frame in frames:
+        image, roi = preprocessor.prepare(frame)
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        started = time.perf_counter()
+        out = face_mesh.process(rgb)
+        elapsed = time.perf_counter() - started
+        busy += elapsed
+
+        landmarks = None
+        if out.multi_face_landmarks:
+            landmarks = from_mesh(out.multi_face_landmarks[0])
+        landmarks = preprocessor.update(landmarks, roi, elapsed)
+
+        if landmarks is None and not roi.full_frame:
+            image, roi = preprocessor.prepare(frame)
+            started = time.perf_counter()
+            out = face_mesh.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+            busy += time.perf_counter() - started
+            if out.multi_face_landmarks:
+                landmarks = from_mesh(out.multi_face_landmarks[0])
+            landmarks = preprocessor.update(landmarks, roi, 0)
+
+        found.append(landmarks)
+
+    face_mesh.close()
+    return decide(found), busy
+
+
+def main(folder):
+    paths = sorted(glob.glob(os.path.join(folder, "*.jpg")))
+    frames = [cv2.imread(p) for p in paths]
+    if not frames:
+        print("no frames found")
+        return
+
+    base, base_s = run(frames, FramePreprocessor(enabled=False))
+    fast, fast_s = run(frames, FramePreprocessor())
+
+    same = sum(a == b for a, b in zip(base, fast))
+    print(f"{len(frames)} frames")
+    print(f"decisions identical: {same}/{len(frames)}")
+    print(f"full frame:   {base_s * 1000 / len(frames):.2f} ms/frame")
+    print(f"preprocessed: {fast_s * 1000 / len(frames):.2f} ms/frame")
+    print(f"speed-up:     {base_s / fast_s:.2f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else "recordings")
@@ -0,0 +1,93 @@
+"""
+Timeline store benchmark: storage per event and interval query time.
+
+Loads months of status transitions for several users into
+timeline_events, then times status_intervals() for a 2 h session
+against scanning the equivalent timeline.csv.
+
+Run from the app folder:
+    python -m benchmarks.timeline_intervals
+"""
+
+import csv
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+from smart_focus.database.db import init_db
+from smart_focus.database.timeline import insert_events, status_intervals, STATUSES
+
+USERS = 20
+DAYS = 90
+EVENTS_PER_DAY = 400          # a transition every few seconds for ~4 h/day
+REPEAT = 50
+
+
+def events():
+    start = int(datetime(2025, 1, 1).timestamp())
+    for day in range(DAYS):
+        base = start + day * 86400 + 9 * 3600
+        for u in range(USERS):
+            for i in range(EVENTS_PER_DAY):
+                yield {
+                    "ts": base + i * 37 + u,
+                    "user": f"user{u}",
+                    "mode": "camera",
+                    "status": STATUSES[i % 2]
+                }
+
+
+def main():
+    with tempfile.TemporaryDirectory() as data_dir:
+        path = os.path.join(data_dir, "smartfocus.db")
+        init_db(path)
+
+        conn = sqlite3.connect(path)
+        chunk = []
+        csv_path = os.path.join(data_dir, "timeline.csv")
+        with open(csv_path, "w", newline="") as f, conn:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "user", "mode", "status"])
+            for e in events():
+                chunk.append(e)
+                writer.writerow([
+                    datetime.fromtimestamp(e["ts"]).strftime("%Y-%m-%d %H:%M:%S"),
+                    e["user"], e["mode"], e["status"]
+                ])
+                if len(chunk) == 50000:
+                    insert_events(conn, chunk)
+                    chunk = []
+            insert_events(conn, chunk)
+        conn.execute("VACUUM")
+        conn.close()
+
+        total = USERS * DAYS * EVENTS_PER_DAY
+        print(f"{total:,} events")
+        print(f"  smartfocus.db {os.path.getsize(path) / total:5.1f} bytes/event")
+        print(f"  timeline.csv  {os.path.getsize(csv_path) / total:5.1f} bytes/event")
+
+        # A 2 h session in the middle of the range
+        start = int(datetime(2025, 2, 15, 10).timestamp())
+        end = start + 7200
+
+        t = time.perf_counter()
+        for _ in range(REPEAT):
+            starts, ends, codes = status_intervals(data_dir, "user7", start, end)
+        db_ms = (time.perf_counter() - t) * 1000 / REPEAT
+
+        t = time.perf_counter()
+        lo = datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:%M:%S")
+        hi = datetime.fromtimestamp(end).strftime("%Y-%m-%d %H:%M:%S")
+        with open(csv_path, newline="") as f:
+            rows = [r for r in csv.DictReader(f) if r["user"] == "user7" and lo <= r["timestamp"] < hi]
+        csv_ms = (time.perf_counter() - t) * 1000
+
+        print(f"2 h session: {len(starts)} intervals")
+        print(f"  status_intervals {db_ms:8.2f} ms")
+        print(f"  csv scan         {csv_ms:8.2f} ms ({len(rows)} rows)")
+
+
+if __name__ == "__main__":
+    main()
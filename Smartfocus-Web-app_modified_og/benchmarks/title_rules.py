@@ -0,0 +1,112 @@
+"""
+Title classification: the old nested any() scans vs title_rules.
+
+Classifies a corpus of real-looking window titles (browser tabs, IDEs,
+chat apps, YouTube) with the keyword loops the detector used before,
+with the compiled single-regex rules, and through the LRU cache, using
+a deployment-sized rule set (BLOCK_WORDS blocked keywords).
+
+Run from the app folder:
+    python -m benchmarks.title_rules
+"""
+
+import random
+import time
+
+from smart_focus.utils.title_rules import DEFAULT_RULES, CompiledRules
+
+
+ROUNDS = 20
+BLOCK_WORDS = 200
+
+CORPUS = [
+    "main.py - smartfocus - Visual Studio Code",
+    "app.py - College-Project-BCA - Visual Studio Code",
+    "Two Sum - LeetCode - Google Chrome",
+    "Longest Substring Without Repeating Characters - LeetCode - Mozilla Firefox",
+    "Solve Python | HackerRank - Google Chrome",
+    "Binary Search - GeeksforGeeks - Google Chrome",
+    "OneCompiler - Write, run and share Python code online - Google Chrome",
+    "Titanic - Machine Learning from Disaster | Kaggle - Google Chrome",
+    "Python loops explained for beginners - YouTube - Google Chrome",
+    "Recursion in 100 seconds - YouTube - Google Chrome",
+    "lofi hip hop radio - beats to relax/study to - YouTube - Google Chrome",
+    "YouTube Shorts - Google Chrome",
+    "(3) Instagram - Google Chrome",
+    "Facebook - Log In or Sign Up - Google Chrome",
+    "Home / X (Twitter) - Google Chrome",
+    "TikTok - Make Your Day - Mozilla Firefox",
+    "WhatsApp - Google Chrome",
+    "Discord | #general | study-group",
+    "Spotify Premium",
+    "Inbox (12) - student@gmail.com - Gmail - Google Chrome",
+    "Stack Overflow - Where Developers Learn - Google Chrome",
+    "python - How do I merge two dictionaries? - Stack Overflow - Google Chrome",
+    "Command Prompt",
+    "Windows PowerShell",
+    "Notes.txt - Notepad",
+    "Document1 - Word",
+    "Book1 - Excel",
+    "SmartFocus - Focus Session - Google Chrome",
+    "File Explorer",
+    "Settings",
+]
+
+
+def legacy_classify(title, activity, topic, social):
+    """The scans DistractionDetector ran on every poll."""
+    title = title.lower()
+    if any(word in title for word in social):
+        return True
+    if "youtube" in title:
+        if "shorts" in title:
+            return True
+        if "youtube" not in activity:
+            return True
+        return not any(word in title for word in topic.split())
+    return False
+
+
+def corpus(rng):
+    """CORPUS plus numbered variants (tab counters, notification badges)."""
+    titles = list(CORPUS)
+    for i in range(1, 20):
+        titles += [f"({i}) {t}" for t in rng.sample(CORPUS, 10)]
+    return titles
+
+
+def per_title_us(fn, titles):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for title in titles:
+            fn(title)
+    return (time.perf_counter() - start) * 1e6 / (ROUNDS * len(titles))
+
+
+def main():
+    rng = random.Random(3)
+    titles = corpus(rng)
+
+    social = DEFAULT_RULES["block"] + [f"blocked-site-{i}" for i in range(BLOCK_WORDS)]
+    rules = CompiledRules({**DEFAULT_RULES, "block": social})
+
+    activity, topic = "youtube_study", "python loops recursion"
+
+    mismatches = sum(
+        legacy_classify(t, activity, topic, social) != rules._classify(t, activity, topic).distracted
+        for t in titles
+    )
+
+    legacy = per_title_us(lambda t: legacy_classify(t, activity, topic, social), titles)
+    compiled = per_title_us(lambda t: rules._classify(t, activity, topic), titles)
+    cached = per_title_us(lambda t: rules.classify(t, activity, topic), titles)
+
+    print(f"{len(titles)} titles x {ROUNDS}, {len(social)} blocked keywords")
+    print(f"  nested any()   {legacy:7.2f} us/title")
+    print(f"  single regex   {compiled:7.2f} us/title")
+    print(f"  LRU cached     {cached:7.2f} us/title   {rules.classify.cache_info()}")
+    print(f"  verdict mismatches vs legacy: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+User lookup benchmark: users.csv scan vs UserStore.
+
+Login / register cost per request for growing user counts
+(password hashing left out: it is the same for both).
+
+Run from the app folder:
+    python -m benchmarks.user_lookup
+"""
+
+import csv
+import os
+import tempfile
+import time
+
+from smart_focus.database.db import init_db
+from smart_focus.database.users import UserStore, migrate_users_csv
+
+
+SIZES = [10, 1000, 10000, 100000]
+LOOKUPS = 200
+PASSWORD = "scrypt:32768:8:1$" + "x" * 120
+
+
+def write_users_csv(path, n):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["user", "email", "password"])
+        for i in range(n):
+            writer.writerow([f"user{i}", f"user{i}@example.com", PASSWORD])
+
+
+def csv_lookup(path, user):
+    # What /login and /register used to do
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row["user"] == user:
+                return row
+    return None
+
+
+def per_call_us(fn, names):
+    start = time.perf_counter()
+    for name in names:
+        fn(name)
+    return (time.perf_counter() - start) * 1e6 / len(names)
+
+
+def run(n):
+    with tempfile.TemporaryDirectory() as data_dir:
+        csv_path = os.path.join(data_dir, "users.csv")
+        write_users_csv(csv_path, n)
+        init_db(os.path.join(data_dir, "smartfocus.db"))
+        migrate_users_csv(data_dir)
+
+        # Spread lookups over the whole table, plus unknown names
+        names = [f"user{(i * 7919) % n}" for i in range(LOOKUPS)]
+        unknown = [f"nobody{i}" for i in range(LOOKUPS)]
+
+        scan_us = per_call_us(lambda u: csv_lookup(csv_path, u), names[:20])
+
+        store = UserStore(data_dir)
+        cold_us = per_call_us(store.get, names + unknown)
+        warm_us = per_call_us(store.get, names)
+        create_us = per_call_us(
+            lambda u: store.create(u, "", PASSWORD),
+            [f"new{i}" for i in range(LOOKUPS)]
+        )
+
+    print(
+        f"{n:>7} users   csv scan {scan_us:>10.1f} us"
+        f"   db miss {cold_us:>6.1f} us   cache hit {warm_us:>5.2f} us"
+        f"   register {create_us:>7.1f} us"
+    )
+
+
+def main():
+    for n in SIZES:
+        run(n)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Active-window monitoring: per-tracker polling vs the shared window_monitor.
+
+Simulates TRACKERS concurrent sessions over one hour of window switches
+and counts title classifications under the old 2 s polling loop (every
+tracker classifies on every poll) and under window_monitor (one source,
+title_rules classifies each distinct title/activity/topic once). Also measures how
+long a title change takes to reach tracker.content_distracted through
+the fake backend.
+
+Run from the app folder:
+    python -m benchmarks.window_events
+"""
+
+import random
+import time
+
+from smart_focus.utils import distraction_detector as dd
+from smart_focus.utils.title_rules import TitleRules
+from smart_focus.utils.window_monitor import FakeWindowBackend, WindowMonitor
+
+
+TRACKERS = 10
+SESSION_SECONDS = 3600
+LEGACY_POLL = 2
+
+TITLES = [
+    "main.py - smartfocus - Visual Studio Code",
+    "Python loops explained - YouTube - Google Chrome",
+    "YouTube Shorts - Google Chrome",
+    "Instagram - Google Chrome",
+    "Stack Overflow - Where Developers Learn - Google Chrome",
+    "Notes.txt - Notepad",
+    "Command Prompt",
+]
+
+
+class Tracker:
+    running = True
+    activity = "youtube_study"
+    topic = "python loops"
+    content_distracted = False
+    auto_stopped = False
+
+    def stop(self):
+        self.running = False
+
+
+def switch_trace(rng):
+    """(second, title) switches, one every 20-120 s."""
+    t, trace = 0, []
+    while t < SESSION_SECONDS:
+        trace.append((t, rng.choice(TITLES)))
+        t += rng.randint(20, 120)
+    return trace
+
+
+def main():
+    rng = random.Random(7)
+    trace = switch_trace(rng)
+
+    rules = TitleRules()
+    start = time.perf_counter()
+    for title in TITLES:
+        rules.rules._classify(title, Tracker.activity, Tracker.topic)
+    classify_us = (time.perf_counter() - start) * 1e6 / len(TITLES)
+    dd.title_rules = rules
+
+    legacy_calls = TRACKERS * (SESSION_SECONDS // LEGACY_POLL)
+
+    backend = FakeWindowBackend()
+    monitor = WindowMonitor(lambda: backend)
+    trackers = [Tracker() for _ in range(TRACKERS)]
+    detectors = [dd.DistractionDetector(t, monitor) for t in trackers]
+    for d in detectors:
+        d.GRACE_PERIOD = 0
+        d.start()
+    time.sleep(0.05)
+
+    latencies = []
+    for _, title in trace:
+        start = time.perf_counter()
+        backend.set_title(title)
+        latencies.append(time.perf_counter() - start)
+
+    event_calls = rules.cache_info()["misses"]
+    for d in detectors:
+        d.stop()
+
+    print(f"{TRACKERS} sessions, {SESSION_SECONDS} s, {len(trace)} window switches")
+    print(f"  classify            {classify_us:6.2f} us/title")
+    print(f"  polling (2 s)       {legacy_calls:6d} classifications, latency up to {LEGACY_POLL} s")
+    print(f"  window_monitor      {event_calls:6d} classifications, "
+          f"{monitor.changes} title events")
+    print(f"  change -> tracker   {max(latencies) * 1e6:6.0f} us max (fake backend)")
+
+
+if __name__ == "__main__":
+    main()
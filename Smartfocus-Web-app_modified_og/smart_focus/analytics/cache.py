@@ -0,0 +1,85 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+# Users kept in memory / how long a payload stays valid.
+# The TTL only matters for day/month rollover: new sessions
+# invalidate the user's entry straight away.
+MAX_USERS = 256
+TTL_SECONDS = 300
+
+
+class AnalyticsCache:
+    """
+    Per-user cache of computed analytics payloads.
+
+    - LRU over users, plus a TTL per entry
+    - invalidate(user) is called when log_session stores a new session
+    - Counts hits / misses and build time
+    """
+
+    def __init__(self, max_users=MAX_USERS, ttl=TTL_SECONDS):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries = OrderedDict()   # user -> (built_at, payload)
+        self._generation = {}           # user -> bumped on invalidate
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.build_seconds = 0.0
+
+    def get(self, user, builder):
+        """Cached payload for `user`, or builder() on a miss."""
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry and now - entry[0] < self.ttl:
+                self._entries.move_to_end(user)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation.get(user, 0)
+
+        started = time.perf_counter()
+        payload = builder()
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self.build_seconds += elapsed
+
+            # Invalidated while building: serve it, but don't keep it
+            if self._generation.get(user, 0) != generation:
+                return payload
+
+            self._entries[user] = (now, payload)
+            self._entries.move_to_end(user)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+        return payload
+
+    def invalidate(self, user):
+        with self._lock:
+            self._generation[user] = self._generation.get(user, 0) + 1
+            if self._entries.pop(user, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "avg_build_ms": round(self.build_seconds * 1000 / self.misses, 2) if self.misses else 0.0
+            }
@@ -0,0 +1,98 @@
+from functools import lru_cache
+
+import numpy as np
+
+from smart_focus.database.db import connect
+from smart_focus.database.timeline import STATUS_CODES, status_intervals, to_epoch
+
+# Curve resolution in seconds (bucket width)
+DEFAULT_RESOLUTION = 60
+MIN_RESOLUTION = 1
+
+# Longer sessions get wider buckets rather than more points
+MAX_POINTS = 1000
+
+FOCUSED = STATUS_CODES["Focused"]
+
+
+def focus_curve(starts, ends, statuses, start_ts, end_ts, resolution=DEFAULT_RESOLUTION):
+    """
+    Focused seconds per `resolution`-second bucket of [start_ts, end_ts).
+
+    Vectorized: builds the cumulative focused-time function at every
+    interval boundary, interpolates it at the bucket edges and takes
+    differences, so the cost is O((intervals + buckets) log intervals).
+    Returns (bucket_starts, focused_seconds, bucket_lengths).
+    """
+    edges = np.arange(start_ts, end_ts, resolution, dtype=np.float64)
+    edges = np.append(edges, end_ts)
+
+    if len(starts) == 0:
+        zeros = np.zeros(len(edges) - 1)
+        return edges[:-1], zeros, np.diff(edges)
+
+    # Cumulative focused time at each interval start / end
+    focused = (statuses == FOCUSED) * (ends - starts)
+    cum_end = np.cumsum(focused)
+    cum_start = cum_end - focused
+
+    # Boundaries interleaved: start_0, end_0, start_1, end_1, ...
+    times = np.column_stack([starts, ends]).ravel().astype(np.float64)
+    values = np.column_stack([cum_start, cum_end]).ravel().astype(np.float64)
+
+    cumulative = np.interp(edges, times, values, left=0.0, right=values[-1])
+    return edges[:-1], np.diff(cumulative), np.diff(edges)
+
+
+def _session_row(data_dir, user, session_id):
+    conn = connect(data_dir)
+    row = conn.execute("""
+    SELECT rowid AS id, timestamp, user, total_seconds FROM sessions
+    WHERE rowid = ? AND user = ?
+    """, (session_id, user)).fetchone()
+    conn.close()
+    return row
+
+
+def session_curve(data_dir, user, session_id, resolution=DEFAULT_RESOLUTION):
+    """
+    Focus curve of one finished session, or None if the user has no
+    such session.
+    """
+    row = _session_row(data_dir, user, session_id)
+    if row is None:
+        return None
+
+    total = int(row["total_seconds"] or 0)
+    resolution = max(MIN_RESOLUTION, int(resolution), -(-total // MAX_POINTS))
+
+    return _cached_curve(data_dir, user, row["id"], row["timestamp"], total, resolution)
+
+
+# Finished sessions never change: one entry per (session, resolution)
+@lru_cache(maxsize=512)
+def _cached_curve(data_dir, user, session_id, timestamp, total, resolution):
+
+    # sessions.timestamp is the stop time
+    end_ts = to_epoch(timestamp)
+    start_ts = end_ts - total
+    starts, ends, statuses = status_intervals(data_dir, user, start_ts, end_ts)
+
+    bucket_starts, focused, lengths = focus_curve(
+        starts, ends, statuses, start_ts, end_ts, resolution
+    )
+    ratio = np.divide(focused, lengths, out=np.zeros_like(focused), where=lengths > 0)
+
+    return {
+        "session_id": session_id,
+        "timestamp": timestamp,
+        "resolution": resolution,
+        "transitions": int(len(starts)),
+        "offset_seconds": (bucket_starts - start_ts).astype(int).tolist(),
+        "focused_seconds": np.round(focused, 1).tolist(),
+        "focus_ratio": np.round(ratio, 3).tolist()
+    }
+
+
+def curve_cache_info():
+    return _cached_curve.cache_info()._asdict()
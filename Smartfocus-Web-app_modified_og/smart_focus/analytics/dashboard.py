@@ -0,0 +1,31 @@
+from datetime import datetime, timedelta
+
+from smart_focus.analytics.graphs import build_focus_graph
+from smart_focus.analytics.reports import (
+    get_focus_heatmap,
+    get_monthly_report,
+    get_weekly_report,
+    load_daily,
+    load_sessions
+)
+
+
+def build_analytics(data_dir, user):
+    """
+    Everything the analytics pages show for one user, from two queries:
+    the sessions list (graph + records) and ~31 daily_focus rows
+    (weekly, monthly, heatmap).
+    """
+    today = datetime.now().date()
+    since = min(today.replace(day=1), today - timedelta(days=30))
+
+    daily = load_daily(data_dir, user, since)
+    records = load_sessions(data_dir, user)
+
+    return {
+        "graph_data": build_focus_graph(data_dir, user, records),
+        "weekly": get_weekly_report(data_dir, user, daily),
+        "monthly": get_monthly_report(data_dir, user, daily),
+        "heatmap": get_focus_heatmap(data_dir, user, daily),
+        "records": records
+    }
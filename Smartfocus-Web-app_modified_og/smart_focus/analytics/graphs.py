@@ -1,36 +1,28 @@
-import pandas as pd
-import os
+from datetime import datetime
 
+from smart_focus.analytics.reports import load_sessions
 
-def build_focus_graph(data_dir, user_name):
-    sessions_file = os.path.join(data_dir, "sessions.csv")
 
-    # If no data file
-    if not os.path.exists(sessions_file):
-        return {"labels": [], "values": []}
-
-    df = pd.read_csv(sessions_file)
-
-    # Clean user column
-    df["user"] = df["user"].astype(str).str.strip().str.lower()
+def build_focus_graph(data_dir, user_name, records=None):
     user_name = user_name.strip().lower()
 
-    # Filter by user
-    df = df[df["user"] == user_name]
-
-    if df.empty:
-        return {"labels": [], "values": []}
-
-    # Parse timestamp
-    df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
-    df = df.dropna(subset=["timestamp"])
-    df = df.sort_values("timestamp")
-
-    # Convert focused_seconds to minutes
-    df["focused_minutes"] = df["focused_seconds"] / 60
+    # Only this user's rows, already in time order (user, timestamp index)
+    if records is None:
+        records = load_sessions(data_dir, user_name)
+
+    labels = []
+    values = []
+    for row in records:
+        try:
+            ts = datetime.fromisoformat(row["timestamp"])
+        except (TypeError, ValueError):
+            continue
+        labels.append(ts.strftime("%d %b %H:%M"))
+        # Convert focused_seconds to minutes
+        values.append(round(row["focused_seconds"] / 60, 2))
 
     # Build graph data
     return {
-        "labels": df["timestamp"].dt.strftime("%d %b %H:%M").tolist(),
-        "values": df["focused_minutes"].round(2).tolist()
-    }
\ No newline at end of file
+        "labels": labels,
+        "values": values
+    }
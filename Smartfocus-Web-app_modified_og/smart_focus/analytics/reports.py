@@ -1,25 +1,57 @@
-import pandas as pd
 from datetime import datetime, timedelta
-import os
-def get_focus_heatmap(data_dir, user):
 
-    session_file = os.path.join(data_dir, "sessions.csv")
+from smart_focus.database.db import connect
 
-    if not os.path.exists(session_file):
-        return []
+DATE_FORMAT = "%Y-%m-%d"
 
-    df = pd.read_csv(session_file)
 
-    df["user"] = df["user"].str.lower()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    now=datetime.now()
-    df=df[(df['timestamp'].dt.month==now.month)&(df['timestamp'].dt.year==now.year)]
+# -----------------------------
+# LOADERS (one query each; results can be shared between reports)
+# -----------------------------
+def load_daily(data_dir, user, since):
+    """daily_focus rows from `since` (a date) on, oldest first."""
+    conn = connect(data_dir)
+    rows = conn.execute("""
+    SELECT date, focused_seconds, sessions, goals_achieved
+    FROM daily_focus
+    WHERE user = ? AND date >= ?
+    ORDER BY date
+    """, (user.lower(), since.strftime(DATE_FORMAT))).fetchall()
+    conn.close()
+    return rows
 
-    df = df[df["user"] == user.lower()]
 
-    df["date"] = df["timestamp"].dt.date
+def load_sessions(data_dir, user):
+    """All of one user's sessions, oldest first (user/timestamp index)."""
+    conn = connect(data_dir)
+    rows = conn.execute("""
+    SELECT * FROM sessions WHERE user = ? ORDER BY timestamp
+    """, (user.strip().lower(),)).fetchall()
+    conn.close()
 
-    daily_focus = df.groupby("date")["focused_seconds"].sum().reset_index()
+    records = []
+    for row in rows:
+        record = dict(row)
+        record["goal_achieved"] = bool(record["goal_achieved"])
+        records.append(record)
+    return records
+
+
+def _since(daily, start):
+    start = start.strftime(DATE_FORMAT)
+    return [r for r in daily if r["date"] >= start]
+
+
+def get_focus_heatmap(data_dir, user, daily=None):
+
+    month_start = datetime.now().date().replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+
+    # At most 31 rollup rows
+    if daily is None:
+        daily = load_daily(data_dir, user, month_start)
+    end = next_month.strftime(DATE_FORMAT)
+    rows = [r for r in _since(daily, month_start) if r["date"] < end]
 
     def get_level(sec):
         if sec == 0:
@@ -31,9 +63,14 @@ def get_focus_heatmap(data_dir, user):
         else:
             return 3
 
-    daily_focus["level"] = daily_focus["focused_seconds"].apply(get_level)
-
-    return daily_focus.to_dict(orient="records")
+    return [
+        {
+            "date": datetime.strptime(r["date"], DATE_FORMAT).date(),
+            "focused_seconds": r["focused_seconds"],
+            "level": get_level(r["focused_seconds"])
+        }
+        for r in rows
+    ]
 
 def format_time(seconds):
     seconds=int(seconds)
@@ -46,121 +83,64 @@ def format_time(seconds):
         return f'{minutes} min {secs} sec'
     return f'{secs} sec'
 
-def get_weekly_report(data_dir, user):
-
-    if not user:
-        return None
-
-    session_file = os.path.join(data_dir, "sessions.csv")
-
-    if not os.path.exists(session_file):
-        return None
-
-    df = pd.read_csv(session_file)
 
-    df["user"] = df["user"].str.lower()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+def _daily_rows(data_dir, user, days, daily=None):
+    """daily_focus rows for the last `days` calendar days, today included."""
+    start_date = (datetime.now() - timedelta(days=days - 1)).date()
+    if daily is None:
+        daily = load_daily(data_dir, user, start_date)
+    return _since(daily, start_date)
 
-    user = user.lower()
 
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=7)
+def _period_report(daily):
 
-    df = df[
-        (df["user"] == user) &
-        (df["timestamp"] >= start_date)
-    ]
-
-    if df.empty:
+    if not daily:
         return None
 
-    # Convert seconds to minutes
-    df["focused_minutes"] = df["focused_seconds"] / 60
-
-    # Extract date and day
-    df["date"] = df["timestamp"].dt.date
-    df["day"] = df["timestamp"].dt.day_name()
-
     # Sessions tracked
-    sessions_tracked = len(df)
+    sessions_tracked = sum(r["sessions"] for r in daily)
 
     # Unique days tracked
-    days_tracked = df["date"].nunique()
+    days_tracked = len(daily)
 
     # Total focus
-    total_seconds= int(df["focused_minutes"].sum())
+    total_seconds= int(sum(r["focused_seconds"] for r in daily) / 60)
     total_focus=format_time(total_seconds)
 
     # Average daily focus
     avg_seconds=int(total_seconds / days_tracked) if days_tracked>0 else 0
     avg_daily=format_time(avg_seconds)
 
-    # Aggregate per day
-    daily_focus = df.groupby("day")["focused_minutes"].sum()
+    # Aggregate per day name (ties resolve alphabetically, as before)
+    by_day = {}
+    for r in daily:
+        name = datetime.strptime(r["date"], DATE_FORMAT).strftime("%A")
+        by_day[name] = by_day.get(name, 0) + r["focused_seconds"] / 60
+    names = sorted(by_day)
 
     return {
         "total_focus": total_focus,
         "average_daily": avg_daily,
         "sessions_tracked": sessions_tracked,
         "days_tracked": days_tracked,
-        "goal_days": int(df["goal_achieved"].sum()),
-        "best_day": daily_focus.idxmax(),
-        "worst_day": daily_focus.idxmin()
+        "goal_days": int(sum(r["goals_achieved"] for r in daily)),
+        "best_day": max(names, key=lambda n: by_day[n]),
+        "worst_day": min(names, key=lambda n: by_day[n])
     }
 
 
-def get_monthly_report(data_dir, user):
+def get_weekly_report(data_dir, user, daily=None):
 
     if not user:
         return None
 
-    session_file = os.path.join(data_dir, "sessions.csv")
-
-    if not os.path.exists(session_file):
-        return None
-
-    df = pd.read_csv(session_file)
-
-    df["user"] = df["user"].str.lower()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    return _period_report(_daily_rows(data_dir, user, 7, daily))
 
-    user = user.lower()
 
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)
-
-    df = df[
-        (df["user"] == user) &
-        (df["timestamp"] >= start_date)
-    ]
+def get_monthly_report(data_dir, user, daily=None):
 
-    if df.empty:
+    if not user:
         return None
 
-    df["focused_minutes"] = df["focused_seconds"] / 60
-    df["date"] = df["timestamp"].dt.date
-    df["day"] = df["timestamp"].dt.day_name()
-
-    sessions_tracked = len(df)
-    days_tracked = df["date"].nunique()
-
-    
-    # Total focus
-    total_seconds= int(df["focused_minutes"].sum())
-    total_focus=format_time(total_seconds)
-
-    # Average daily focus
-    avg_seconds=int(total_seconds / days_tracked) if days_tracked>0 else 0
-    avg_daily=format_time(avg_seconds)
-
-    daily_focus = df.groupby("day")["focused_minutes"].sum()
+    return _period_report(_daily_rows(data_dir, user, 30, daily))
 
-    return {
-        "total_focus": total_focus,
-        "average_daily": avg_daily,
-        "sessions_tracked": sessions_tracked,
-        "days_tracked": days_tracked,
-        "goal_days": int(df["goal_achieved"].sum()),
-        "best_day": daily_focus.idxmax(),
-        "worst_day": daily_focus.idxmin()
-    }
\ No newline at end of file
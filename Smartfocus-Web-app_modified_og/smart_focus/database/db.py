@@ -2,13 +2,27 @@ import sqlite3
 import os
 
 DATA_DIR = "data"
-DB_PATH = os.path.join(DATA_DIR, "smartfocus.db")
+DB_NAME = "smartfocus.db"
+DB_PATH = os.path.join(DATA_DIR, DB_NAME)
 
-def init_db():
+# Keyboard / mouse activity of no-camera sessions (NULL for camera ones);
+# added to existing databases by init_db
+SESSION_ACTIVITY_COLUMNS = [
+    ("activity_avg_per_sec", "REAL"),
+    ("activity_peak_per_sec", "INTEGER"),
+    ("activity_active_ratio", "REAL")
+]
 
-    os.makedirs(DATA_DIR, exist_ok=True)
 
-    conn = sqlite3.connect(DB_PATH)
+def db_path(data_dir):
+    return os.path.join(data_dir, DB_NAME)
+
+
+def init_db(db_path=DB_PATH):
+
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
 
     cursor.execute("""
@@ -28,9 +42,233 @@ def init_db():
     )
     """)
 
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(sessions)")}
+    for name, kind in SESSION_ACTIVITY_COLUMNS:
+        if name not in columns:
+            cursor.execute(f"ALTER TABLE sessions ADD COLUMN {name} {kind}")
+
+    # Every analytics read is "one user, one time window"
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_sessions_user_ts
+    ON sessions (user, timestamp)
+    """)
+
+    # /activity?activity=... pages within one activity
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_sessions_user_activity_ts
+    ON sessions (user, activity, timestamp)
+    """)
+
+    # -----------------------------
+    # ROLLUPS (kept up to date by log_session)
+    # -----------------------------
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS daily_focus (
+        user TEXT NOT NULL,
+        date TEXT NOT NULL,
+        focused_seconds INTEGER NOT NULL DEFAULT 0,
+        distracted_seconds INTEGER NOT NULL DEFAULT 0,
+        sessions INTEGER NOT NULL DEFAULT 0,
+        goals_achieved INTEGER NOT NULL DEFAULT 0,
+        best_score INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user, date)
+    )
+    """)
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS activity_focus (
+        user TEXT NOT NULL,
+        activity TEXT NOT NULL,
+        sessions INTEGER NOT NULL DEFAULT 0,
+        focused_seconds INTEGER NOT NULL DEFAULT 0,
+        score_total INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (user, activity)
+    )
+    """)
+
+    # -----------------------------
+    # USERS (unique name → O(log n) login / duplicate check)
+    # -----------------------------
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user TEXT NOT NULL,
+        email TEXT,
+        password TEXT NOT NULL
+    )
+    """)
+
+    cursor.execute("""
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_users_user
+    ON users (user)
+    """)
+
+    # -----------------------------
+    # NOTES (hub scratchpad)
+    # -----------------------------
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user TEXT NOT NULL,
+        content TEXT NOT NULL,
+        timestamp TEXT
+    )
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_notes_user_id
+    ON notes (user, id)
+    """)
+
+    # -----------------------------
+    # TIMELINE (status transitions, compact)
+    # epoch seconds, interned user id, 1-byte status / mode codes
+    # (see smart_focus/database/timeline.py). seq is the rowid, so it
+    # keeps the logging order of transitions within the same second;
+    # reads walk the covering (user_id, ts, seq) index.
+    # -----------------------------
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS timeline_users (
+        id INTEGER PRIMARY KEY,
+        user TEXT NOT NULL UNIQUE
+    )
+    """)
+
+    # Older databases keyed events by (user_id, ts, status), which merged
+    # same-second transitions; their rows are carried over
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(timeline_events)")}
+    upgrade = bool(columns) and "seq" not in columns
+    if upgrade:
+        cursor.execute("ALTER TABLE timeline_events RENAME TO timeline_events_old")
+
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS timeline_events (
+        seq INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        status INTEGER NOT NULL,
+        mode INTEGER NOT NULL
+    )
+    """)
+
+    cursor.execute("""
+    CREATE INDEX IF NOT EXISTS idx_timeline_events_user_ts
+    ON timeline_events (user_id, ts, seq, status)
+    """)
+
+    if upgrade:
+        cursor.execute("""
+        INSERT INTO timeline_events (user_id, ts, status, mode)
+        SELECT user_id, ts, status, mode FROM timeline_events_old
+        ORDER BY user_id, ts
+        """)
+        cursor.execute("DROP TABLE timeline_events_old")
+
+    # -----------------------------
+    # MIGRATIONS (one-shot imports of the old data files)
+    # Recorded here so the source files can stay where they are
+    # -----------------------------
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS migrations (
+        name TEXT PRIMARY KEY,
+        applied_at TEXT NOT NULL
+    )
+    """)
+
+    # One-time backfill from existing sessions
+    if cursor.execute("SELECT 1 FROM daily_focus LIMIT 1").fetchone() is None:
+        rebuild_rollups(conn)
+
     conn.commit()
     conn.close()
 
 
-def get_connection():
-    return sqlite3.connect(DB_PATH)
\ No newline at end of file
+UPSERT_DAILY_FOCUS = """
+INSERT INTO daily_focus (
+    user, date, focused_seconds, distracted_seconds,
+    sessions, goals_achieved, best_score
+)
+VALUES (?, ?, ?, ?, 1, ?, ?)
+ON CONFLICT (user, date) DO UPDATE SET
+    focused_seconds = focused_seconds + excluded.focused_seconds,
+    distracted_seconds = distracted_seconds + excluded.distracted_seconds,
+    sessions = sessions + 1,
+    goals_achieved = goals_achieved + excluded.goals_achieved,
+    best_score = MAX(best_score, excluded.best_score)
+"""
+
+UPSERT_ACTIVITY_FOCUS = """
+INSERT INTO activity_focus (user, activity, sessions, focused_seconds, score_total)
+VALUES (?, ?, 1, ?, ?)
+ON CONFLICT (user, activity) DO UPDATE SET
+    sessions = sessions + 1,
+    focused_seconds = focused_seconds + excluded.focused_seconds,
+    score_total = score_total + excluded.score_total
+"""
+
+
+def rebuild_rollups(conn):
+    """Recompute daily_focus / activity_focus from the sessions table."""
+    conn.execute("DELETE FROM daily_focus")
+    conn.execute("""
+    INSERT INTO daily_focus
+    SELECT user, date(timestamp),
+           SUM(focused_seconds), SUM(distracted_seconds),
+           COUNT(*), SUM(goal_achieved), MAX(focus_score)
+    FROM sessions
+    WHERE timestamp IS NOT NULL
+    GROUP BY user, date(timestamp)
+    """)
+
+    conn.execute("DELETE FROM activity_focus")
+    conn.execute("""
+    INSERT INTO activity_focus
+    SELECT user, activity, COUNT(*), SUM(focused_seconds), SUM(focus_score)
+    FROM sessions
+    WHERE activity IS NOT NULL
+    GROUP BY user, activity
+    """)
+
+
+def update_rollups(conn, summaries):
+    """
+    Fold finished sessions into daily_focus / activity_focus.
+    Run inside the same transaction as the sessions INSERT.
+    """
+    conn.executemany(UPSERT_DAILY_FOCUS, [
+        (
+            s["user"],
+            s["timestamp"][:10],
+            int(s["focused_seconds"]),
+            int(s["distracted_seconds"]),
+            int(s["goal_achieved"]),
+            int(s["focus_score"])
+        )
+        for s in summaries
+    ])
+    conn.executemany(UPSERT_ACTIVITY_FOCUS, [
+        (s["user"], s["activity"], int(s["focused_seconds"]), int(s["focus_score"]))
+        for s in summaries
+    ])
+
+
+def migration_done(conn, name):
+    return conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone() is not None
+
+
+def mark_migration(conn, name):
+    """Record `name` as applied (inside the caller's transaction)."""
+    conn.execute("""
+    INSERT OR IGNORE INTO migrations (name, applied_at) VALUES (?, datetime('now', 'localtime'))
+    """, (name,))
+
+
+def get_connection(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def connect(data_dir):
+    """Connection to the database inside `data_dir` (rows as sqlite3.Row)."""
+    return get_connection(db_path(data_dir))
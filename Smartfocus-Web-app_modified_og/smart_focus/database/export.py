@@ -0,0 +1,263 @@
+"""
+Streaming export of sessions / timeline rows as CSV or Parquet.
+
+Rows are read in chunks (sqlite fetchmany) and encoded chunk by
+chunk, so memory stays flat no matter how many months are exported.
+
+CLI (run from the app folder):
+    python -m smart_focus.database.export sessions --user heysiri --start 2026-01-01 -o out.csv
+    python -m smart_focus.database.export timeline --format parquet -o timeline.parquet
+"""
+
+import argparse
+import csv
+import io
+import os
+import sys
+from datetime import datetime, timedelta
+
+from smart_focus.database.db import connect
+from smart_focus.database.timeline import MODES, STATUSES, to_epoch
+
+CHUNK_ROWS = 5000
+
+SESSION_COLUMNS = [
+    ("timestamp", "string"),
+    ("user", "string"),
+    ("mode", "string"),
+    ("activity", "string"),
+    ("goal_hours", "float64"),
+    ("focused_seconds", "int64"),
+    ("distracted_seconds", "int64"),
+    ("focused_minutes", "int64"),
+    ("focus_score", "int64"),
+    ("goal_achieved", "int64"),
+    ("total_seconds", "int64"),
+    ("activity_avg_per_sec", "float64"),
+    ("activity_peak_per_sec", "int64"),
+    ("activity_active_ratio", "float64")
+]
+
+TIMELINE_COLUMNS = [
+    ("timestamp", "string"),
+    ("user", "string"),
+    ("mode", "string"),
+    ("status", "string")
+]
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet")
+}
+
+
+# -----------------------------
+# DATE RANGE ("YYYY-MM-DD", end inclusive)
+# -----------------------------
+def _bounds(start, end):
+    """Timestamp string bounds [low, high) for a start/end date, or None."""
+    low = high = None
+    if start:
+        low = datetime.strptime(start, "%Y-%m-%d").strftime("%Y-%m-%d")
+    if end:
+        high = (datetime.strptime(end, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
+    return low, high
+
+
+# -----------------------------
+# ROW SOURCES (generators of row-tuple chunks)
+# -----------------------------
+def session_chunks(data_dir, user=None, start=None, end=None, chunk_rows=CHUNK_ROWS):
+    low, high = _bounds(start, end)
+
+    where, params = [], []
+    if user:
+        where.append("user = ?")
+        params.append(user)
+    if low:
+        where.append("timestamp >= ?")
+        params.append(low)
+    if high:
+        where.append("timestamp < ?")
+        params.append(high)
+
+    # One user: walk the (user, timestamp) index.
+    # Everyone: rowid order (insertion ≈ time order) avoids a full sort.
+    order = "timestamp" if user else "rowid"
+
+    conn = connect(data_dir)
+    try:
+        cursor = conn.execute(f"""
+        SELECT {", ".join(name for name, _ in SESSION_COLUMNS)}
+        FROM sessions
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {order}
+        """, params)
+
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield [tuple(r) for r in rows]
+    finally:
+        conn.close()
+
+
+def timeline_chunks(data_dir, user=None, start=None, end=None, chunk_rows=CHUNK_ROWS):
+    low, high = _bounds(start, end)
+
+    where, params = [], []
+    if user:
+        where.append("u.user = ?")
+        params.append(user)
+    if low:
+        where.append("e.ts >= ?")
+        params.append(to_epoch(low + " 00:00:00"))
+    if high:
+        where.append("e.ts < ?")
+        params.append(to_epoch(high + " 00:00:00"))
+
+    # Codes back to the text values (STATUSES / MODES order)
+    status = "CASE e.status " + " ".join(f"WHEN {i} THEN '{s}'" for i, s in enumerate(STATUSES)) + " END"
+    mode = "CASE e.mode " + " ".join(f"WHEN {i} THEN '{m}'" for i, m in enumerate(MODES)) + " END"
+
+    # One user: walk the (user_id, ts, seq) index
+    order = "e.ts, e.seq" if user else "e.user_id, e.ts, e.seq"
+
+    conn = connect(data_dir)
+    try:
+        cursor = conn.execute(f"""
+        SELECT datetime(e.ts, 'unixepoch', 'localtime'), u.user, {mode}, {status}
+        FROM timeline_events e JOIN timeline_users u ON u.id = e.user_id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {order}
+        """, params)
+
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            yield [tuple(r) for r in rows]
+    finally:
+        conn.close()
+
+
+TABLES = {
+    "sessions": (SESSION_COLUMNS, session_chunks),
+    "timeline": (TIMELINE_COLUMNS, timeline_chunks)
+}
+
+
+# -----------------------------
+# ENCODERS (chunks in → bytes out)
+# -----------------------------
+def encode_csv(columns, chunks):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    writer.writerow([name for name, _ in columns])
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+class _Sink(io.RawIOBase):
+    """Write-only file that hands written bytes back to the generator."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def encode_parquet(columns, chunks):
+    """One Parquet row group per chunk (needs pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    return _parquet_stream(pa, pq, columns, chunks)
+
+
+def _parquet_stream(pa, pq, columns, chunks):
+    schema = pa.schema([(name, getattr(pa, kind)()) for name, kind in columns])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    for chunk in chunks:
+        arrays = [
+            pa.array([row[i] for row in chunk], type=schema.field(i).type)
+            for i in range(len(columns))
+        ]
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "parquet": encode_parquet
+}
+
+
+def export(data_dir, table, fmt="csv", user=None, start=None, end=None, chunk_rows=CHUNK_ROWS):
+    """
+    Generator of encoded bytes for `table` ("sessions" / "timeline").
+    user=None exports every user. Raises ValueError on bad arguments.
+    """
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown format: {fmt}")
+    _bounds(start, end)  # validate dates before streaming starts
+
+    columns, source = TABLES[table]
+    return ENCODERS[fmt](columns, source(data_dir, user, start, end, chunk_rows))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export SmartFocus data")
+    parser.add_argument("table", choices=sorted(TABLES))
+    parser.add_argument("--format", choices=sorted(ENCODERS), default="csv")
+    parser.add_argument("--user", help="only this user (default: everyone)")
+    parser.add_argument("--start", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--end", help="YYYY-MM-DD (inclusive)")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for data in export(args.data_dir, args.table, args.format, args.user, args.start, args.end):
+            out.write(data)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
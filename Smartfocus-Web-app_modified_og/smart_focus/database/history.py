@@ -0,0 +1,76 @@
+from smart_focus.database.db import connect
+
+PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+
+# -----------------------------
+# CURSOR ("<timestamp>|<rowid>" of the last row on the page)
+# -----------------------------
+def encode_cursor(row):
+    return f"{row['timestamp']}|{row['id']}"
+
+
+def decode_cursor(cursor):
+    """(timestamp, rowid), or ValueError if the cursor is malformed."""
+    timestamp, sep, rowid = cursor.rpartition("|")
+    if not sep:
+        raise ValueError(f"bad cursor: {cursor!r}")
+    return timestamp, int(rowid)
+
+
+def session_page(data_dir, user, cursor=None, activity=None, mode=None, limit=PAGE_SIZE):
+    """
+    One page of a user's sessions, newest first.
+
+    Keyset pagination on (timestamp DESC, rowid DESC) backed by the
+    (user, timestamp) / (user, activity, timestamp) indexes, so page N
+    costs the same as page 1.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    where = ["user = ?"]
+    params = [user]
+
+    if activity:
+        where.append("activity = ?")
+        params.append(activity)
+    if mode:
+        where.append("mode = ?")
+        params.append(mode)
+    if cursor:
+        where.append("(timestamp, rowid) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+
+    conn = connect(data_dir)
+    rows = conn.execute(f"""
+    SELECT rowid AS id, timestamp, user, mode, activity, goal_hours,
+           focused_seconds, distracted_seconds, focus_score, goal_achieved,
+           total_seconds, activity_avg_per_sec, activity_peak_per_sec,
+           activity_active_ratio
+    FROM sessions
+    WHERE {" AND ".join(where)}
+    ORDER BY timestamp DESC, rowid DESC
+    LIMIT ?
+    """, params + [limit + 1]).fetchall()
+    conn.close()
+
+    records = []
+    for row in rows[:limit]:
+        record = dict(row)
+        record["goal_achieved"] = bool(record["goal_achieved"])
+        records.append(record)
+
+    next_cursor = encode_cursor(records[-1]) if len(rows) > limit else None
+    return records, next_cursor
+
+
+def user_activities(data_dir, user):
+    """Activities the user has sessions for (from the activity_focus rollup)."""
+    conn = connect(data_dir)
+    rows = conn.execute("""
+    SELECT activity FROM activity_focus WHERE user = ? ORDER BY activity
+    """, (user,)).fetchall()
+    conn.close()
+    return [r["activity"] for r in rows]
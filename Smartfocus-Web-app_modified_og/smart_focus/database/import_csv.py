@@ -1,34 +1,256 @@
-import pandas as pd
-import sqlite3
+"""
+Chunked, resumable CSV → SQLite importer.
+
+- Streams the CSV (never holds it in memory)
+- executemany upserts, CHUNK_ROWS rows per transaction
+- Keeps the schema from init_db (no table replace)
+- After every committed chunk the byte offset is saved to
+  <csv>.checkpoint; a rerun resumes from there
+
+Run from the app folder:
+    python -m smart_focus.database.import_csv sessions data/sessions.csv
+    python -m smart_focus.database.import_csv timeline data/timeline.csv
+"""
+
+import argparse
+import csv
+import json
 import os
+import sqlite3
+import time
+
+from smart_focus.database.db import init_db, db_path, mark_migration, migration_done, rebuild_rollups
+from smart_focus.database.timeline import insert_events, to_epoch
 
 DATA_DIR = "data"
 
-csv_path = os.path.join(DATA_DIR, "sessions.csv")
-db_path = os.path.join(DATA_DIR, "smartfocus.db")
+CHUNK_ROWS = 50000
 
 
-def import_csv():
+# -----------------------------
+# ROW PARSERS (CSV dict → row for the writer)
+# -----------------------------
+def _int(value):
+    return int(float(value)) if value not in ("", None) else None
 
-    if not os.path.exists(csv_path):
-        print("sessions.csv not found")
-        return
 
-    df = pd.read_csv(csv_path)
+def _float(value):
+    return float(value) if value not in ("", None) else None
 
-    conn = sqlite3.connect(db_path)
 
-    df.to_sql(
-        "sessions",
-        conn,
-        if_exists="replace",
-        index=False
+def _bool(value):
+    return int(str(value).strip().lower() in ("1", "true", "yes"))
+
+
+def session_row(row):
+    return (
+        row["timestamp"],
+        row["user"].strip().lower(),
+        row.get("mode"),
+        row.get("activity"),
+        _float(row.get("goal_hours")),
+        _int(row.get("focused_seconds")),
+        _int(row.get("distracted_seconds")),
+        _int(row.get("focused_minutes")),
+        _int(row.get("focus_score")),
+        _bool(row.get("goal_achieved")),
+        _int(row.get("total_seconds"))
     )
 
+
+def timeline_row(row):
+    return {
+        "ts": to_epoch(row["timestamp"]),
+        "user": row["user"].strip().lower(),
+        "mode": (row.get("mode") or "").strip().lower(),
+        "status": row["status"]
+    }
+
+
+# -----------------------------
+# SESSION UPSERT (match on the natural key, via idx_sessions_user_ts)
+# -----------------------------
+SESSION_UPDATE = """
+UPDATE sessions SET
+    mode = ?3, activity = ?4, goal_hours = ?5, focused_seconds = ?6,
+    distracted_seconds = ?7, focused_minutes = ?8, focus_score = ?9,
+    goal_achieved = ?10, total_seconds = ?11
+WHERE user = ?2 AND timestamp = ?1
+"""
+
+SESSION_INSERT = """
+INSERT INTO sessions (
+    timestamp, user, mode, activity, goal_hours, focused_seconds,
+    distracted_seconds, focused_minutes, focus_score, goal_achieved,
+    total_seconds
+)
+SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11
+WHERE NOT EXISTS (SELECT 1 FROM sessions WHERE user = ?2 AND timestamp = ?1)
+"""
+
+
+def _upsert_sessions(conn, rows):
+    conn.executemany(SESSION_UPDATE, rows)
+    conn.executemany(SESSION_INSERT, rows)
+
+
+TABLES = {
+    "sessions": (session_row, _upsert_sessions),
+    # Appended in file order (seq keeps same-second transitions in order).
+    # Not idempotent: import a timeline file once (migrate_timeline_csv
+    # records it); a resumed run may repeat the last chunk, and repeated
+    # transitions add no time to status_intervals()
+    "timeline": (timeline_row, insert_events)
+}
+
+
+# -----------------------------
+# CHECKPOINTS
+# -----------------------------
+def _checkpoint_path(csv_path):
+    return csv_path + ".checkpoint"
+
+
+def _load_checkpoint(csv_path, table):
+    try:
+        with open(_checkpoint_path(csv_path)) as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # Different table, or the file was replaced by a shorter one
+    if checkpoint.get("table") != table or checkpoint.get("offset", 0) > os.path.getsize(csv_path):
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(csv_path, checkpoint):
+    tmp = _checkpoint_path(csv_path) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, _checkpoint_path(csv_path))
+
+
+def _lines(f):
+    # readline() (not iteration) keeps f.tell() usable between rows;
+    # csv.reader pulls one line at a time, so after it yields a row
+    # f.tell() is exactly the end of that row
+    while True:
+        line = f.readline()
+        if not line:
+            return
+        yield line
+
+
+def import_csv(table, csv_path, data_dir=DATA_DIR, chunk_rows=CHUNK_ROWS, resume=True):
+    """
+    Import `csv_path` into `table`. Returns the number of rows read.
+    """
+    if table not in TABLES:
+        raise ValueError(f"Unknown table: {table}")
+    if not os.path.exists(csv_path):
+        print(f"{csv_path} not found")
+        return 0
+
+    parse, write = TABLES[table]
+    init_db(db_path(data_dir))
+
+    checkpoint = _load_checkpoint(csv_path, table) if resume else None
+    done = checkpoint["rows"] if checkpoint else 0
+
+    conn = sqlite3.connect(db_path(data_dir))
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    started = time.perf_counter()
+    read = 0
+
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        first = f.readline()
+        if not first.strip():
+            print(f"{csv_path} is empty")
+            conn.close()
+            return 0
+        header = next(csv.reader([first]))
+
+        if checkpoint:
+            f.seek(checkpoint["offset"])
+            print(f"Resuming {table} import at row {done}")
+
+        chunk = []
+
+        for values in csv.reader(_lines(f)):
+            if not values:
+                continue
+            chunk.append(parse(dict(zip(header, values))))
+
+            if len(chunk) >= chunk_rows:
+                with conn:
+                    write(conn, chunk)
+                read += len(chunk)
+                _save_checkpoint(csv_path, {"table": table, "offset": f.tell(), "rows": done + read})
+                chunk = []
+
+                rate = read / (time.perf_counter() - started)
+                print(f"  {done + read} rows ({rate:,.0f} rows/s)")
+
+        if chunk:
+            with conn:
+                write(conn, chunk)
+            read += len(chunk)
+            _save_checkpoint(csv_path, {"table": table, "offset": f.tell(), "rows": done + read})
+
+    # Rollups are derived from sessions: rebuild once at the end
+    if table == "sessions":
+        with conn:
+            rebuild_rollups(conn)
+
     conn.close()
+    if os.path.exists(_checkpoint_path(csv_path)):
+        os.remove(_checkpoint_path(csv_path))
+
+    elapsed = time.perf_counter() - started
+    print(f"Imported {read} {table} rows in {elapsed:.1f}s ({read / max(elapsed, 1e-9):,.0f} rows/s)")
+    return read
+
+
+def migrate_timeline_csv(data_dir=DATA_DIR):
+    """
+    One-shot move of the old timeline.csv into timeline_events.
+    Completion is recorded in the migrations table; the file is left
+    in place (an interrupted run resumes from its checkpoint).
+    """
+    csv_path = os.path.join(data_dir, "timeline.csv")
+    if not os.path.exists(csv_path):
+        return 0
+
+    init_db(db_path(data_dir))
+    conn = sqlite3.connect(db_path(data_dir))
+    done = migration_done(conn, "timeline_csv")
+    conn.close()
+    if done:
+        return 0
+
+    read = import_csv("timeline", csv_path, data_dir)
+
+    conn = sqlite3.connect(db_path(data_dir))
+    with conn:
+        mark_migration(conn, "timeline_csv")
+    conn.close()
+    return read
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import a SmartFocus CSV into smartfocus.db")
+    parser.add_argument("table", choices=sorted(TABLES))
+    parser.add_argument("csv_path", nargs="?", help="default: data/<table>.csv")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--fresh", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args(argv)
 
-    print("CSV imported into database successfully")
+    csv_path = args.csv_path or os.path.join(args.data_dir, f"{args.table}.csv")
+    import_csv(args.table, csv_path, args.data_dir, args.chunk_rows, resume=not args.fresh)
 
 
 if __name__ == "__main__":
-    import_csv()
\ No newline at end of file
+    main()
@@ -0,0 +1,107 @@
+import glob
+import json
+import os
+from datetime import datetime
+
+from smart_focus.database.db import connect, mark_migration, migration_done
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def migrate_notes_json(data_dir):
+    """
+    One-shot import of the old notes_<user>.json files.
+    Each file is recorded in the migrations table (the file itself is
+    left alone), so it is imported once.
+    """
+    conn = connect(data_dir)
+    imported = 0
+
+    for path in sorted(glob.glob(os.path.join(data_dir, "notes_*.json"))):
+        name = os.path.basename(path)
+        user = name[len("notes_"):-len(".json")]
+        if migration_done(conn, f"notes_json:{name}"):
+            continue
+
+        try:
+            with open(path, "r") as f:
+                notes = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Skipping {path}: {e}")
+            continue
+
+        # Old ids could repeat after deletes; keep the order, not the ids
+        with conn:
+            conn.executemany("""
+            INSERT INTO notes (user, content, timestamp) VALUES (?, ?, ?)
+            """, [(user, n.get("content", ""), n.get("timestamp", "")) for n in notes])
+            mark_migration(conn, f"notes_json:{name}")
+        imported += len(notes)
+
+    conn.close()
+    return imported
+
+
+class NoteStore:
+    """
+    Per-user notes in smartfocus.db.
+
+    - Ids come from INTEGER PRIMARY KEY AUTOINCREMENT: never reused
+    - Insert / delete touch one row (no whole-file rewrite)
+    - page() walks the (user, id) index newest first, keyset style
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+
+    def add(self, user, content):
+        note = {
+            "content": content,
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")
+        }
+
+        conn = connect(self.data_dir)
+        with conn:
+            cursor = conn.execute("""
+            INSERT INTO notes (user, content, timestamp) VALUES (?, ?, ?)
+            """, (user, note["content"], note["timestamp"]))
+        conn.close()
+
+        return {"id": cursor.lastrowid, **note}
+
+    def delete(self, user, note_id):
+        """Returns False if the user has no note with that id."""
+        conn = connect(self.data_dir)
+        with conn:
+            cursor = conn.execute(
+                "DELETE FROM notes WHERE id = ? AND user = ?", (note_id, user)
+            )
+        conn.close()
+        return cursor.rowcount > 0
+
+    def page(self, user, before=None, limit=PAGE_SIZE):
+        """
+        Up to `limit` notes older than id `before` (newest first).
+        Returns (notes, next_before); next_before is None on the last page.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        conn = connect(self.data_dir)
+        if before is None:
+            rows = conn.execute("""
+            SELECT id, content, timestamp FROM notes
+            WHERE user = ?
+            ORDER BY id DESC LIMIT ?
+            """, (user, limit + 1)).fetchall()
+        else:
+            rows = conn.execute("""
+            SELECT id, content, timestamp FROM notes
+            WHERE user = ? AND id < ?
+            ORDER BY id DESC LIMIT ?
+            """, (user, int(before), limit + 1)).fetchall()
+        conn.close()
+
+        notes = [dict(r) for r in rows[:limit]]
+        next_before = notes[-1]["id"] if len(rows) > limit else None
+        return notes, next_before
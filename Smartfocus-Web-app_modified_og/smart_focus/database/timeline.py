@@ -0,0 +1,111 @@
+import time
+from datetime import datetime
+
+import numpy as np
+
+from smart_focus.database.db import connect
+
+# 1-byte codes stored in timeline_events (index = code)
+STATUSES = ("Distracted", "Focused")
+MODES = ("camera", "no_camera")
+
+STATUS_CODES = {s: i for i, s in enumerate(STATUSES)}
+MODE_CODES = {m: i for i, m in enumerate(MODES)}
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+INSERT_EVENT = """
+INSERT INTO timeline_events (user_id, ts, status, mode)
+VALUES (?, ?, ?, ?)
+"""
+
+
+def to_epoch(timestamp):
+    """Local "YYYY-MM-DD HH:MM:SS" → epoch seconds."""
+    return int(time.mktime(datetime.strptime(timestamp, TIMESTAMP_FORMAT).timetuple()))
+
+
+# -----------------------------
+# WRITES (inside the caller's transaction)
+# -----------------------------
+def user_ids(conn, users):
+    """Interned id for each name in `users` (created on first use)."""
+    users = sorted(set(users))
+    conn.executemany(
+        "INSERT OR IGNORE INTO timeline_users (user) VALUES (?)", [(u,) for u in users]
+    )
+    rows = conn.execute(
+        f"SELECT user, id FROM timeline_users WHERE user IN ({','.join('?' * len(users))})",
+        users
+    ).fetchall()
+    return {user: uid for user, uid in rows}
+
+
+def insert_events(conn, events):
+    """
+    Store status transitions in the given order. `events` are dicts with
+    ts (epoch seconds), user, mode, status. Unknown statuses are skipped.
+    Several transitions may share a second; seq keeps their order.
+    """
+    events = [e for e in events if e["status"] in STATUS_CODES]
+    if not events:
+        return
+
+    ids = user_ids(conn, (e["user"] for e in events))
+    conn.executemany(INSERT_EVENT, [
+        (ids[e["user"]], int(e["ts"]), STATUS_CODES[e["status"]], MODE_CODES.get(e["mode"], 0))
+        for e in events
+    ])
+
+
+# -----------------------------
+# QUERIES
+# -----------------------------
+def status_intervals(data_dir, user, start_ts, end_ts):
+    """
+    Status intervals of `user` between two epoch times, clipped to the window.
+
+    Returns numpy arrays (starts, ends, statuses); statuses are codes
+    (index into STATUSES). The status in force at start_ts comes from
+    the last transition before it. Transitions within the same second
+    are taken in logging order (seq), so the last one wins.
+    One (user_id, ts, seq) range scan.
+    """
+    conn = connect(data_dir)
+    row = conn.execute("SELECT id FROM timeline_users WHERE user = ?", (user,)).fetchone()
+
+    if row is None:
+        conn.close()
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty.astype(np.int8)
+
+    uid = row[0]
+    before = conn.execute("""
+    SELECT ts, status FROM timeline_events
+    WHERE user_id = ? AND ts < ?
+    ORDER BY ts DESC, seq DESC LIMIT 1
+    """, (uid, start_ts)).fetchall()
+    rows = conn.execute("""
+    SELECT ts, status FROM timeline_events
+    WHERE user_id = ? AND ts >= ? AND ts < ?
+    ORDER BY ts, seq
+    """, (uid, start_ts, end_ts)).fetchall()
+    conn.close()
+
+    data = np.array(before + rows, dtype=np.int64).reshape(-1, 2)
+    ts, status = data[:, 0], data[:, 1].astype(np.int8)
+
+    starts = np.maximum(ts, start_ts)
+    ends = np.append(ts[1:], end_ts)
+    keep = ends > starts
+    return starts[keep], ends[keep], status[keep]
+
+
+def session_intervals(data_dir, session_row):
+    """
+    status_intervals() for one finished session (a sessions row:
+    timestamp is the stop time, total_seconds the length).
+    """
+    end_ts = to_epoch(session_row["timestamp"])
+    start_ts = end_ts - int(session_row["total_seconds"] or 0)
+    return status_intervals(data_dir, session_row["user"], start_ts, end_ts)
@@ -0,0 +1,137 @@
+import csv
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from smart_focus.database.db import connect
+
+USERS_CSV = "users.csv"
+
+# Accounts kept in memory (hits skip SQLite entirely)
+CACHE_SIZE = 10000
+
+# Seconds a cached account is trusted; bounds how long a sign-up or
+# password change made by another process goes unseen
+CACHE_TTL = 30
+
+
+def migrate_users_csv(data_dir):
+    """
+    One-shot import of the old users.csv into the users table.
+    Runs only while the table is empty; returns the number of rows imported.
+    """
+    csv_path = os.path.join(data_dir, USERS_CSV)
+    if not os.path.exists(csv_path):
+        return 0
+
+    conn = connect(data_dir)
+    try:
+        if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone() is not None:
+            return 0
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = [
+                (row["user"], row.get("email") or "", row["password"])
+                for row in csv.DictReader(f)
+                if row.get("user") and row.get("password")
+            ]
+
+        # First row wins if the CSV ever got a duplicate
+        with conn:
+            conn.executemany("""
+            INSERT OR IGNORE INTO users (user, email, password)
+            VALUES (?, ?, ?)
+            """, rows)
+    finally:
+        conn.close()
+
+    print(f"Imported {len(rows)} users from {USERS_CSV}")
+    return len(rows)
+
+
+class UserStore:
+    """
+    Accounts in smartfocus.db with a read-through cache.
+
+    - Lookups hit the unique index on users.user (O(log n) on a miss)
+    - Recently seen users are served from memory for CACHE_TTL seconds;
+      "no such user" is never cached, so sign-ups from other processes
+      show up at once
+    - Duplicate registrations are rejected by the UNIQUE constraint,
+      so two concurrent sign-ups can't both win
+    """
+
+    def __init__(self, data_dir, cache_size=CACHE_SIZE, cache_ttl=CACHE_TTL):
+        self.data_dir = data_dir
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._cache = OrderedDict()   # user -> (dict, expires)
+        self._lock = threading.Lock()
+
+    def _remember(self, user, record):
+        with self._lock:
+            self._cache[user] = (record, time.monotonic() + self.cache_ttl)
+            self._cache.move_to_end(user)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get(self, user):
+        """{"user", "email", "password"} for `user`, or None."""
+        with self._lock:
+            entry = self._cache.get(user)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._cache.move_to_end(user)
+                    return entry[0]
+                del self._cache[user]
+
+        conn = connect(self.data_dir)
+        row = conn.execute(
+            "SELECT user, email, password FROM users WHERE user = ?", (user,)
+        ).fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+        record = dict(row)
+        self._remember(user, record)
+        return record
+
+    def any(self):
+        """True once at least one account exists."""
+        conn = connect(self.data_dir)
+        row = conn.execute("SELECT 1 FROM users LIMIT 1").fetchone()
+        conn.close()
+        return row is not None
+
+    def exists(self, user):
+        return self.get(user) is not None
+
+    def create(self, user, email, password_hash):
+        """Add a user. Returns False if the name is already taken."""
+        conn = connect(self.data_dir)
+        try:
+            with conn:
+                conn.execute("""
+                INSERT INTO users (user, email, password) VALUES (?, ?, ?)
+                """, (user, email, password_hash))
+        except sqlite3.IntegrityError:
+            return False
+        finally:
+            conn.close()
+
+        self._remember(user, {"user": user, "email": email, "password": password_hash})
+        return True
+
+    def set_password(self, user, password_hash):
+        conn = connect(self.data_dir)
+        with conn:
+            conn.execute(
+                "UPDATE users SET password = ? WHERE user = ?", (password_hash, user)
+            )
+        conn.close()
+
+        with self._lock:
+            self._cache.pop(user, None)
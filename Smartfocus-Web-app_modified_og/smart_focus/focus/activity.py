@@ -0,0 +1,62 @@
+# smart_focus/focus/activity.py
+
+import time
+from array import array
+
+
+class ActivitySampler:
+    """
+    Reduces raw keyboard / mouse events to numbers the tick can read.
+
+    - Listener callbacks only store a timestamp and bump a counter
+      (no locks, no status logic on the listener threads)
+    - Each counter has a single writer thread (keyboard or mouse),
+      so plain increments don't race; the tick only reads them
+    - sample() runs on the scheduler tick and records how many events
+      arrived since the previous tick (per-second activity density)
+    """
+
+    def __init__(self):
+        self.last_activity = time.time()
+
+        self.key_events = 0
+        self.mouse_events = 0
+        self._seen = 0
+
+        # Events per tick for the whole session (2 bytes per second)
+        self.density = array("H")
+
+    # ---------------------------
+    # Listener threads
+    # ---------------------------
+    def on_key(self, *args):
+        self.last_activity = time.time()
+        self.key_events += 1
+
+    def on_mouse(self, *args):
+        self.last_activity = time.time()
+        self.mouse_events += 1
+
+    # ---------------------------
+    # Scheduler tick
+    # ---------------------------
+    def sample(self):
+        """Events since the last call (also appended to `density`)."""
+        total = self.key_events + self.mouse_events
+        count = total - self._seen
+        self._seen = total
+        self.density.append(min(count, 0xFFFF))
+        return count
+
+    def report(self):
+        seconds = len(self.density)
+        if not seconds:
+            return {"seconds": 0, "avg_per_sec": 0.0, "peak_per_sec": 0, "active_ratio": 0.0}
+
+        active = sum(1 for c in self.density if c)
+        return {
+            "seconds": seconds,
+            "avg_per_sec": round(sum(self.density) / seconds, 2),
+            "peak_per_sec": max(self.density),
+            "active_ratio": round(active / seconds, 3)
+        }
@@ -3,11 +3,14 @@ import cv2
 import mediapipe as mp
 import numpy as np
 import time
-import math
-import threading
 
 from smart_focus.focus.session import FocusSession
+from smart_focus.focus.frame_gate import DEFAULT_MAX_SKIP, DEFAULT_THRESHOLD, FrameGate
+from smart_focus.focus.inference import DROPPED
+from smart_focus.focus.landmarks import face_metrics, from_mesh
+from smart_focus.focus.preprocess import FramePreprocessor
 from smart_focus.utils.distraction_detector import DistractionDetector
+from smart_focus.utils.scheduler import scheduler
 
 
 
@@ -19,8 +22,33 @@ OPEN_DEBOUNCE = 0.25
 HEAD_TURN_THRESHOLD=0.12
 
 
-def euclidean(p1, p2):
-    return math.sqrt((p1.x - p2.x) ** 2 + (p1.y - p2.y) ** 2)
+def frame_flags(points):
+    """
+    (eyes_open, head_turned) for one compact frame (K, 2)
+    or a whole (F, K, 2) batch (offline replays, many sessions).
+    """
+    metrics = face_metrics(points)
+    eyes_open = metrics["ear"] > EAR_THRESHOLD
+    head_turned = np.abs(metrics["head_turn"]) > HEAD_TURN_THRESHOLD
+    return eyes_open, head_turned
+
+
+def decode_frame_bytes(buf):
+    """
+    Decode raw JPEG/WebP bytes (bytes, bytearray or memoryview).
+    np.frombuffer only wraps the buffer, so nothing is copied
+    before cv2.imdecode.
+    """
+    img_array = np.frombuffer(buf, np.uint8)
+    if img_array.size == 0:
+        return None
+    return cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+
+
+def decode_frame_base64(frame_base64):
+    """Decode a `data:image/jpeg;base64,...` URL (legacy JSON path)."""
+    img_bytes = base64.b64decode(frame_base64.split(",")[1])
+    return decode_frame_bytes(img_bytes)
 
 
 class CameraFocusTracker:
@@ -32,7 +60,16 @@ class CameraFocusTracker:
     - Timing is NOT dependent on frame rate
     """
 
-    def __init__(self, user_name, goal_hours,activity='camera',topic=''):
+    def __init__(
+        self,
+        user_name,
+        goal_hours,
+        activity='camera',
+        topic='',
+        pool=None,
+        gate_threshold=DEFAULT_THRESHOLD,
+        gate_max_skip=DEFAULT_MAX_SKIP
+    ):
         self.session = FocusSession(
             user_name=user_name,
             goal_hours=goal_hours,
@@ -41,7 +78,17 @@ class CameraFocusTracker:
             topic=topic
         )
 
-        self.face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True)
+        # Shared InferencePool if given, else a private FaceMesh
+        self.pool = pool
+        self.pool_key = f"{user_name}:{id(self)}"
+        self.face_mesh = None
+        if pool is None:
+            self.face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True)
+
+        # Skip near-identical frames, then crop / downscale the rest
+        self.gate = FrameGate(gate_threshold, gate_max_skip)
+        self.preprocessor = FramePreprocessor()
+        self.last_landmarks = None
 
         self.state = "no_face"
         self.current_status = "Distracted"
@@ -51,6 +98,7 @@ class CameraFocusTracker:
         self.blink_counted = False
         self.open_start = None
         self.blink_count = 0
+        self.metrics = None
         self.auto_stopped=False
         self.activity=activity.lower()
         self.topic=topic.lower()
@@ -60,20 +108,17 @@ class CameraFocusTracker:
         self.session.start()
 
 
-        # 🔥 HARD 1-SECOND TIMER (SOURCE OF TRUTH)
-        self.timer_thread = threading.Thread(
-            target=self._time_loop,
-            daemon=True
-        )
-        self.timer_thread.start()
+        # 🔥 HARD 1-SECOND TICK (SOURCE OF TRUTH)
+        self.tick_job = scheduler.every(1, self._tick)
 
     # =========================
-    # 1-SECOND TIME LOOP
+    # 1-SECOND TICK
     # =========================
-    def _time_loop(self):
-        while self.running:
-            time.sleep(1)
-            self.session.update_status(self.current_status)
+    def _tick(self):
+        if not self.running:
+            self.tick_job.cancel()
+            return
+        self.session.update_status(self.current_status)
 
     # =========================
     # FRAME PROCESSING
@@ -82,31 +127,47 @@ class CameraFocusTracker:
         if not self.running:
             return {"status": "stopped"}
 
-        img_bytes = base64.b64decode(frame_base64.split(",")[1])
-        img_array = np.frombuffer(img_bytes, np.uint8)
-        frame = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
+        frame = decode_frame_base64(frame_base64)
+        if frame is not None and not self.gate.changed_frame(frame):
+            return self.process_landmarks(self.last_landmarks)
+        return self.process_image(frame)
 
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.face_mesh.process(rgb)
+    def process_frame_bytes(self, buf):
+        if not self.running:
+            return {"status": "stopped"}
+
+        # Unchanged frame: reuse the last landmarks, skip decode + inference
+        if not self.gate.changed_bytes(buf):
+            return self.process_landmarks(self.last_landmarks)
+        return self.process_image(decode_frame_bytes(buf))
+
+    def process_image(self, frame):
+        if not self.running:
+            return {"status": "stopped"}
+        if frame is None:
+            return {"status": "bad frame"}
 
+        landmarks = self._infer(frame)
+
+        # Pool was too busy: keep the last decision (and the gate keeps
+        # its reference, so the next similar frame is not skipped)
+        if landmarks is DROPPED:
+            return self.stats()
+
+        self.last_landmarks = landmarks
+        self.gate.accept()
+        return self.process_landmarks(landmarks)
+
+    def process_landmarks(self, landmarks):
         now = time.time()
         focus_status = "Distracted"
 
-        if not results.multi_face_landmarks:
+        if landmarks is None:
             self.state = "no_face"
 
         else:
-            face = results.multi_face_landmarks[0]
-
-            top = face.landmark[159]
-            bottom = face.landmark[145]
-            left = face.landmark[33]
-            right = face.landmark[133]
-
-            ver = euclidean(top, bottom)
-            hor = euclidean(left, right)
-            EAR = ver / hor if hor else 0
-            eyes_open = EAR > EAR_THRESHOLD
+            self.metrics = face_metrics(landmarks, pitch=True)
+            eyes_open = self.metrics["ear"] > EAR_THRESHOLD
 
             if not eyes_open:
                 if self.blink_start is None:
@@ -132,23 +193,57 @@ class CameraFocusTracker:
                 self.state = "focused"
                 focus_status = "Focused"
 
-            nose_x = face.landmark[1].x
-            eye_center_x = (face.landmark[33].x + face.landmark[263].x) / 2
-            print(abs(nose_x-eye_center_x))
-            if abs(nose_x - eye_center_x) > HEAD_TURN_THRESHOLD:
+            head_turn = abs(float(self.metrics["head_turn"]))
+            print(head_turn)
+            if head_turn > HEAD_TURN_THRESHOLD:
                 focus_status = "Distracted"
 
         #  THIS is what timer reads
         self.current_status = focus_status
         print("Status : ",self.current_status)
 
+        return self.stats()
+
+    def _infer(self, frame):
+        """Preprocess -> FaceMesh -> full-frame landmarks."""
+        image, roi = self.preprocessor.prepare(frame)
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+        started = time.time()
+        landmarks = self._detect(rgb)
+        if landmarks is DROPPED:
+            return DROPPED
+
+        landmarks = self.preprocessor.update(landmarks, roi, time.time() - started)
+
+        # Missed inside the crop: confirm on the full frame
+        if landmarks is None and not roi.full_frame:
+            return self._infer(frame)
+        return landmarks
+
+    def _detect(self, rgb):
+        """(N, 2) landmark array, None if no face, or DROPPED."""
+        if self.pool is not None:
+            return self.pool.infer(self.pool_key, rgb)
+
+        results = self.face_mesh.process(rgb)
+        if not results.multi_face_landmarks:
+            return None
+        return from_mesh(results.multi_face_landmarks[0])
+
+    # =========================
+    # CURRENT STATS
+    # =========================
+    def stats(self):
         return {
             "status": self.current_status,
             "state": self.state,
             "blinks": self.blink_count,
             "focused_seconds": int(self.session.focused_seconds),
             "distracted_seconds": int(self.session.distracted_seconds),
-            "focus_score": self.session.calculate_score()
+            "focus_score": self.session.calculate_score(),
+            "preprocess": self.preprocessor.report(),
+            "gate": self.gate.report()
         }
 
     # =========================
@@ -158,6 +253,9 @@ class CameraFocusTracker:
         if not self.running:
             return self.session.summary()
         self.running = False
+        self.tick_job.cancel()
+        if self.pool is not None:
+            self.pool.release(self.pool_key)
         if hasattr(self,"detector"):
             self.detector.stop()
         self.session.stop()
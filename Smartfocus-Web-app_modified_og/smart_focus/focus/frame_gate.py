@@ -0,0 +1,102 @@
+# smart_focus/focus/frame_gate.py
+
+import cv2
+import numpy as np
+
+
+# Mean absolute grey-level difference (0-255) of the 16x16 thumbnails
+# below which a frame counts as "unchanged"
+DEFAULT_THRESHOLD = 2.0
+
+# Force a real inference after this many skipped frames in a row
+DEFAULT_MAX_SKIP = 5
+
+THUMB_SIZE = (16, 16)
+
+
+class FrameGate:
+    """
+    Cheap change detector in front of FaceMesh.
+
+    Each frame is reduced to a tiny grey thumbnail. For JPEG/WebP bytes
+    the thumbnail comes from a 1/8 scale decode, so an unchanged frame
+    is never fully decoded. A threshold of 0 disables the gate.
+
+    A frame that passes only becomes the reference once accept() says
+    its inference succeeded; after a dropped inference later frames are
+    still compared with the last frame that has landmarks.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, max_skip=DEFAULT_MAX_SKIP):
+        self.threshold = float(threshold)
+        self.max_skip = int(max_skip)
+
+        self._last_thumb = None
+        self._pending = None
+        self._skip_run = 0
+
+        self.frames = 0
+        self.skipped = 0
+
+    # ---------------------------
+    # Thumbnails
+    # ---------------------------
+    @staticmethod
+    def thumb_from_bytes(buf):
+        small = cv2.imdecode(np.frombuffer(buf, np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+        if small is None:
+            return None
+        return cv2.resize(small, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def thumb_from_frame(frame):
+        grey = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(grey, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+    # ---------------------------
+    # Decision
+    # ---------------------------
+    def changed(self, thumb):
+        """True if the frame needs a real inference."""
+        self.frames += 1
+
+        if thumb is None or self.threshold <= 0 or self._last_thumb is None:
+            return self._pass(thumb)
+
+        diff = float(np.mean(cv2.absdiff(thumb, self._last_thumb)))
+        if diff >= self.threshold or self._skip_run >= self.max_skip:
+            return self._pass(thumb)
+
+        self._skip_run += 1
+        self.skipped += 1
+        return False
+
+    def _pass(self, thumb):
+        self._pending = thumb
+        return True
+
+    def accept(self):
+        """The frame that last passed was inferred: compare later frames with it."""
+        if self._pending is not None:
+            self._last_thumb = self._pending
+            self._pending = None
+        self._skip_run = 0
+
+    def changed_bytes(self, buf):
+        if self.threshold <= 0:
+            return self.changed(None)
+        return self.changed(self.thumb_from_bytes(buf))
+
+    def changed_frame(self, frame):
+        if self.threshold <= 0:
+            return self.changed(None)
+        return self.changed(self.thumb_from_frame(frame))
+
+    def report(self):
+        return {
+            "threshold": self.threshold,
+            "max_skip": self.max_skip,
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "skip_rate": round(self.skipped / self.frames, 3) if self.frames else 0.0
+        }
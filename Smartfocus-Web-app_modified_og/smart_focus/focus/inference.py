@@ -0,0 +1,335 @@
+# smart_focus/focus/inference.py
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import mediapipe as mp
+
+from smart_focus.focus.landmarks import from_mesh
+
+
+# Frames waiting longer than this in the queue are not worth running
+MAX_FRAME_AGE = 1.0
+
+# How long a request thread waits for its landmarks
+RESULT_TIMEOUT = 2.0
+
+# Frames queued per worker; a new frame beyond this evicts the oldest
+FRAMES_PER_WORKER = 2
+
+# Tracking FaceMesh instances a worker keeps (one per session); the
+# least recently used is closed beyond this or after TRACKER_IDLE seconds
+MAX_TRACKERS = 8
+TRACKER_IDLE = 30
+
+# Returned by InferencePool.infer() when the frame was not processed
+# (queue full, too old or timed out). Callers keep their last decision.
+DROPPED = "dropped"
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# =========================
+# WORKER PROCESS
+# =========================
+class _Trackers:
+    """
+    One tracking FaceMesh per session inside a worker. Each session's
+    frames always reach the same worker, so FaceMesh can follow the face
+    from frame to frame instead of running face detection every time.
+    """
+
+    def __init__(self, max_trackers=MAX_TRACKERS, idle=TRACKER_IDLE):
+        self.max_trackers = max_trackers
+        self.idle = idle
+        self._meshes = OrderedDict()   # key -> (FaceMesh, last used)
+
+    def get(self, key, now):
+        entry = self._meshes.pop(key, None)
+        mesh = entry[0] if entry else mp.solutions.face_mesh.FaceMesh(refine_landmarks=True)
+        self._meshes[key] = (mesh, now)
+
+        # Oldest first: close the idle ones and any beyond the limit
+        while len(self._meshes) > 1:
+            old_key, (old_mesh, used) = next(iter(self._meshes.items()))
+            if len(self._meshes) <= self.max_trackers and now - used < self.idle:
+                break
+            del self._meshes[old_key]
+            old_mesh.close()
+        return mesh
+
+    def close(self, key=None):
+        keys = list(self._meshes) if key is None else [key]
+        for k in keys:
+            entry = self._meshes.pop(k, None)
+            if entry:
+                entry[0].close()
+
+
+def _worker_main(worker_id, tasks, results, max_age):
+    trackers = _Trackers()
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+
+        key, seq, submitted, rgb = task
+
+        # Session finished: free its tracker
+        if rgb is None:
+            trackers.close(key)
+            continue
+
+        started = time.time()
+
+        if started - submitted > max_age:
+            results.put((worker_id, key, seq, DROPPED, 0.0))
+            continue
+
+        landmarks = None
+        out = trackers.get(key, started).process(rgb)
+        if out.multi_face_landmarks:
+            landmarks = from_mesh(out.multi_face_landmarks[0])
+
+        results.put((worker_id, key, seq, landmarks, time.time() - started))
+
+    trackers.close()
+
+
+class _Waiter:
+
+    __slots__ = ("event", "result")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = DROPPED
+
+
+class InferencePool:
+    """
+    Fixed pool of FaceMesh worker processes shared by all camera sessions.
+
+    - Each session is pinned to one worker (the one with the fewest
+      sessions when it first sends a frame), which keeps a tracking
+      FaceMesh for it; release(key) unpins it when the session ends
+    - Every worker has a bounded queue; when it is full the oldest queued
+      frame is dropped so the newest one runs
+    - Workers skip frames that waited longer than `max_age`
+    - Compact landmarks come back to the waiting request thread by (key, seq)
+    """
+
+    def __init__(self, workers=None, queue_size=None, max_age=MAX_FRAME_AGE):
+        self.workers = workers or default_workers()
+        self.queue_size = queue_size or self.workers * FRAMES_PER_WORKER
+        self.max_age = max_age
+
+        self._tasks = []
+        self._assigned = {}   # session key -> worker id
+        self._results = None
+        self._procs = []
+        self._collector = None
+
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._waiting = {}
+
+        # Metrics
+        self._worker_stats = {}
+        self.started_at = None
+        self.submitted = 0
+        self.dropped_full = 0
+        self.dropped_stale = 0
+        self.timeouts = 0
+
+    # ---------------------------
+    # Start / Stop
+    # ---------------------------
+    def start(self):
+        with self._start_lock:
+            if not self._procs:
+                self._spawn()
+        return self
+
+    def _spawn(self):
+        per_worker = max(1, self.queue_size // self.workers)
+        self._tasks = [multiprocessing.Queue(maxsize=per_worker) for _ in range(self.workers)]
+        self._results = multiprocessing.Queue()
+
+        for worker_id in range(self.workers):
+            proc = multiprocessing.Process(
+                target=_worker_main,
+                args=(worker_id, self._tasks[worker_id], self._results, self.max_age),
+                daemon=True
+            )
+            proc.start()
+            self._procs.append(proc)
+            self._worker_stats[worker_id] = {"frames": 0, "busy_seconds": 0.0}
+
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+        self.started_at = time.time()
+        print(f"🧠 Inference pool started | workers={self.workers}")
+
+    def stop(self):
+        for tasks in self._tasks[:len(self._procs)]:
+            tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout=5)
+        self._procs = []
+        if self._results is not None:
+            self._results.put(None)
+
+    # ---------------------------
+    # Inference
+    # ---------------------------
+    def infer(self, key, rgb, timeout=RESULT_TIMEOUT):
+        """
+        Run FaceMesh on an RGB frame for session `key`.
+        Returns a compact (K, 2) landmark array, None (no face) or DROPPED.
+        """
+        seq = next(self._seq)
+        waiter = _Waiter()
+
+        with self._lock:
+            self._waiting[(key, seq)] = waiter
+            self.submitted += 1
+            worker_id = self._worker_for(key)
+
+        if not self._submit(self._tasks[worker_id], (key, seq, time.time(), rgb)):
+            with self._lock:
+                self._waiting.pop((key, seq), None)
+                self.dropped_full += 1
+            return DROPPED
+
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                self._waiting.pop((key, seq), None)
+                self.timeouts += 1
+            return DROPPED
+
+        return waiter.result
+
+    def release(self, key):
+        """Session `key` is done: unpin it and close its tracker."""
+        with self._lock:
+            worker_id = self._assigned.pop(key, None)
+        if worker_id is not None and self._procs:
+            try:
+                self._tasks[worker_id].put_nowait((key, None, 0.0, None))
+            except queue.Full:
+                pass   # the worker closes it once idle
+
+    def _worker_for(self, key):
+        """Worker pinned to `key` (lock held)."""
+        worker_id = self._assigned.get(key)
+        if worker_id is None:
+            load = [0] * self.workers
+            for assigned in self._assigned.values():
+                load[assigned] += 1
+            worker_id = load.index(min(load))
+            self._assigned[key] = worker_id
+        return worker_id
+
+    def _submit(self, tasks, task):
+        """
+        Queue `task`; on a full queue drop the oldest waiting frame
+        (its caller gets DROPPED) and retry once. False if it still
+        didn't fit.
+        """
+        try:
+            tasks.put_nowait(task)
+            return True
+        except queue.Full:
+            pass
+
+        try:
+            old = tasks.get_nowait()
+        except queue.Empty:
+            old = ()
+        if old is None:
+            # Stop signal: put it back, the pool is shutting down
+            try:
+                tasks.put_nowait(None)
+            except queue.Full:
+                pass
+            return False
+
+        # A release message has no waiter (the worker closes idle trackers)
+        if old and old[3] is not None:
+            old_key, old_seq = old[0], old[1]
+            with self._lock:
+                waiter = self._waiting.pop((old_key, old_seq), None)
+                self.dropped_full += 1
+            if waiter is not None:
+                waiter.event.set()      # result stays DROPPED
+
+        try:
+            tasks.put_nowait(task)
+            return True
+        except queue.Full:
+            return False
+
+    def _collect(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+
+            worker_id, key, seq, landmarks, latency = item
+
+            with self._lock:
+                # DROPPED comes back pickled, so compare by value
+                if isinstance(landmarks, str):
+                    self.dropped_stale += 1
+                    landmarks = DROPPED
+                else:
+                    stats = self._worker_stats[worker_id]
+                    stats["frames"] += 1
+                    stats["busy_seconds"] += latency
+                waiter = self._waiting.pop((key, seq), None)
+
+            if waiter is not None:
+                waiter.result = landmarks
+                waiter.event.set()
+
+    # ---------------------------
+    # Metrics
+    # ---------------------------
+    def metrics(self):
+        with self._lock:
+            workers = []
+            total = 0
+            for worker_id, stats in sorted(self._worker_stats.items()):
+                frames = stats["frames"]
+                busy = stats["busy_seconds"]
+                workers.append({
+                    "worker": worker_id,
+                    "frames": frames,
+                    "avg_latency_ms": round(busy / frames * 1000, 2) if frames else 0,
+                    # What one worker sustains while busy (1 / avg latency)
+                    "busy_fps": round(frames / busy, 2) if busy else 0
+                })
+                total += frames
+
+            # Pool throughput: frames finished per wall-clock second since start
+            uptime = time.time() - self.started_at if self.started_at else 0
+
+            return {
+                "workers": workers,
+                "sessions": len(self._assigned),
+                "throughput_fps": round(total / uptime, 2) if uptime else 0,
+                "queue_size": self.queue_size,
+                "submitted": self.submitted,
+                "dropped_full": self.dropped_full,
+                "dropped_stale": self.dropped_stale,
+                "timeouts": self.timeouts
+            }
@@ -0,0 +1,95 @@
+# smart_focus/focus/landmarks.py
+
+import numpy as np
+
+
+# =========================
+# FaceMesh indices we use
+# =========================
+NOSE_TIP = 1
+FOREHEAD = 10
+CHIN = 152
+CHEEK_LEFT = 234
+CHEEK_RIGHT = 454
+
+# outer corner, inner corner, top lid, bottom lid
+LEFT_EYE = (33, 133, 159, 145)
+RIGHT_EYE = (263, 362, 386, 374)
+
+MESH_INDICES = (
+    NOSE_TIP,
+    *LEFT_EYE,
+    *RIGHT_EYE,
+    FOREHEAD,
+    CHIN,
+    CHEEK_LEFT,
+    CHEEK_RIGHT
+)
+
+# Positions inside the compact (K, 2) array
+(
+    NOSE,
+    L_OUTER, L_INNER, L_TOP, L_BOTTOM,
+    R_OUTER, R_INNER, R_TOP, R_BOTTOM,
+    TOP, BOTTOM, SIDE_LEFT, SIDE_RIGHT
+) = range(len(MESH_INDICES))
+
+
+# =========================
+# ADAPTERS
+# =========================
+def from_mesh(face):
+    """MediaPipe face landmarks -> compact (K, 2) float32 array."""
+    lm = face.landmark
+    return np.array(
+        [(lm[i].x, lm[i].y) for i in MESH_INDICES],
+        dtype=np.float32
+    )
+
+
+def from_array(points):
+    """Full (478, 2) landmark array (or (F, 478, 2) batch) -> compact."""
+    return np.ascontiguousarray(np.asarray(points)[..., MESH_INDICES, :])
+
+
+# =========================
+# METRICS
+# =========================
+def _dist(points, a, b):
+    d = points[..., a, :] - points[..., b, :]
+    return np.sqrt((d * d).sum(axis=-1))
+
+
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros_like(num), where=den != 0)
+
+
+def face_metrics(points, pitch=False):
+    """
+    EAR for both eyes, head-turn offset and (optionally) pitch.
+
+    `points` is one compact frame (K, 2) or a batch (F, K, 2);
+    every value comes back as a scalar or an (F,) array to match.
+    """
+    points = np.asarray(points, dtype=np.float32)
+
+    ear_left = _ratio(_dist(points, L_TOP, L_BOTTOM), _dist(points, L_OUTER, L_INNER))
+    ear_right = _ratio(_dist(points, R_TOP, R_BOTTOM), _dist(points, R_OUTER, R_INNER))
+
+    eye_center = (points[..., L_OUTER, :] + points[..., R_OUTER, :]) / 2
+    nose = points[..., NOSE, :]
+
+    metrics = {
+        "ear_left": ear_left,
+        "ear_right": ear_right,
+        "ear": (ear_left + ear_right) / 2,
+        "head_turn": nose[..., 0] - eye_center[..., 0]
+    }
+
+    if pitch:
+        # Nose height between the eyes and the chin, relative to the face
+        # (~0.35 looking straight; grows looking down, shrinks looking up)
+        face_h = points[..., BOTTOM, 1] - points[..., TOP, 1]
+        metrics["pitch"] = _ratio(nose[..., 1] - eye_center[..., 1], face_h)
+
+    return metrics
@@ -1,12 +1,12 @@
 import time
-import os
 import threading
 from pynput import keyboard, mouse
-import pygame
-from plyer import notification
 
+from smart_focus.focus.activity import ActivitySampler
 from smart_focus.focus.session import FocusSession
 from smart_focus.utils.distraction_detector import DistractionDetector
+from smart_focus.utils.notifier import notifier, alert_inbox
+from smart_focus.utils.scheduler import scheduler
 
 
 
@@ -36,19 +36,19 @@ class NoCameraFocusTracker:
             topic=topic.lower()
         )
 
-        pygame.mixer.init()
-
         # Sounds
         self.alert_sound = alert_sound
         self.warning_sound = warning_sound
 
-        # Activity tracking
+        # Activity tracking (listeners feed the sampler; the tick reads it)
+        self.activity_sampler = ActivitySampler()
         self.last_activity_time = time.time()
         self.is_idle = False
 
         self.keyboard_listener = None
         self.mouse_listener = None
         self.stop_event = threading.Event()
+        self.tick_job = None
         self.running=False
         self.last_status = None
 
@@ -69,50 +69,31 @@ class NoCameraFocusTracker:
 
         self.distraction_given = False
         self.content_distracted=False
-        self.alert_message=None
 
     # ---------------------------
     # Utilities
     # ---------------------------
-    def _play_sound(self, sound_path):
-        if not sound_path or not os.path.exists(sound_path):
-            print('sound file missing')
-            return
-
-        def _play():
-            try:
-                pygame.mixer.music.load(sound_path)
-                pygame.mixer.music.play()
-            except Exception as e:
-                print("sound error: ",e)
-
-        threading.Thread(target=_play, daemon=True).start()
+    def _play_sound(self, sound_path, urgent=False):
+        notifier.notify(self.session.user_name, sound=sound_path, urgent=urgent)
 
     def _notify(self, title, message, sound=None):
         if self.stop_event.is_set():
             return
 
-        if sound:
-            self._play_sound(sound)
-
-        notification.notify(
-            title=title,
-            message=message,
-            timeout=3
-        )
-        self.alert_message={
-            "title":title,
-            "message":message
-        }
+        # Sound, desktop and browser delivery happen on the notifier thread
+        notifier.notify(self.session.user_name, title, message, sound)
 
     # ---------------------------
-    # Activity callback
+    # Activity (evaluated once per tick)
     # ---------------------------
-    def on_activity(self, *args):
-        if self.stop_event.is_set():
+    def _sample_activity(self):
+        if not self.activity_sampler.sample():
             return
 
-        self.last_activity_time = time.time()
+        self.last_activity_time = max(
+            self.last_activity_time,
+            self.activity_sampler.last_activity
+        )
 
         # Refocus ONLY if distracted stage
         if self.is_idle:
@@ -126,8 +107,6 @@ class NoCameraFocusTracker:
             elif self.stage == 3:
                 self.stage = 4
 
-        self._set_status("Focused")
-
     # ---------------------------
     # Status update
     # ---------------------------
@@ -152,35 +131,44 @@ class NoCameraFocusTracker:
         self.last_activity_time = time.time()
         self.last_status = None
 
-        self.keyboard_listener = keyboard.Listener(on_press=self.on_activity)
+        sampler = self.activity_sampler
+        self.keyboard_listener = keyboard.Listener(on_press=sampler.on_key)
         self.mouse_listener = mouse.Listener(
-            on_move=self.on_activity,
-            on_click=self.on_activity,
-            on_scroll=self.on_activity
+            on_move=sampler.on_mouse,
+            on_click=sampler.on_mouse,
+            on_scroll=sampler.on_mouse
         )
 
         self.keyboard_listener.start()
         self.mouse_listener.start()
 
-        try:
-            while not self.stop_event.is_set():
-                time.sleep(1)
-                self._update_state()
-        finally:
-            self._cleanup()
+        # Activity, presence checks + status run on the shared 1 s tick
+        self.tick_job = scheduler.every(1, self._tick)
 
-        return self.session.summary()
+    def _tick(self):
+        if self.stop_event.is_set():
+            self.tick_job.cancel()
+            return
+        self._sample_activity()
+        self._update_state()
 
     def stop(self):
         if not self.running:
             return getattr(self,"last_summary",None)
         self.running=False
         self.stop_event.set()
+        if self.tick_job:
+            self.tick_job.cancel()
+        self._cleanup()
         if hasattr(self,"detector"):
             self.detector.stop()
+        alert_inbox.clear(self.session.user_name)
+        # Logged with the session (sessions.activity_* columns)
+        self.session.activity_report = self.activity_sampler.report()
         self.session.stop()
         summary=self.session.summary()
         summary['auto_stopped']=getattr(self,'auto_stopped',False)
+        summary['activity_density']=self.session.activity_report
         self.last_summary=summary
         return summary
 
@@ -0,0 +1,170 @@
+# smart_focus/focus/preprocess.py
+
+import cv2
+import numpy as np
+
+from smart_focus.focus.landmarks import L_INNER, L_OUTER
+
+
+# Eye width (outer -> inner corner) in pixels the EAR needs to stay stable.
+# Below ~20 px the eyelid landmarks start to jitter.
+TARGET_EYE_PX = 24
+
+# Never shrink below this fraction of the input, never upscale
+MIN_SCALE = 0.25
+MAX_SCALE = 1.0
+
+# Padding around the last face box, as a fraction of its size
+ROI_MARGIN = 0.35
+
+# Full-frame re-detection every N frames (catches a second face / big moves)
+REDETECT_EVERY = 15
+
+
+class Roi:
+    """Where the inference image came from inside the full frame."""
+
+    __slots__ = ("x0", "y0", "w", "h", "full_w", "full_h", "scale", "full_frame")
+
+    def __init__(self, x0, y0, w, h, full_w, full_h, scale, full_frame):
+        self.x0, self.y0, self.w, self.h = x0, y0, w, h
+        self.full_w, self.full_h = full_w, full_h
+        self.scale = scale
+        self.full_frame = full_frame
+
+    def to_full(self, landmarks):
+        """Map (K, 2) crop-normalised landmarks to full-frame normalised."""
+        out = np.empty_like(landmarks)
+        out[:, 0] = (landmarks[:, 0] * self.w + self.x0) / self.full_w
+        out[:, 1] = (landmarks[:, 1] * self.h + self.y0) / self.full_h
+        return out
+
+
+class FramePreprocessor:
+    """
+    Shrinks each frame before FaceMesh.
+
+    - Crops to the last known face box (plus margin)
+    - Downscales so the eye is ~TARGET_EYE_PX wide
+    - Runs on the full frame when there is no face yet,
+      after a miss, and every REDETECT_EVERY frames
+    - Landmarks are mapped back to full-frame coordinates, so EAR and
+      head-turn values are the same as without preprocessing
+    """
+
+    def __init__(
+        self,
+        target_eye_px=TARGET_EYE_PX,
+        redetect_every=REDETECT_EVERY,
+        margin=ROI_MARGIN,
+        enabled=True
+    ):
+        self.target_eye_px = target_eye_px
+        self.redetect_every = redetect_every
+        self.margin = margin
+        self.enabled = enabled
+
+        self.box = None          # last face box, full-frame normalised
+        self.scale = MAX_SCALE
+        self.frames_since_full = 0
+
+        # Savings report
+        self.frames = 0
+        self.full_frames = 0
+        self.pixels_in = 0
+        self.pixels_used = 0
+        self.full_ms = None      # running avg of full-frame inference
+        self.saved_ms = 0.0
+
+    # ---------------------------
+    # Before inference
+    # ---------------------------
+    def prepare(self, frame):
+        full_h, full_w = frame.shape[:2]
+        self.frames += 1
+        self.pixels_in += full_w * full_h
+
+        use_full = (
+            not self.enabled
+            or self.box is None
+            or self.frames_since_full >= self.redetect_every
+        )
+
+        if not use_full:
+            crop = self._crop(frame, full_w, full_h)
+            if crop is not None:
+                self.frames_since_full += 1
+                self.pixels_used += crop[0].shape[0] * crop[0].shape[1]
+                return crop
+
+        self.frames_since_full = 0
+        self.full_frames += 1
+        self.pixels_used += full_w * full_h
+        return frame, Roi(0, 0, full_w, full_h, full_w, full_h, 1.0, True)
+
+    def _crop(self, frame, full_w, full_h):
+        x_min, y_min, x_max, y_max = self.box
+        pad_x = (x_max - x_min) * self.margin
+        pad_y = (y_max - y_min) * self.margin
+        x0 = max(0, int((x_min - pad_x) * full_w))
+        y0 = max(0, int((y_min - pad_y) * full_h))
+        x1 = min(full_w, int((x_max + pad_x) * full_w) + 1)
+        y1 = min(full_h, int((y_max + pad_y) * full_h) + 1)
+
+        crop = frame[y0:y1, x0:x1]
+        h, w = crop.shape[:2]
+        if w < 2 or h < 2:
+            return None
+
+        if self.scale < MAX_SCALE:
+            crop = cv2.resize(
+                crop,
+                (max(1, int(w * self.scale)), max(1, int(h * self.scale))),
+                interpolation=cv2.INTER_AREA
+            )
+
+        return crop, Roi(x0, y0, w, h, full_w, full_h, self.scale, False)
+
+    # ---------------------------
+    # After inference
+    # ---------------------------
+    def update(self, landmarks, roi, elapsed):
+        """
+        Record inference time, map landmarks back to the full frame and
+        remember the face box / scale for the next frame.
+        Returns full-frame landmarks (or None).
+        """
+        ms = elapsed * 1000
+        if roi.full_frame:
+            self.full_ms = ms if self.full_ms is None else 0.9 * self.full_ms + 0.1 * ms
+        elif self.full_ms is not None:
+            self.saved_ms += max(0.0, self.full_ms - ms)
+
+        if landmarks is None:
+            # Lost the face: look at the whole frame next time
+            self.box = None
+            return None
+
+        if not roi.full_frame:
+            landmarks = roi.to_full(landmarks)
+
+        x_min, y_min = landmarks.min(axis=0)
+        x_max, y_max = landmarks.max(axis=0)
+        self.box = (float(x_min), float(y_min), float(x_max), float(y_max))
+
+        # Eye width in full-frame pixels decides how far we can shrink
+        eye = (landmarks[L_INNER] - landmarks[L_OUTER]) * (roi.full_w, roi.full_h)
+        eye_px = float(np.hypot(eye[0], eye[1]))
+        if eye_px > 0:
+            self.scale = min(MAX_SCALE, max(MIN_SCALE, self.target_eye_px / eye_px))
+
+        return landmarks
+
+    def report(self):
+        return {
+            "frames": self.frames,
+            "full_frames": self.full_frames,
+            "scale": round(self.scale, 2),
+            "pixel_ratio": round(self.pixels_used / self.pixels_in, 3) if self.pixels_in else 1.0,
+            "saved_ms": int(self.saved_ms)
+        }
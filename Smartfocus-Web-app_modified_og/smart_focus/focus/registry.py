@@ -0,0 +1,186 @@
+# smart_focus/focus/registry.py
+
+import threading
+import time
+import traceback
+import uuid
+
+from smart_focus.utils.scheduler import scheduler
+
+# Number of lock stripes (users hash onto one of these)
+DEFAULT_STRIPES = 32
+
+# ⏱ Sessions nobody has polled for this long are stopped & removed
+IDLE_TIMEOUT = 600
+REAP_INTERVAL = 30
+
+
+class SessionEntry:
+    """
+    One live tracking session owned by the registry.
+    """
+
+    def __init__(self, user, tracker):
+        self.user = user
+        self.session_id = uuid.uuid4().hex
+        self.tracker = tracker
+        self.created_at = time.time()
+        self.last_seen = self.created_at
+
+    def touch(self):
+        self.last_seen = time.time()
+
+
+class _Stripe:
+
+    __slots__ = ("lock", "entries", "results")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}   # user -> SessionEntry
+        self.results = {}   # user -> last finished summary
+
+
+class SessionRegistry:
+    """
+    Thread-safe registry of running sessions keyed by user.
+
+    - O(1) lookup per request (dict per stripe)
+    - Users are spread over lock stripes, so requests from
+      different users never wait on the same lock
+    - Idle sessions are reaped on the shared scheduler
+    """
+
+    def __init__(self, stripes=DEFAULT_STRIPES, idle_timeout=IDLE_TIMEOUT):
+        self._stripes = [_Stripe() for _ in range(max(1, int(stripes)))]
+        self.idle_timeout = idle_timeout
+        self._reaper = None
+
+    def _stripe(self, user):
+        return self._stripes[hash(user) % len(self._stripes)]
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+    def get(self, user, session_id=None):
+        stripe = self._stripe(user)
+        with stripe.lock:
+            entry = stripe.entries.get(user)
+        if entry is None:
+            return None
+        if session_id is not None and entry.session_id != session_id:
+            return None
+        entry.touch()
+        return entry
+
+    def get_tracker(self, user, session_id=None):
+        entry = self.get(user, session_id)
+        return entry.tracker if entry else None
+
+    def __len__(self):
+        return sum(len(s.entries) for s in self._stripes)
+
+    def __contains__(self, user):
+        stripe = self._stripe(user)
+        with stripe.lock:
+            return user in stripe.entries
+
+    # ---------------------------
+    # Add / remove
+    # ---------------------------
+    def add(self, user, tracker):
+        """
+        Register a tracker for `user`.
+        Returns the new entry, or None if the user already has one.
+        """
+        stripe = self._stripe(user)
+        with stripe.lock:
+            if user in stripe.entries:
+                return None
+            entry = SessionEntry(user, tracker)
+            stripe.entries[user] = entry
+            stripe.results.pop(user, None)
+        return entry
+
+    def remove(self, user, session_id=None):
+        stripe = self._stripe(user)
+        with stripe.lock:
+            entry = stripe.entries.get(user)
+            if entry is None:
+                return None
+            if session_id is not None and entry.session_id != session_id:
+                return None
+            del stripe.entries[user]
+        return entry
+
+    def stop(self, user, session_id=None):
+        """
+        Remove the user's session and stop its tracker.
+        Returns the session summary (or None if nothing was running).
+        """
+        entry = self.remove(user, session_id)
+        if entry is None:
+            return None
+        result = entry.tracker.stop()
+        self.set_result(user, result)
+        return result
+
+    # ---------------------------
+    # Finished results
+    # ---------------------------
+    def set_result(self, user, result):
+        stripe = self._stripe(user)
+        with stripe.lock:
+            stripe.results[user] = result
+
+    def get_result(self, user):
+        stripe = self._stripe(user)
+        with stripe.lock:
+            return stripe.results.get(user)
+
+    # ---------------------------
+    # Idle reaping
+    # ---------------------------
+    def reap_idle(self, now=None):
+        """
+        Stop every session not seen for `idle_timeout` seconds.
+        Returns the list of reaped users.
+        """
+        now = time.time() if now is None else now
+        expired = []
+
+        for stripe in self._stripes:
+            with stripe.lock:
+                for user, entry in list(stripe.entries.items()):
+                    if now - entry.last_seen >= self.idle_timeout:
+                        del stripe.entries[user]
+                        expired.append(entry)
+
+        # Stop outside the locks (stop() logs to disk)
+        for entry in expired:
+            try:
+                self.set_result(entry.user, entry.tracker.stop())
+            except Exception:
+                traceback.print_exc()
+            print(f"⏹ Reaped idle session | user={entry.user}")
+
+        return [e.user for e in expired]
+
+    def start_reaper(self, interval=REAP_INTERVAL):
+        if self._reaper is None:
+            # The scan is cheap, but tracker.stop() logs and joins
+            # listener threads, so the reap runs off the tick thread
+            self._reaper = scheduler.every(interval, lambda: scheduler.defer(self.reap_idle))
+
+    def stop_reaper(self):
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+
+    def stop_all(self):
+        users = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                users.extend(stripe.entries.keys())
+        for user in users:
+            self.stop(user)
@@ -37,6 +37,10 @@ class FocusSession:
         self._distracted_streak = 0.0
         self._alert_sent = False
 
+        # Keyboard / mouse activity report, set by the no-camera tracker
+        # before stop() so it is logged with the session
+        self.activity_report = None
+
         # 🔑 For clean timeline logging
         self._last_logged_status = None
 
@@ -138,6 +142,7 @@ class FocusSession:
     # -----------------------
     def summary(self):
         total = self.focused_seconds + self.distracted_seconds
+        activity = self.activity_report or {}
 
         return {
             "user": self.user_name,
@@ -149,5 +154,8 @@ class FocusSession:
             "focused_minutes": int(self.focused_seconds / 60),
             "focus_score": self.calculate_score(),
             "goal_achieved": (self.focused_seconds / 3600) >= self.goal_hours,
-            "total_seconds": int(total)
+            "total_seconds": int(total),
+            "activity_avg_per_sec": activity.get("avg_per_sec"),
+            "activity_peak_per_sec": activity.get("peak_per_sec"),
+            "activity_active_ratio": activity.get("active_ratio")
         }
\ No newline at end of file
@@ -1,111 +1,144 @@
 import threading
 import time
-import pygetwindow as gw
 
+from smart_focus.utils.scheduler import scheduler
+from smart_focus.utils.title_rules import title_rules
+from smart_focus.utils.window_monitor import window_monitor
 
-#  Always Blocked Platforms
-SOCIAL_KEYWORDS = [
-    "facebook",
-    "instagram",
-    "twitter",
-    "tiktok"
-]
 
 # ⏱ Auto stop after 30 sec continuous distraction
 DISTRACTION_THRESHOLD = 30
 
+# While distracted, the auto-stop deadline is checked every CHECK_INTERVAL seconds
+CHECK_INTERVAL = 1
+
 
 class DistractionDetector:
+    """
+    Reacts to active-window changes from the shared window_monitor.
+
+    - Titles are classified by the shared title_rules engine
+      (compiled rules, verdicts cached per title/activity/topic)
+    - Nothing runs while the window stays the same; a 1 s job only
+      exists while the user is on a distracting window
+    """
 
-    def __init__(self, tracker):
+    def __init__(self, tracker, monitor=None):
         self.tracker = tracker
+        self.monitor = monitor or window_monitor
         self.running = False
-        self.distraction_time = 0
         self.started_at=None
         self.GRACE_PERIOD=5
 
+        self.title = None
+        self.distracted = False
+        self.distracted_since = None
+
+        self._lock = threading.Lock()
+        self._unsubscribe = None
+        self._grace_job = None
+        self._watch_job = None
+
+    @property
+    def distraction_time(self):
+        since = self.distracted_since
+        return 0 if since is None else time.monotonic() - since
+
     def start(self):
         if self.running:
             return
         self.running=True
-        self.distraction_time=0
-        self.started_at=time.time()
-        thread = threading.Thread(target=self._monitor, daemon=True)
-        thread.start()
-        
+        self.started_at=time.monotonic()
+        self.distracted_since = None
+        self._grace_job = scheduler.every(self.GRACE_PERIOD, self._end_grace)
+        self._unsubscribe = self.monitor.subscribe(self._on_title)
+
     def stop(self):
         self.running = False
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+        for job in (self._grace_job, self._watch_job):
+            if job:
+                job.cancel()
+
+    # ---------------------------
+    # Window events
+    # ---------------------------
+    def _on_title(self, title):
+        if not self.running:
+            return
+        verdict = self._verdict(title) if title else None
+        print('Title:',title, verdict.reason if verdict else None)
+
+        distracted = bool(verdict and verdict.distracted)
+        with self._lock:
+            self.title = title
+            self.distracted = distracted
+            if self._grace_job and not self._grace_job.cancelled:
+                return
+            self._apply()
+
+    def _end_grace(self):
+        self._grace_job.cancel()
+        with self._lock:
+            self._apply()
+
+    def _apply(self):
+        """Push the current verdict to the tracker (lock held)."""
+        self.tracker.content_distracted = self.distracted
+
+        if not self.distracted:
+            self.distracted_since = None
+            if self._watch_job:
+                self._watch_job.cancel()
+                self._watch_job = None
+        elif self.distracted_since is None:
+            self.distracted_since = time.monotonic()
+            self._watch_job = scheduler.every(CHECK_INTERVAL, self._watch)
+
+    # ---------------------------
+    # Classification
+    # ---------------------------
+    def _verdict(self, title):
+        return title_rules.classify(
+            title,
+            getattr(self.tracker, "activity", ""),
+            getattr(self.tracker, "topic", "")
+        )
+
+    # ---------------------------
+    # 🚨 AUTO STOP SESSION
+    # ---------------------------
+    def _watch(self):
+        # Runs on the tick thread: only flip state here, stopping
+        # (unsubscribe, tracker.stop() and its logging) is deferred
+        if not (self.running and self.tracker.running):
+            self._cancel_watch()
+            scheduler.defer(self.stop)
+            return
+
+        print("Distraction time : ",int(self.distraction_time))
+        if self.distraction_time < DISTRACTION_THRESHOLD:
+            return
+        if getattr(self.tracker,"auto_stopped",False):
+            return
+
+        # Urgent: the auto-stop sound must not be eaten by the rate limit
+        if hasattr(self.tracker,"_play_sound"):
+            self.tracker._play_sound("static/alert2.wav", urgent=True)
+        print("⚠ Auto-stopping session due to distraction")
+
+        self.tracker.auto_stopped = True
+        self.running = False
+        self._cancel_watch()
+        scheduler.defer(self._auto_stop)
+
+    def _cancel_watch(self):
+        job = self._watch_job
+        if job:
+            job.cancel()
 
-    def _monitor(self):
-        while self.running and self.tracker.running:
-            print("Distraction time : ",self.distraction_time)
-            time.sleep(2)
-            if time.time()-self.started_at<self.GRACE_PERIOD:
-                continue
-
-            try:
-                window = gw.getActiveWindow()
-                if not window:
-                    continue
-
-                title = window.title.lower()
-                print('Title:',title)
-
-                # 🔥 Safely get activity & topic
-                activity = getattr(self.tracker, "activity", "").lower()
-                topic = getattr(self.tracker, "topic", "").lower()
-
-                distracted = False
-
-                # ==================================================
-                # 🚫 SOCIAL MEDIA (Always Blocked)
-                # ==================================================
-                if any(word in title for word in SOCIAL_KEYWORDS):
-                    distracted = True
-
-                # ==================================================
-                # 🎥 YOUTUBE SMART LOGIC
-                # ==================================================
-                elif "youtube" in title:
-                    title=title.lower()
-                    topic_words=topic.lower().split()
-                    if "shorts" in title:
-                        distracted=True
-                    # If activity is NOT youtube study → block
-                    elif "youtube" not in activity:
-                        distracted = True
-                        # If topic words not found in title → block
-                    elif any(word in title for word in topic_words):
-                        distracted = False
-
-                    else:
-                        distracted=True
-
-                # ==================================================
-                # ✅ UPDATE STATUS
-                # ==================================================
-                if distracted:
-                    self.distraction_time += 2
-                    self.tracker.content_distracted=True
-                else:
-                    self.distraction_time = 0
-                    self.tracker.content_distracted=False
-
-                # ==================================================
-                # 🚨 AUTO STOP SESSION
-                # ==================================================
-                if self.distraction_time >= DISTRACTION_THRESHOLD and not getattr(self.tracker,"auto_stopped",False):
-                    if hasattr(self.tracker,"_play_sound"):
-                        self.tracker._play_sound("static/alert2.wav")
-                    print("⚠ Auto-stopping session due to distraction")
-
-                    self.tracker.auto_stopped = True
-                    result=self.tracker.stop()
-                    from flask import current_app 
-                    current_app.config["SESSION_RESULT"]=result
-
-                    self.running = False
-                    break
-
-            except Exception:
-                pass
\ No newline at end of file
+    def _auto_stop(self):
+        self.stop()
+        self.tracker.stop()
@@ -0,0 +1,176 @@
+import bisect
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Stored as the hash prefix ("scrypt:32768:8:1$salt$hash"), so older
+# hashes are recognised and upgraded on the next successful login
+HASH_METHOD = "scrypt:32768:8:1"
+
+# Hashing threads (scrypt releases the GIL, so these use real cores).
+# Kept below the core count so live sessions always have CPU left.
+WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+# Hash jobs allowed in flight at once (running + waiting); more → 429
+MAX_PENDING = 16
+
+# Concurrent hash jobs per client IP / per account name
+PER_IP_LIMIT = 4
+PER_USER_LIMIT = 2
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class HasherBusy(Exception):
+    """Raised when a hash job would exceed one of the limits."""
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+            self.total_ms += ms
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            total_ms = self.total_ms
+
+        n = sum(counts)
+        labels = [f"<={b}ms" for b in self.buckets] + [f">{self.buckets[-1]}ms"]
+        return {
+            "count": n,
+            "avg_ms": round(total_ms / n, 2) if n else 0.0,
+            "buckets": dict(zip(labels, counts))
+        }
+
+
+class PasswordHasher:
+    """
+    Runs password hashing off the request threads.
+
+    - One bounded thread pool for every login / register
+    - Rejects work (HasherBusy) past MAX_PENDING jobs, or past the
+      per-IP / per-user concurrency limits
+    - Records queue wait and hash time histograms
+    """
+
+    def __init__(
+        self,
+        workers=WORKERS,
+        max_pending=MAX_PENDING,
+        per_ip=PER_IP_LIMIT,
+        per_user=PER_USER_LIMIT,
+        method=HASH_METHOD
+    ):
+        self.method = method
+        # Werkzeug expands shorthands ("scrypt" -> "scrypt:32768:8:1");
+        # hash once so needs_rehash compares against the full prefix
+        self.prefix = generate_password_hash("x", method=method).split("$", 1)[0]
+        self.workers = workers
+        self.per_ip = per_ip
+        self.per_user = per_user
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash")
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._by_ip = {}
+        self._by_user = {}
+
+        self.wait_hist = LatencyHistogram()
+        self.hash_hist = LatencyHistogram()
+        self.in_flight = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def hash(self, password, ip=None, user=None):
+        return self._run(lambda: generate_password_hash(password, method=self.method), ip, user)
+
+    def verify(self, pwhash, password, ip=None, user=None):
+        return self._run(lambda: check_password_hash(pwhash, password), ip, user)
+
+    def needs_rehash(self, pwhash):
+        return pwhash.split("$", 1)[0] != self.prefix
+
+    def rehash(self, password, ip=None, user=None):
+        """New hash with the current method (after a successful verify)."""
+        pwhash = self.hash(password, ip, user)
+        with self._lock:
+            self.rehashed += 1
+        return pwhash
+
+    # ---------------------------
+    # Limits
+    # ---------------------------
+    def _acquire(self, ip, user):
+        with self._lock:
+            if ip is not None and self._by_ip.get(ip, 0) >= self.per_ip:
+                return False
+            if user is not None and self._by_user.get(user, 0) >= self.per_user:
+                return False
+            if not self._slots.acquire(blocking=False):
+                return False
+            if ip is not None:
+                self._by_ip[ip] = self._by_ip.get(ip, 0) + 1
+            if user is not None:
+                self._by_user[user] = self._by_user.get(user, 0) + 1
+            self.in_flight += 1
+            return True
+
+    def _release(self, ip, user):
+        with self._lock:
+            self._slots.release()
+            self.in_flight -= 1
+            for key, counts in ((ip, self._by_ip), (user, self._by_user)):
+                if key is None:
+                    continue
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+
+    def _run(self, fn, ip, user):
+        if not self._acquire(ip, user):
+            with self._lock:
+                self.rejected += 1
+            raise HasherBusy()
+
+        submitted = time.perf_counter()
+
+        def job():
+            started = time.perf_counter()
+            self.wait_hist.record(started - submitted)
+            try:
+                return fn()
+            finally:
+                self.hash_hist.record(time.perf_counter() - started)
+
+        try:
+            return self._executor.submit(job).result()
+        finally:
+            self._release(ip, user)
+
+    def metrics(self):
+        return {
+            "method": self.method,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "queue_wait": self.wait_hist.snapshot(),
+            "hash_time": self.hash_hist.snapshot()
+        }
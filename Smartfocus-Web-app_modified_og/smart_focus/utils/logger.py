@@ -1,15 +1,144 @@
 import os
 import csv
+import atexit
+import queue
+import sqlite3
+import threading
+import time
 from datetime import datetime
 
+from smart_focus.database.db import update_rollups
+from smart_focus.database.timeline import insert_events
+
 DATA_DIR = None  # injected from app.py
 
+# "write_behind": queue + background group commit (default)
+# "sync":         write & commit inside the call (max durability)
+LOG_MODE = "write_behind"
+
+# Group commit: flush after this many events or this many ms
+BATCH_SIZE = 200
+FLUSH_MS = 500
+
+# A failed group commit is kept and retried every RETRY_SECONDS;
+# beyond MAX_RETRY_EVENTS the oldest timeline events are dropped (counted)
+RETRY_SECONDS = 2
+MAX_RETRY_EVENTS = 100000
+
+# Longest flush_logger() waits for the writer
+FLUSH_TIMEOUT = 10
+
+# smartfocus.db is the source of truth; the CSVs are optional exports
+SESSIONS_CSV = False
+TIMELINE_CSV = False
+
+SESSION_FIELDS = [
+    "timestamp",
+    "user",
+    "mode",
+    "activity",
+    "goal_hours",
+    "focused_seconds",
+    "distracted_seconds",
+    "focused_minutes",
+    "focus_score",
+    "goal_achieved",
+    "total_seconds",
+    "activity_avg_per_sec",
+    "activity_peak_per_sec",
+    "activity_active_ratio"
+]
+
+TIMELINE_FIELDS = ["timestamp", "user", "mode", "status"]
+
+INSERT_SESSION = f"""
+INSERT INTO sessions ({", ".join(SESSION_FIELDS)})
+VALUES ({", ".join("?" * len(SESSION_FIELDS))})
+"""
+
+_writer = None
+
+# Called with the user name after each session is committed
+_session_listeners = []
 
-def init_logger(data_dir):
-    global DATA_DIR
+
+def init_logger(
+    data_dir,
+    mode=LOG_MODE,
+    batch_size=BATCH_SIZE,
+    flush_ms=FLUSH_MS,
+    sessions_csv=SESSIONS_CSV,
+    timeline_csv=TIMELINE_CSV
+):
+    global DATA_DIR, LOG_MODE, SESSIONS_CSV, TIMELINE_CSV, _writer
     DATA_DIR = data_dir
     os.makedirs(DATA_DIR, exist_ok=True)
 
+    shutdown_logger()
+    LOG_MODE = mode
+    SESSIONS_CSV = sessions_csv
+    TIMELINE_CSV = timeline_csv
+    if mode == "write_behind":
+        _writer = WriteBehindWriter(data_dir, batch_size, flush_ms)
+    elif mode != "sync":
+        raise ValueError(f"Unknown log mode: {mode}")
+
+
+def on_session_logged(callback):
+    """Register callback(user) to run once a session is stored."""
+    _session_listeners.append(callback)
+
+
+def _notify_session_logged(summaries):
+    for summary in summaries:
+        for callback in _session_listeners:
+            try:
+                callback(summary["user"])
+            except Exception as e:
+                print("session listener error: ", e)
+
+
+def flush_logger(timeout=FLUSH_TIMEOUT):
+    """
+    Wait until every queued event is on disk (no-op in sync mode).
+    Returns False if the writer is down, timed out or still holds
+    events it could not write.
+    """
+    if _writer:
+        return _writer.flush(timeout)
+    return True
+
+
+def shutdown_logger():
+    global _writer
+    if _writer:
+        _writer.close()
+        _writer = None
+
+
+def _session_row(summary_data):
+    # activity_* fields are only set for no-camera sessions
+    row = [summary_data.get(f) for f in SESSION_FIELDS]
+    row[SESSION_FIELDS.index("goal_achieved")] = int(summary_data["goal_achieved"])
+    return row
+
+
+def _append_csv(file_path, fieldnames, rows):
+    file_exists = os.path.exists(file_path)
+
+    # Keep an existing file's columns (it may predate newer fields)
+    if file_exists:
+        with open(file_path, newline="", encoding="utf-8") as f:
+            fieldnames = next(csv.reader(f), None) or fieldnames
+
+    with open(file_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+
+        if not file_exists:
+            writer.writeheader()
+
+        writer.writerows(rows)
+
 
 def log_session(summary):
 
@@ -24,86 +153,212 @@ def log_session(summary):
         **summary
     }
 
+    if _writer:
+        _writer.put("session", summary_data)
+        return
+
     # -----------------------------
     # SAVE TO DATABASE
     # -----------------------------
-    import sqlite3
-
     db_path = os.path.join(DATA_DIR, "smartfocus.db")
 
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-
-    cursor.execute("""
-    INSERT INTO sessions (
-        timestamp,
-        user,
-        mode,
-        activity,
-        goal_hours,
-        focused_seconds,
-        distracted_seconds,
-        focused_minutes,
-        focus_score,
-        goal_achieved,
-        total_seconds
-    )
-    VALUES (?,?,?,?,?,?,?,?,?,?,?)
-    """, (
-        summary_data["timestamp"],
-        summary_data["user"],
-        summary_data["mode"],
-        summary_data["activity"],
-        summary_data["goal_hours"],
-        summary_data["focused_seconds"],
-        summary_data["distracted_seconds"],
-        summary_data["focused_minutes"],
-        summary_data["focus_score"],
-        int(summary_data["goal_achieved"]),
-        summary_data["total_seconds"]
-    ))
-
+    conn.execute(INSERT_SESSION, _session_row(summary_data))
+    update_rollups(conn, [summary_data])
     conn.commit()
     conn.close()
+    _notify_session_logged([summary_data])
 
     # -----------------------------
-    # SAVE TO CSV
+    # OPTIONAL CSV EXPORT
     # -----------------------------
-    file_path = os.path.join(DATA_DIR, "sessions.csv")
-
-    file_exists = os.path.exists(file_path)
-
-    with open(file_path, "a", newline="", encoding="utf-8") as f:
-
-        writer = csv.DictWriter(
-            f,
-            fieldnames=summary_data.keys()
+    if SESSIONS_CSV:
+        _append_csv(
+            os.path.join(DATA_DIR, "sessions.csv"),
+            list(summary_data.keys()),
+            [summary_data]
         )
 
-        if not file_exists:
-            writer.writeheader()
-
-        writer.writerow(summary_data)
-
-# OPTIONAL: Keep timeline if needed
 def log_timeline(user, mode, status):
     if DATA_DIR is None:
         raise RuntimeError("Logger not initialized. Call init_logger(DATA_DIR).")
 
-    file_path = os.path.join(DATA_DIR, "timeline.csv")
-    file_exists = os.path.exists(file_path)
-
+    now = datetime.now()
     data = {
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "ts": int(now.timestamp()),
+        "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
         "user": user.strip().lower(),
         "mode": mode.strip().lower(),
         "status": status
     }
 
-    with open(file_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=data.keys())
+    if _writer:
+        _writer.put("timeline", data)
+        return
 
-        if not file_exists:
-            writer.writeheader()
+    conn = sqlite3.connect(os.path.join(DATA_DIR, "smartfocus.db"))
+    with conn:
+        insert_events(conn, [data])
+    conn.close()
+
+    if TIMELINE_CSV:
+        _append_csv(
+            os.path.join(DATA_DIR, "timeline.csv"),
+            TIMELINE_FIELDS,
+            [{f: data[f] for f in TIMELINE_FIELDS}]
+        )
+
+
+class WriteBehindWriter:
+    """
+    Background writer for log_session / log_timeline.
+
+    - Callers only enqueue (no disk I/O on tracker threads)
+    - One flusher thread owns a single long-lived SQLite connection
+    - Events are written in groups: BATCH_SIZE events or FLUSH_MS,
+      whichever comes first, one transaction per group
+    - Pending events are flushed on close() and at interpreter exit
+    - A group that fails to commit is kept and retried (on a fresh
+      connection) with the next group; failures are counted
+    """
+
+    def __init__(self, data_dir, batch_size=BATCH_SIZE, flush_ms=FLUSH_MS):
+        self.data_dir = data_dir
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000
+
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+        self.events = 0
+        self.batches = 0
+        self.write_errors = 0
+        self.dropped = 0
+
+        # Sessions / timeline events of groups that failed to commit
+        self._retry_sessions = []
+        self._retry_timeline = []
+
+    def put(self, kind, data):
+        self._queue.put((kind, data))
+
+    @property
+    def pending_retry(self):
+        return len(self._retry_sessions) + len(self._retry_timeline)
+
+    def flush(self, timeout=FLUSH_TIMEOUT):
+        if not self._thread.is_alive():
+            print("log flush: writer thread is not running")
+            return False
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        if not done.wait(timeout):
+            print("log flush: timed out")
+            return False
+        return self.pending_retry == 0
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(("close", None))
+            self._thread.join()
+
+    # ---------------------------
+    # Flusher thread
+    # ---------------------------
+    def _connect(self):
+        return sqlite3.connect(os.path.join(self.data_dir, "smartfocus.db"))
+
+    def _run(self):
+        conn = self._connect()
+        closing = False
+
+        while not closing:
+            # With a failed group waiting, wake up to retry it
+            try:
+                timeout = RETRY_SECONDS if self.pending_retry else None
+                batch = [self._queue.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            deadline = time.monotonic() + self.flush_interval
+
+            # Collect until the batch is full or the window closes
+            while batch and len(batch) < self.batch_size:
+                kind = batch[-1][0]
+                if kind in ("flush", "close"):
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            sessions = self._retry_sessions + [d for k, d in batch if k == "session"]
+            timeline = self._retry_timeline + [d for k, d in batch if k == "timeline"]
+            self._retry_sessions, self._retry_timeline = [], []
+
+            try:
+                self._write(conn, sessions, timeline)
+            except Exception as e:
+                self.write_errors += 1
+                print("log write error (will retry): ", e)
+                self._keep_for_retry(sessions, timeline)
+                conn.close()
+                conn = self._connect()
+
+            for kind, data in batch:
+                if kind == "flush":
+                    data.set()
+                elif kind == "close":
+                    closing = True
+
+        if self.pending_retry:
+            print(f"log writer closed with {self.pending_retry} unwritten events")
+        conn.close()
+
+    def _keep_for_retry(self, sessions, timeline):
+        overflow = len(sessions) + len(timeline) - MAX_RETRY_EVENTS
+        if overflow > 0:
+            # Sessions are worth more than individual status transitions
+            drop = min(overflow, len(timeline))
+            timeline = timeline[drop:]
+            self.dropped += drop
+        self._retry_sessions = sessions
+        self._retry_timeline = timeline
+
+    def _write(self, conn, sessions, timeline):
+        # Raises on failure; nothing is committed then, so the whole
+        # group can be retried as is
+        if sessions or timeline:
+            with conn:
+                if sessions:
+                    conn.executemany(INSERT_SESSION, [_session_row(s) for s in sessions])
+                    update_rollups(conn, sessions)
+                insert_events(conn, timeline)
+
+            self.events += len(sessions) + len(timeline)
+            self.batches += 1
+
+        # Committed: anything below must not make the group retry
+        if sessions:
+            _notify_session_logged(sessions)
+
+        try:
+            if sessions and SESSIONS_CSV:
+                _append_csv(
+                    os.path.join(self.data_dir, "sessions.csv"),
+                    list(sessions[0].keys()),
+                    sessions
+                )
 
-        writer.writerow(data)
\ No newline at end of file
+            if timeline and TIMELINE_CSV:
+                _append_csv(
+                    os.path.join(self.data_dir, "timeline.csv"),
+                    TIMELINE_FIELDS,
+                    [{f: d[f] for f in TIMELINE_FIELDS} for d in timeline]
+                )
+        except Exception as e:
+            print("log CSV export error: ", e)
@@ -0,0 +1,253 @@
+import os
+import queue
+import threading
+import time
+import traceback
+
+# Backends used when SMARTFOCUS_NOTIFY_BACKENDS is not set
+DEFAULT_BACKENDS = "sound,desktop,inbox"
+
+# The same alert (user, title, message, sound) is sent at most once per window
+DEDUPE_SECONDS = 30
+
+# At most RATE_LIMIT alerts per user per RATE_WINDOW seconds
+RATE_LIMIT = 5
+RATE_WINDOW = 60
+
+# Alerts waiting for the worker; beyond this new alerts are dropped
+MAX_PENDING = 256
+
+
+# ---------------------------
+# Backends
+# ---------------------------
+class LogBackend:
+    def send(self, note):
+        if note["title"]:
+            print(f"🔔 [{note['user']}] {note['title']}: {note['message']}")
+
+
+class DesktopBackend:
+    """plyer desktop notification (imported on first use)."""
+
+    def __init__(self, timeout=3):
+        self.timeout = timeout
+        self._notification = None
+
+    def send(self, note):
+        if not note["title"]:
+            return
+        if self._notification is None:
+            from plyer import notification
+            self._notification = notification
+        self._notification.notify(
+            title=note["title"],
+            message=note["message"],
+            timeout=self.timeout
+        )
+
+
+class SoundBackend:
+    """
+    pygame mixer, initialised once per process.
+    Each WAV is decoded into a Sound the first time it is played and
+    reused after that; Sound.play() mixes on its own channel and returns.
+    """
+
+    def __init__(self):
+        self._mixer = None
+        self._sounds = {}
+
+    def send(self, note):
+        path = note["sound"]
+        if not path:
+            return
+
+        if path not in self._sounds:
+            if not os.path.exists(path):
+                print('sound file missing: ', path)
+                self._sounds[path] = None
+            else:
+                self._sounds[path] = self._load(path)
+
+        sound = self._sounds[path]
+        if sound:
+            sound.play()
+
+    def _load(self, path):
+        if self._mixer is None:
+            import pygame
+            pygame.mixer.init()
+            self._mixer = pygame.mixer
+        return self._mixer.Sound(path)
+
+
+class PolledInbox:
+    """
+    Latest alert per user, picked up by the browser when it polls /stats.
+    Not a push channel: an alert shows up on the next poll, and an unread
+    alert is replaced by a newer one.
+    """
+
+    def __init__(self):
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    def send(self, note):
+        if not note["title"]:
+            return
+        with self._lock:
+            self._latest[note["user"]] = {
+                "title": note["title"],
+                "message": note["message"]
+            }
+
+    def pop(self, user):
+        with self._lock:
+            return self._latest.pop(user, None)
+
+    def clear(self, user):
+        self.pop(user)
+
+
+# Shared by the dispatcher and /stats
+alert_inbox = PolledInbox()
+
+# name -> factory, for SMARTFOCUS_NOTIFY_BACKENDS
+BACKENDS = {
+    "log": LogBackend,
+    "desktop": DesktopBackend,
+    "sound": SoundBackend,
+    "inbox": lambda: alert_inbox
+}
+
+
+def make_backends(names):
+    """Backends for a comma-separated list of BACKENDS names."""
+    backends = []
+    for name in names.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown notification backend: {name}")
+        backends.append(BACKENDS[name]())
+    return backends
+
+
+# ---------------------------
+# Dispatcher
+# ---------------------------
+class NotificationDispatcher:
+    """
+    One worker thread delivers every tracker's alerts.
+
+    - notify() only filters and enqueues, so tracker ticks never wait on
+      sound, desktop or network I/O
+    - Repeats of the same alert within DEDUPE_SECONDS are dropped
+    - Each user gets at most RATE_LIMIT alerts per RATE_WINDOW
+      (urgent alerts skip the limit but still count towards it)
+    - Dedupe / rate state only records alerts that were actually queued
+    - A failing backend is logged and does not stop the others
+    """
+
+    def __init__(self, backends=None):
+        self.backends = list(backends) if backends is not None else make_backends(DEFAULT_BACKENDS)
+
+        self._queue = queue.Queue(MAX_PENDING)
+        self._thread = None
+        self._lock = threading.Lock()
+
+        self._last_sent = {}   # alert key -> monotonic time
+        self._recent = {}      # user -> send times within RATE_WINDOW
+
+        self.sent = 0
+        self.deduped = 0
+        self.limited = 0
+        self.dropped = 0
+
+    def set_backends(self, backends):
+        self.backends = list(backends)
+
+    def notify(self, user, title=None, message=None, sound=None, urgent=False):
+        """Queue an alert. Returns False if it was filtered or dropped."""
+        now = time.monotonic()
+        key = (user, title, message, sound)
+        note = {"user": user, "title": title, "message": message, "sound": sound}
+
+        with self._lock:
+            last = self._last_sent.get(key)
+            if last is not None and now - last < DEDUPE_SECONDS:
+                self.deduped += 1
+                return False
+
+            recent = [t for t in self._recent.get(user, ()) if now - t < RATE_WINDOW]
+            if recent:
+                self._recent[user] = recent
+            else:
+                self._recent.pop(user, None)
+            if len(recent) >= RATE_LIMIT and not urgent:
+                self.limited += 1
+                return False
+
+            self._ensure_thread()
+            try:
+                self._queue.put_nowait(("note", note))
+            except queue.Full:
+                self.dropped += 1
+                return False
+
+            recent.append(now)
+            self._recent[user] = recent
+            self._last_sent[key] = now
+            if len(self._last_sent) > MAX_PENDING * 4:
+                self._prune(now)
+        return True
+
+    def flush(self):
+        """Block until every queued alert has been delivered."""
+        with self._lock:
+            self._ensure_thread()
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        done.wait()
+
+    def stats(self):
+        return {
+            "sent": self.sent,
+            "deduped": self.deduped,
+            "rate_limited": self.limited,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize()
+        }
+
+    def _prune(self, now):
+        horizon = max(DEDUPE_SECONDS, RATE_WINDOW)
+        self._last_sent = {k: t for k, t in self._last_sent.items() if now - t < DEDUPE_SECONDS}
+        self._recent = {u: ts for u, ts in self._recent.items() if ts and now - ts[-1] < horizon}
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    # ---------------------------
+    # Worker thread
+    # ---------------------------
+    def _run(self):
+        while True:
+            kind, data = self._queue.get()
+            if kind == "flush":
+                data.set()
+                continue
+
+            for backend in self.backends:
+                try:
+                    backend.send(data)
+                except Exception:
+                    traceback.print_exc()
+            self.sent += 1
+
+
+# Shared by all trackers in the process
+notifier = NotificationDispatcher()
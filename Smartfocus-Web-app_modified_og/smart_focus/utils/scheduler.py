@@ -0,0 +1,125 @@
+# smart_focus/utils/scheduler.py
+
+import heapq
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads for blocking work handed off by job callbacks (see defer())
+DEFER_WORKERS = 2
+
+
+class Job:
+    """Handle for a repeating callback. Call cancel() to stop it."""
+
+    __slots__ = ("interval", "callback", "due", "cancelled")
+
+    def __init__(self, interval, callback, due):
+        self.interval = interval
+        self.callback = callback
+        self.due = due
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TickScheduler:
+    """
+    One thread drives every periodic job of every session
+    (1 s accounting ticks, presence checks, detector polls).
+
+    - Jobs sit in a heap ordered by their next due time
+    - Due times advance by `interval` from the previous due time
+      (not from "now"), so ticks do not drift
+    - If the thread falls behind, missed ticks are skipped
+      instead of being fired in a burst
+    - Callbacks must not block: they run one after another, so
+      anything slow (stopping a session, joining a thread, disk I/O)
+      goes through defer() and runs on a small side pool
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._deferred = None
+
+    def every(self, interval, callback, delay=None):
+        """Run `callback()` every `interval` seconds (first run after `delay`)."""
+        delay = interval if delay is None else delay
+        job = Job(interval, callback, time.monotonic() + delay)
+
+        with self._cond:
+            heapq.heappush(self._heap, (job.due, next(self._seq), job))
+            self._ensure_thread()
+            self._cond.notify()
+        return job
+
+    def defer(self, callback, *args):
+        """Run `callback(*args)` on the side pool instead of the tick thread."""
+        with self._cond:
+            if self._deferred is None:
+                self._deferred = ThreadPoolExecutor(
+                    max_workers=DEFER_WORKERS, thread_name_prefix="scheduler-defer"
+                )
+        return self._deferred.submit(self._run_deferred, callback, args)
+
+    @staticmethod
+    def _run_deferred(callback, args):
+        try:
+            return callback(*args)
+        except Exception:
+            traceback.print_exc()
+
+    def __len__(self):
+        with self._cond:
+            return sum(1 for _, _, job in self._heap if not job.cancelled)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    # Drop cancelled jobs lazily
+                    while self._heap and self._heap[0][2].cancelled:
+                        heapq.heappop(self._heap)
+
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+
+                    due, _, job = self._heap[0]
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        heapq.heappop(self._heap)
+                        break
+                    self._cond.wait(wait)
+
+            try:
+                job.callback()
+            except Exception:
+                traceback.print_exc()
+
+            if job.cancelled:
+                continue
+
+            now = time.monotonic()
+            job.due += job.interval
+            if job.due <= now:
+                missed = int((now - job.due) // job.interval) + 1
+                job.due += missed * job.interval
+
+            with self._cond:
+                heapq.heappush(self._heap, (job.due, next(self._seq), job))
+
+
+# Shared by all trackers in the process
+scheduler = TickScheduler()
@@ -0,0 +1,248 @@
+"""
+Window-title rules for the distraction detector.
+
+Rules come from DEFAULT_RULES, or from a JSON file with the same shape
+(SMARTFOCUS_TITLE_RULES, default data/title_rules.json):
+
+    {
+      "block": ["facebook", "instagram"],        always distracting
+      "allow": ["smartfocus"],                   never distracting (wins)
+      "sites": {                                 gated sites
+        "youtube": {
+          "block": ["shorts"],                   distracting even when allowed
+          "activities": ["youtube_study"],       only allowed in these activities
+          "require_topic": true                  title must mention the topic
+        }
+      },
+      "topics": {                                extra topic keywords per activity
+        "youtube_study": ["lecture", "tutorial"]
+      }
+    }
+
+All keywords are matched case-insensitively as substrings.
+The file is re-read when its mtime changes (checked at most every
+RELOAD_CHECK seconds), so rules can be edited without a restart.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+import traceback
+from collections import namedtuple
+from functools import lru_cache
+
+DEFAULT_RULES = {
+    "block": ["facebook", "instagram", "twitter", "tiktok"],
+    "allow": [],
+    "sites": {
+        "youtube": {
+            "block": ["shorts"],
+            "activities": ["youtube_study"],
+            "require_topic": True
+        }
+    },
+    "topics": {}
+}
+
+# Seconds between mtime checks of the rules file
+RELOAD_CHECK = 2
+
+# (title, activity, topic) verdicts kept per rule set
+CACHE_SIZE = 4096
+
+Verdict = namedtuple("Verdict", ["distracted", "reason"])
+
+
+def _keywords(words):
+    return {w.strip().lower() for w in words or [] if w and w.strip()}
+
+
+def trie_regex(words):
+    """
+    Regex source matching any of `words`, factored as a trie
+    ("face(?:book)?" instead of "facebook|face"), so the regex engine
+    follows shared prefixes once instead of trying every alternative.
+    Longer words are preferred at each position.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        terminal = "" in node
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+
+        singles = [a for a in alts if len(a) == 1]
+        if len(singles) > 1:
+            alts = [a for a in alts if len(a) != 1] + ["[" + "".join(singles) + "]"]
+
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        if terminal:
+            body = body + "?" if len(alts) == 1 and len(body) == 1 else "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+# -----------------------------
+# COMPILED RULE SET
+# -----------------------------
+class CompiledRules:
+    """
+    Every static keyword (block, allow, site names, site blocks) in one
+    trie-shaped regex, so a title is scanned once no matter how many
+    rules exist.
+
+    The regex sits inside a lookahead and reports the longest keyword
+    at every position; keywords that are a prefix of it match at the
+    same position and are added from a table.
+    """
+
+    def __init__(self, rules):
+        self.block = _keywords(rules.get("block"))
+        self.allow = _keywords(rules.get("allow"))
+
+        self.sites = {}
+        for name, site in (rules.get("sites") or {}).items():
+            self.sites[name.strip().lower()] = {
+                "block": _keywords(site.get("block")),
+                "activities": _keywords(site.get("activities")),
+                "require_topic": bool(site.get("require_topic", False))
+            }
+
+        self.topics = {
+            activity.strip().lower(): sorted(_keywords(words))
+            for activity, words in (rules.get("topics") or {}).items()
+        }
+
+        keywords = set(self.block) | set(self.allow) | set(self.sites)
+        for site in self.sites.values():
+            keywords |= site["block"]
+
+        ordered = sorted(keywords, key=len, reverse=True)
+        self._prefixes = {
+            kw: [other for other in ordered if other != kw and kw.startswith(other)]
+            for kw in ordered
+        }
+        self._pattern = re.compile("(?=(" + trie_regex(ordered) + "))") if ordered else None
+
+        self._topic_pattern = lru_cache(maxsize=256)(self._compile_topic)
+        self.classify = lru_cache(maxsize=CACHE_SIZE)(self._classify)
+
+    def matches(self, title):
+        """Set of keywords occurring in the (lowercase) title."""
+        found = set()
+        if self._pattern is None:
+            return found
+        for m in self._pattern.finditer(title):
+            kw = m.group(1)
+            if kw not in found:
+                found.add(kw)
+                found.update(self._prefixes[kw])
+        return found
+
+    def _compile_topic(self, activity, topic):
+        words = set(topic.split()) | set(self.topics.get(activity, ()))
+        if not words:
+            return None
+        return re.compile(trie_regex(words))
+
+    def _classify(self, title, activity, topic):
+        title = title.lower()
+        found = self.matches(title)
+
+        allowed = found & self.allow
+        if allowed:
+            return Verdict(False, "allow:" + min(allowed))
+
+        blocked = found & self.block
+        if blocked:
+            return Verdict(True, "block:" + min(blocked))
+
+        for name in sorted(found & self.sites.keys()):
+            site = self.sites[name]
+
+            blocked = found & site["block"]
+            if blocked:
+                return Verdict(True, f"{name}:{min(blocked)}")
+            if activity not in site["activities"]:
+                return Verdict(True, f"{name}:activity")
+            if site["require_topic"]:
+                pattern = self._topic_pattern(activity, topic)
+                if pattern is None or not pattern.search(title):
+                    return Verdict(True, f"{name}:topic")
+            return Verdict(False, f"{name}:topic")
+
+        return Verdict(False, None)
+
+
+# -----------------------------
+# ENGINE (hot reload)
+# -----------------------------
+class TitleRules:
+    """
+    Current CompiledRules plus the file they came from.
+    classify() is safe to call from any thread; a reload swaps in a new
+    CompiledRules (with an empty cache) atomically.
+    """
+
+    def __init__(self, rules=None):
+        self.path = None
+        self.rules = CompiledRules(rules or DEFAULT_RULES)
+        self.reloads = 0
+
+        self._mtime = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        """Use rules from `path` (DEFAULT_RULES while the file is missing)."""
+        with self._lock:
+            self.path = path
+            self._mtime = -1.0
+            self._reload()
+
+    def classify(self, title, activity="", topic=""):
+        if self.path and time.monotonic() >= self._next_check:
+            with self._lock:
+                self._reload()
+        return self.rules.classify(title, (activity or "").lower(), (topic or "").lower())
+
+    def cache_info(self):
+        return self.rules.classify.cache_info()._asdict()
+
+    def _reload(self):
+        self._next_check = time.monotonic() + RELOAD_CHECK
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            if mtime is None:
+                rules = DEFAULT_RULES
+            else:
+                with open(self.path, encoding="utf-8") as f:
+                    rules = json.load(f)
+            self.rules = CompiledRules(rules)
+        except Exception:
+            # Keep the previous rules if the file is half-written or invalid
+            traceback.print_exc()
+            return
+
+        self.reloads += 1
+        print(f"Title rules loaded from {self.path if mtime else 'defaults'}")
+
+
+# Shared by all detectors in the process
+title_rules = TitleRules()
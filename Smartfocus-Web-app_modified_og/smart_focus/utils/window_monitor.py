@@ -0,0 +1,256 @@
+import sys
+import threading
+import traceback
+from abc import ABC, abstractmethod
+
+from smart_focus.utils.scheduler import scheduler
+
+# Fallback polling interval when no event hook is available.
+# A window switch is noticed up to POLL_INTERVAL seconds late; that only
+# delays the 30 s auto-stop clock, so a slower poll is the better trade
+# for one pygetwindow call per tick
+POLL_INTERVAL = 1
+
+
+# ---------------------------
+# Backends
+# ---------------------------
+class WindowBackend(ABC):
+    """
+    Source of active-window titles.
+    start(emit) must call emit(title) whenever the foreground title may
+    have changed (duplicates are fine, the monitor filters them);
+    stop() ends that until the next start().
+    """
+
+    @abstractmethod
+    def start(self, emit):
+        ...
+
+    @abstractmethod
+    def stop(self):
+        ...
+
+
+class FakeWindowBackend(WindowBackend):
+    """Deterministic backend for tests: set_title() emits synchronously."""
+
+    def __init__(self, title=None):
+        self.title = title
+        self._emit = None
+
+    def start(self, emit):
+        self._emit = emit
+        if self.title is not None:
+            emit(self.title)
+
+    def stop(self):
+        self._emit = None
+
+    def set_title(self, title):
+        self.title = title
+        if self._emit:
+            self._emit(title)
+
+
+class PollingBackend(WindowBackend):
+    """
+    pygetwindow polled on the shared scheduler (one job per host).
+    A failing getActiveWindow() is logged once per failure streak and
+    the poll carries on.
+    """
+
+    def __init__(self, interval=POLL_INTERVAL):
+        import pygetwindow
+        self._gw = pygetwindow
+        self.interval = interval
+        self._job = None
+        self.errors = 0
+
+    def start(self, emit):
+        def poll():
+            try:
+                window = self._gw.getActiveWindow()
+            except Exception as e:
+                if not self.errors:
+                    print("Active window lookup failed:", e)
+                self.errors += 1
+                return
+            if self.errors:
+                print(f"Active window lookup recovered after {self.errors} failures")
+                self.errors = 0
+            emit(window.title if window else None)
+
+        self._job = scheduler.every(self.interval, poll, delay=0)
+
+    def stop(self):
+        if self._job:
+            self._job.cancel()
+            self._job = None
+
+
+class WinEventBackend(WindowBackend):
+    """
+    Windows: SetWinEventHook on foreground changes and title changes.
+    No polling; the hook thread sleeps in GetMessage until Windows
+    reports an event.
+    """
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+    WM_QUIT = 0x0012
+
+    def __init__(self):
+        import ctypes
+        from ctypes import wintypes
+
+        self._ctypes = ctypes
+        self._wintypes = wintypes
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+        self._thread = None
+        self._thread_id = None
+
+    def _title(self, hwnd):
+        user32 = self._user32
+        length = user32.GetWindowTextLengthW(hwnd)
+        buf = self._ctypes.create_unicode_buffer(length + 1)
+        user32.GetWindowTextW(hwnd, buf, length + 1)
+        return buf.value
+
+    def start(self, emit):
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(emit, ready), daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, emit, ready):
+        ctypes, wintypes, user32 = self._ctypes, self._wintypes, self._user32
+
+        WinEventProc = ctypes.WINFUNCTYPE(
+            None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+            wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+        )
+
+        def callback(hook, event, hwnd, id_object, id_child, thread, time_ms):
+            if event == self.EVENT_OBJECT_NAMECHANGE:
+                if id_object != self.OBJID_WINDOW or hwnd != user32.GetForegroundWindow():
+                    return
+            try:
+                emit(self._title(hwnd))
+            except Exception:
+                traceback.print_exc()
+
+        proc = WinEventProc(callback)   # keep a reference while hooked
+        hooks = [
+            user32.SetWinEventHook(event, event, 0, proc, 0, 0, self.WINEVENT_OUTOFCONTEXT)
+            for event in (self.EVENT_SYSTEM_FOREGROUND, self.EVENT_OBJECT_NAMECHANGE)
+        ]
+        self._thread_id = self._kernel32.GetCurrentThreadId()
+        ready.set()
+
+        # Current window, then wait for events
+        emit(self._title(user32.GetForegroundWindow()))
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+            user32.TranslateMessage(ctypes.byref(msg))
+            user32.DispatchMessageW(ctypes.byref(msg))
+
+        for hook in hooks:
+            user32.UnhookWinEvent(hook)
+
+    def stop(self):
+        if self._thread_id:
+            self._user32.PostThreadMessageW(self._thread_id, self.WM_QUIT, 0, 0)
+            self._thread.join(timeout=2)
+            self._thread_id = None
+
+
+def default_backend():
+    """Event hook on Windows, pygetwindow polling elsewhere."""
+    if sys.platform == "win32":
+        try:
+            return WinEventBackend()
+        except Exception:
+            traceback.print_exc()
+    return PollingBackend()
+
+
+# ---------------------------
+# Shared monitor
+# ---------------------------
+class WindowMonitor:
+    """
+    One active-window source shared by every tracker in the process.
+
+    - The backend runs only while someone is subscribed
+    - Subscribers are called only when the title actually changes
+      (and once with the current title when they subscribe)
+    """
+
+    def __init__(self, backend_factory=default_backend):
+        self.backend_factory = backend_factory
+        self.backend = None
+        self.title = None
+        self.changes = 0
+
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def set_backend(self, backend):
+        """Swap the backend (e.g. FakeWindowBackend in tests)."""
+        with self._lock:
+            running = self.backend is not None and bool(self._subscribers)
+            if running:
+                self.backend.stop()
+            self.backend = backend
+            self.title = None
+        if running:
+            backend.start(self._emit)
+
+    def subscribe(self, callback):
+        """callback(title) on every change. Returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+            start = len(self._subscribers) == 1
+            if self.backend is None:
+                self.backend = self.backend_factory()
+            title = self.title
+
+        if start:
+            self.backend.start(self._emit)
+        elif title is not None:
+            callback(title)
+
+        def unsubscribe():
+            with self._lock:
+                if callback not in self._subscribers:
+                    return
+                self._subscribers.remove(callback)
+                stop = not self._subscribers
+                if stop:
+                    self.title = None
+            if stop:
+                self.backend.stop()
+
+        return unsubscribe
+
+    def _emit(self, title):
+        with self._lock:
+            if title == self.title:
+                return
+            self.title = title
+            self.changes += 1
+            subscribers = list(self._subscribers)
+
+        for callback in subscribers:
+            try:
+                callback(title)
+            except Exception:
+                traceback.print_exc()
+
+
+# Shared by all trackers in the process
+window_monitor = WindowMonitor()
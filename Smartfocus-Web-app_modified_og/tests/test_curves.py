@@ -0,0 +1,54 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from smart_focus.analytics.curves import session_curve
+from smart_focus.database.db import db_path, init_db
+from smart_focus.database.timeline import insert_events
+
+START = 1_772_000_000
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    init_db(db_path(str(tmp_path)))
+    return str(tmp_path)
+
+
+def add_session(data_dir, events, total):
+    """Log `events` for asha and the session row ending `total` s after START."""
+    stop = datetime.fromtimestamp(START + total).strftime("%Y-%m-%d %H:%M:%S")
+    conn = sqlite3.connect(db_path(data_dir))
+    with conn:
+        insert_events(conn, [
+            {"ts": START + offset, "user": "asha", "mode": "camera", "status": status}
+            for offset, status in events
+        ])
+        cur = conn.execute("""
+        INSERT INTO sessions (timestamp, user, mode, activity, total_seconds)
+        VALUES (?, 'asha', 'camera', 'general', ?)
+        """, (stop, total))
+    conn.close()
+    return cur.lastrowid
+
+
+def test_same_second_status_change_uses_the_later_status(data_dir):
+    session_id = add_session(data_dir, [
+        (0, "Focused"),
+        (30, "Focused"),
+        (30, "Distracted"),
+        (90, "Focused")
+    ], total=120)
+
+    curve = session_curve(data_dir, "asha", session_id, resolution=60)
+
+    assert curve["offset_seconds"] == [0, 60]
+    assert curve["focused_seconds"] == [30.0, 30.0]
+    assert curve["focus_ratio"] == [0.5, 0.5]
+    assert curve["transitions"] == 3
+
+
+def test_curve_of_another_users_session_is_none(data_dir):
+    session_id = add_session(data_dir, [(0, "Focused")], total=60)
+    assert session_curve(data_dir, "ravi", session_id) is None
@@ -0,0 +1,169 @@
+import sys
+import time
+import types
+
+import pytest
+
+from smart_focus.utils import distraction_detector as dd
+from smart_focus.utils.window_monitor import (
+    FakeWindowBackend, PollingBackend, WindowBackend, WindowMonitor
+)
+
+
+class FakeTracker:
+    activity = "general"
+    topic = ""
+
+    def __init__(self):
+        self.running = True
+        self.content_distracted = False
+        self.auto_stopped = False
+        self.sounds = []
+
+    def stop(self):
+        self.running = False
+
+    def _play_sound(self, path, urgent=False):
+        self.sounds.append((path, urgent))
+
+
+def wait_for(condition, timeout=3):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def fake():
+    return FakeWindowBackend("Notes - Editor")
+
+
+@pytest.fixture
+def monitor(fake):
+    return WindowMonitor(backend_factory=lambda: fake)
+
+
+@pytest.fixture
+def fast_checks(monkeypatch):
+    monkeypatch.setattr(dd, "DISTRACTION_THRESHOLD", 0.3)
+    monkeypatch.setattr(dd, "CHECK_INTERVAL", 0.05)
+
+
+def make_detector(monitor, grace):
+    tracker = FakeTracker()
+    detector = dd.DistractionDetector(tracker, monitor=monitor)
+    detector.GRACE_PERIOD = grace
+    return tracker, detector
+
+
+# -----------------------------
+# WINDOW MONITOR
+# -----------------------------
+def test_monitor_reports_only_title_changes(fake, monitor):
+    first, second = [], []
+    unsubscribe = monitor.subscribe(first.append)
+
+    fake.set_title("Instagram")
+    fake.set_title("Instagram")
+    fake.set_title("Notes - Editor")
+    assert first == ["Notes - Editor", "Instagram", "Notes - Editor"]
+    assert monitor.changes == 3
+
+    # A late subscriber gets the current title once
+    unsubscribe_second = monitor.subscribe(second.append)
+    assert second == ["Notes - Editor"]
+
+    unsubscribe()
+    unsubscribe_second()
+    assert fake._emit is None
+    fake.set_title("Instagram")
+    assert len(first) == 3
+
+
+def test_backends_must_implement_start_and_stop():
+    class StartOnly(WindowBackend):
+        def start(self, emit):
+            pass
+
+    with pytest.raises(TypeError):
+        WindowBackend()
+    with pytest.raises(TypeError):
+        StartOnly()
+
+
+def test_polling_errors_are_logged_once(monkeypatch, capsys):
+    calls = []
+
+    def get_active_window():
+        calls.append(1)
+        if len(calls) <= 5:
+            raise OSError("no display")
+        return types.SimpleNamespace(title="Notes - Editor")
+
+    monkeypatch.setitem(sys.modules, "pygetwindow", types.SimpleNamespace(getActiveWindow=get_active_window))
+    backend = PollingBackend(interval=0.01)
+    titles = []
+    backend.start(titles.append)
+    try:
+        assert wait_for(lambda: titles)
+    finally:
+        backend.stop()
+
+    out = capsys.readouterr().out
+    assert out.count("Active window lookup failed") == 1
+    assert "recovered after 5 failures" in out
+    assert titles[0] == "Notes - Editor"
+
+
+# -----------------------------
+# DETECTOR
+# -----------------------------
+def test_grace_period_holds_back_the_verdict(fake, monitor, fast_checks):
+    tracker, detector = make_detector(monitor, grace=0.3)
+    detector.start()
+    try:
+        fake.set_title("Instagram")
+        assert detector.distracted
+        assert not tracker.content_distracted
+
+        assert wait_for(lambda: tracker.content_distracted, timeout=2)
+    finally:
+        detector.stop()
+
+
+def test_leaving_the_distraction_resets_the_clock(fake, monitor, fast_checks):
+    tracker, detector = make_detector(monitor, grace=0.01)
+    detector.start()
+    try:
+        assert wait_for(lambda: detector._grace_job.cancelled)
+
+        fake.set_title("Instagram")
+        assert tracker.content_distracted
+        assert detector.distracted_since is not None
+
+        fake.set_title("Notes - Editor")
+        assert not tracker.content_distracted
+        assert detector.distracted_since is None
+        assert detector._watch_job is None
+
+        time.sleep(0.5)
+        assert tracker.running
+    finally:
+        detector.stop()
+
+
+def test_auto_stop_after_continuous_distraction(fake, monitor, fast_checks):
+    tracker, detector = make_detector(monitor, grace=0.01)
+    detector.start()
+    assert wait_for(lambda: detector._grace_job.cancelled)
+
+    fake.set_title("Instagram")
+    assert wait_for(lambda: not tracker.running)
+
+    assert tracker.auto_stopped
+    assert tracker.sounds == [("static/alert2.wav", True)]
+    assert not detector.running
+    assert wait_for(lambda: fake._emit is None)
@@ -0,0 +1,112 @@
+import cv2
+import numpy as np
+import pytest
+
+from smart_focus.focus import session
+from smart_focus.focus.camera import CameraFocusTracker
+from smart_focus.focus.frame_gate import FrameGate
+from smart_focus.focus.inference import DROPPED
+
+
+def thumb(level):
+    return np.full((16, 16), level, dtype=np.uint8)
+
+
+def jpeg(level):
+    frame = np.full((120, 160, 3), level, dtype=np.uint8)
+    return cv2.imencode(".jpg", frame)[1].tobytes()
+
+
+# -----------------------------
+# GATE
+# -----------------------------
+def test_similar_frame_is_skipped_after_accept():
+    gate = FrameGate(threshold=2, max_skip=5)
+
+    assert gate.changed(thumb(100))
+    gate.accept()
+    assert not gate.changed(thumb(101))
+    assert gate.changed(thumb(140))
+
+
+def test_reference_is_kept_until_accept():
+    gate = FrameGate(threshold=2, max_skip=5)
+    assert gate.changed(thumb(100))
+    gate.accept()
+
+    # Passed but never accepted (inference dropped)
+    assert gate.changed(thumb(140))
+    assert gate.changed(thumb(140))
+
+    gate.accept()
+    assert not gate.changed(thumb(141))
+
+
+def test_max_skip_forces_inference():
+    gate = FrameGate(threshold=2, max_skip=2)
+    assert gate.changed(thumb(100))
+    gate.accept()
+
+    assert [gate.changed(thumb(100)) for _ in range(3)] == [False, False, True]
+
+
+# -----------------------------
+# CAMERA TRACKER
+# -----------------------------
+class FakePool:
+    """Returns scripted results (DROPPED or None = no face)."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def infer(self, key, rgb):
+        self.calls += 1
+        return self.results.pop(0) if self.results else None
+
+    def release(self, key):
+        pass
+
+
+@pytest.fixture
+def make_tracker(monkeypatch):
+    monkeypatch.setattr(session, "log_timeline", lambda *a, **k: None)
+    trackers = []
+
+    def make(pool):
+        tracker = CameraFocusTracker("asha", 1, pool=pool)
+        tracker.tick_job.cancel()
+        trackers.append(tracker)
+        return tracker
+
+    yield make
+    for tracker in trackers:
+        tracker.running = False
+
+
+def test_dropped_inference_does_not_become_the_reference(make_tracker):
+    pool = FakePool([None, DROPPED])
+    tracker = make_tracker(pool)
+
+    tracker.process_frame_bytes(jpeg(100))
+    assert pool.calls == 1
+
+    # New scene, but the pool drops it: the next similar frame must run
+    tracker.process_frame_bytes(jpeg(200))
+    tracker.process_frame_bytes(jpeg(200))
+    assert pool.calls == 3
+
+    # Accepted now, so a repeat is skipped
+    tracker.process_frame_bytes(jpeg(200))
+    assert pool.calls == 3
+    assert tracker.gate.skipped == 1
+
+
+def test_first_frame_dropped_is_retried(make_tracker):
+    pool = FakePool([DROPPED])
+    tracker = make_tracker(pool)
+
+    tracker.process_frame_bytes(jpeg(100))
+    tracker.process_frame_bytes(jpeg(100))
+    assert pool.calls == 2
+    assert tracker.state == "no_face"
@@ -0,0 +1,103 @@
+import queue
+import types
+
+import numpy as np
+import pytest
+
+from smart_focus.focus import inference
+from smart_focus.focus.inference import DROPPED, InferencePool, _Trackers, _Waiter
+
+
+class FakeFaceMesh:
+    """Counts instances; never finds a face."""
+
+    created = 0
+
+    def __init__(self, **kwargs):
+        FakeFaceMesh.created += 1
+        self.kwargs = kwargs
+        self.closed = False
+
+    def process(self, rgb):
+        return types.SimpleNamespace(multi_face_landmarks=None)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_mesh(monkeypatch):
+    FakeFaceMesh.created = 0
+    solutions = types.SimpleNamespace(face_mesh=types.SimpleNamespace(FaceMesh=FakeFaceMesh))
+    monkeypatch.setattr(inference, "mp", types.SimpleNamespace(solutions=solutions))
+    return FakeFaceMesh
+
+
+# -----------------------------
+# BACKPRESSURE
+# -----------------------------
+def test_full_queue_drops_the_oldest_frame():
+    pool = InferencePool(workers=1)
+    tasks = queue.Queue(maxsize=2)
+
+    waiters = {}
+    for seq in range(2):
+        waiters[seq] = pool._waiting[("a", seq)] = _Waiter()
+        tasks.put_nowait(("a", seq, 0.0, b"frame"))
+
+    assert pool._submit(tasks, ("a", 2, 0.0, b"newest"))
+
+    assert waiters[0].event.is_set() and waiters[0].result == DROPPED
+    assert not waiters[1].event.is_set()
+    assert [tasks.get_nowait()[1] for _ in range(2)] == [1, 2]
+    assert pool.dropped_full == 1
+
+
+# -----------------------------
+# SESSION PINNING
+# -----------------------------
+def test_sessions_stay_on_the_least_loaded_worker():
+    pool = InferencePool(workers=2)
+
+    assert [pool._worker_for(k) for k in ("a", "b", "a", "c")] == [0, 1, 0, 0]
+
+    pool.release("a")
+    pool.release("c")
+    assert pool._worker_for("d") == 0
+    assert pool.metrics()["sessions"] == 2
+
+
+def test_one_tracking_mesh_per_session(fake_mesh):
+    trackers = _Trackers(max_trackers=2, idle=30)
+
+    a = trackers.get("a", now=0)
+    assert trackers.get("a", now=1) is a
+    assert "static_image_mode" not in a.kwargs
+
+    trackers.get("b", now=2)
+    trackers.get("c", now=3)
+    assert a.closed
+    assert fake_mesh.created == 3
+
+
+def test_idle_trackers_are_closed(fake_mesh):
+    trackers = _Trackers(max_trackers=8, idle=30)
+    a = trackers.get("a", now=0)
+    b = trackers.get("b", now=40)
+
+    assert a.closed and not b.closed
+
+
+def test_worker_process_runs_frames(fake_mesh):
+    pool = InferencePool(workers=1).start()
+    try:
+        rgb = np.zeros((4, 4, 3), dtype=np.uint8)
+        assert pool.infer("a", rgb) is None
+        assert pool.infer("a", rgb) is None
+        pool.release("a")
+
+        metrics = pool.metrics()
+        assert metrics["workers"][0]["frames"] == 2
+        assert metrics["sessions"] == 0
+    finally:
+        pool.stop()
@@ -0,0 +1,62 @@
+import queue
+import time
+
+from smart_focus.utils import notifier as nm
+from smart_focus.utils.notifier import NotificationDispatcher, PolledInbox
+
+
+def idle_dispatcher(pending=16):
+    """Dispatcher whose worker never runs, so queued alerts stay queued."""
+    dispatcher = NotificationDispatcher(backends=[])
+    dispatcher._queue = queue.Queue(pending)
+    dispatcher._ensure_thread = lambda: None
+    return dispatcher
+
+
+def test_alert_dropped_on_a_full_queue_is_not_recorded():
+    dispatcher = idle_dispatcher(pending=1)
+
+    assert dispatcher.notify("asha", "first", "m")
+    assert not dispatcher.notify("asha", "second", "m")
+
+    assert dispatcher.stats()["dropped"] == 1
+    assert list(dispatcher._last_sent) == [("asha", "first", "m", None)]
+    assert len(dispatcher._recent["asha"]) == 1
+
+    # Room again: the dropped alert is not treated as a repeat
+    dispatcher._queue.get_nowait()
+    assert dispatcher.notify("asha", "second", "m")
+
+
+def test_prune_after_drops_does_not_fail():
+    dispatcher = idle_dispatcher(pending=1)
+    dispatcher._queue.put_nowait(("note", {}))
+
+    assert not dispatcher.notify("asha", "t", "m")
+    assert "asha" not in dispatcher._recent
+
+    dispatcher._recent["ravi"] = []
+    dispatcher._prune(time.monotonic())
+    assert dispatcher._recent == {}
+
+
+def test_rate_limit_and_urgent_alerts():
+    dispatcher = idle_dispatcher()
+    for i in range(nm.RATE_LIMIT):
+        assert dispatcher.notify("asha", f"t{i}", "m")
+
+    assert not dispatcher.notify("asha", sound="alert.wav")
+    assert dispatcher.notify("asha", sound="alert.wav", urgent=True)
+    assert not dispatcher.notify("asha", sound="alert.wav", urgent=True)
+
+    stats = dispatcher.stats()
+    assert (stats["rate_limited"], stats["deduped"]) == (1, 1)
+
+
+def test_polled_inbox_keeps_the_latest_alert():
+    inbox = PolledInbox()
+    inbox.send({"user": "asha", "title": "a", "message": "1", "sound": None})
+    inbox.send({"user": "asha", "title": "b", "message": "2", "sound": None})
+
+    assert inbox.pop("asha") == {"title": "b", "message": "2"}
+    assert inbox.pop("asha") is None
@@ -0,0 +1,33 @@
+import sqlite3
+from datetime import date, timedelta
+
+import pytest
+
+from smart_focus.analytics.reports import get_monthly_report, get_weekly_report
+from smart_focus.database.db import db_path, init_db
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    init_db(db_path(str(tmp_path)))
+    return str(tmp_path)
+
+
+def add_days(data_dir, *days_ago):
+    conn = sqlite3.connect(db_path(data_dir))
+    with conn:
+        conn.executemany("""
+        INSERT INTO daily_focus (user, date, focused_seconds, distracted_seconds, sessions, goals_achieved, best_score)
+        VALUES ('asha', ?, 600, 60, 1, 0, 80)
+        """, [((date.today() - timedelta(days=n)).isoformat(),) for n in days_ago])
+    conn.close()
+
+
+def test_weekly_report_covers_seven_calendar_days(data_dir):
+    add_days(data_dir, 0, 6, 7)
+    assert get_weekly_report(data_dir, "asha")["days_tracked"] == 2
+
+
+def test_monthly_report_covers_thirty_calendar_days(data_dir):
+    add_days(data_dir, 0, 29, 30)
+    assert get_monthly_report(data_dir, "asha")["days_tracked"] == 2
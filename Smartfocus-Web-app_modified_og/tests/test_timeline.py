@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+from smart_focus.database.db import db_path, init_db
+from smart_focus.database.timeline import STATUS_CODES, insert_events, status_intervals
+
+FOCUSED = STATUS_CODES["Focused"]
+DISTRACTED = STATUS_CODES["Distracted"]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    init_db(db_path(str(tmp_path)))
+    return str(tmp_path)
+
+
+def log(data_dir, *events):
+    conn = sqlite3.connect(db_path(data_dir))
+    with conn:
+        insert_events(conn, [
+            {"ts": ts, "user": "asha", "mode": "camera", "status": status}
+            for ts, status in events
+        ])
+    conn.close()
+
+
+def test_same_second_transitions_are_all_stored(data_dir):
+    log(data_dir, (100, "Focused"), (100, "Distracted"), (100, "Focused"), (101, "Focused"))
+
+    conn = sqlite3.connect(db_path(data_dir))
+    assert conn.execute("SELECT COUNT(*) FROM timeline_events").fetchone()[0] == 4
+    conn.close()
+
+
+def test_last_transition_within_a_second_wins(data_dir):
+    log(data_dir, (100, "Focused"), (110, "Focused"), (110, "Distracted"), (120, "Focused"))
+
+    starts, ends, statuses = status_intervals(data_dir, "asha", 100, 130)
+    assert starts.tolist() == [100, 110, 120]
+    assert ends.tolist() == [110, 120, 130]
+    assert statuses.tolist() == [FOCUSED, DISTRACTED, FOCUSED]
+
+
+def test_status_before_the_window_uses_the_last_same_second_transition(data_dir):
+    log(data_dir, (90, "Distracted"), (90, "Focused"))
+
+    starts, ends, statuses = status_intervals(data_dir, "asha", 100, 110)
+    assert starts.tolist() == [100]
+    assert ends.tolist() == [110]
+    assert statuses.tolist() == [FOCUSED]
+
+
+def test_old_timeline_table_is_upgraded(tmp_path):
+    path = db_path(str(tmp_path))
+    conn = sqlite3.connect(path)
+    conn.execute("""
+    CREATE TABLE timeline_events (
+        user_id INTEGER NOT NULL,
+        ts INTEGER NOT NULL,
+        status INTEGER NOT NULL,
+        mode INTEGER NOT NULL,
+        PRIMARY KEY (user_id, ts, status)
+    ) WITHOUT ROWID
+    """)
+    conn.executemany("INSERT INTO timeline_events VALUES (?, ?, ?, ?)", [(1, 5, 1, 0), (1, 3, 0, 0)])
+    conn.commit()
+    conn.close()
+
+    init_db(path)
+
+    conn = sqlite3.connect(path)
+    rows = conn.execute("SELECT user_id, ts, status, mode FROM timeline_events ORDER BY seq").fetchall()
+    conn.close()
+    assert rows == [(1, 3, 0, 0), (1, 5, 1, 0)]
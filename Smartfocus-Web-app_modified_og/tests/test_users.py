@@ -0,0 +1,42 @@
+import pytest
+
+from smart_focus.database.db import db_path, init_db
+from smart_focus.database.users import UserStore
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    init_db(db_path(str(tmp_path)))
+    return str(tmp_path)
+
+
+def test_unknown_user_is_not_cached(data_dir):
+    here, other = UserStore(data_dir), UserStore(data_dir)
+
+    assert here.get("asha") is None
+    assert other.create("asha", "", "hash-1")
+    assert here.get("asha")["password"] == "hash-1"
+
+
+def test_cached_account_expires(data_dir):
+    here, other = UserStore(data_dir, cache_ttl=0), UserStore(data_dir)
+    other.create("asha", "", "hash-1")
+
+    assert here.get("asha")["password"] == "hash-1"
+    other.set_password("asha", "hash-2")
+    assert here.get("asha")["password"] == "hash-2"
+
+
+def test_cache_is_bounded(data_dir):
+    store = UserStore(data_dir, cache_size=2)
+    for name in ("a", "b", "c"):
+        store.create(name, "", "hash")
+
+    assert list(store._cache) == ["b", "c"]
+
+
+def test_any(data_dir):
+    store = UserStore(data_dir)
+    assert not store.any()
+    store.create("asha", "", "hash")
+    assert store.any()
@@ -10,8 +10,9 @@ from smart_focus.focus.camera import CameraFocusTracker
 from smart_focus.utils.logger import init_logger
 from smart_focus.analytics.graphs import build_focus_graph
 from smart_focus.analytics.reports import get_weekly_report, get_monthly_report
-from smart_focus.analytics.parents import get_parent_email
-from smart_focus.utils.emailer import send_email
+from smart_focus.analytics.parents import get_parent_email, queue_weekly_parent_reports, weekly_report_body
+from smart_focus.utils.outbox import Outbox, OutboxWorker, schedule_weekly
+from smart_focus.utils.emailer import email_configured
 
 # ---------------------------
 # App setup
@@ -30,6 +31,23 @@ session_thread = None
 
 USERS_FILE = os.path.join(DATA_DIR, "users.csv")
 
+# Emails are queued in data/outbox.db and sent by a background worker
+# (queued only until SMARTFOCUS_SMTP_PASSWORD is set)
+outbox = Outbox(DATA_DIR)
+outbox_worker = OutboxWorker(outbox)
+if email_configured():
+    outbox_worker.start()
+else:
+    print("SMARTFOCUS_SMTP_PASSWORD not set: emails stay queued in outbox.db")
+
+# Every parent's weekly report, queued in one pass (default Sunday 18:00)
+if os.environ.get("SMARTFOCUS_WEEKLY_REPORTS", "1") == "1":
+    schedule_weekly(
+        lambda: queue_weekly_parent_reports(DATA_DIR, outbox),
+        weekday=int(os.environ.get("SMARTFOCUS_WEEKLY_REPORT_DAY", 6)),
+        hour=int(os.environ.get("SMARTFOCUS_WEEKLY_REPORT_HOUR", 18))
+    )
+
 # ---------------------------
 # ROOT → redirect based on auth
 # ---------------------------
@@ -272,19 +290,11 @@ def send_weekly_parent_report():
     if not parent_email:
         return "Parent email not found", 404
 
-    body = f"""
-Weekly Focus Report for {user}
-
-Total Focus Time: {report['total_focus_minutes']} minutes
-Average Daily Focus: {report['average_daily_minutes']} minutes
-Days Tracked: {report['days_tracked']}
-Goal Achieved Days: {report['goal_days']}
-
-– SmartFocus System
-"""
+    if not report:
+        return "No sessions this week", 404
 
-    sent = send_email(parent_email, "Weekly Focus Report", body)
-    return "Email sent successfully" if sent else "Email failed"
+    outbox.enqueue(parent_email, "Weekly Focus Report", weekly_report_body(user, report))
+    return "Email queued for sending"
 
 # ---------------------------
 # RUN
@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+from datetime import datetime
 
 def get_parent_email(data_dir, user):
     file_path = os.path.join(data_dir, "users.csv")
@@ -21,4 +22,60 @@ def get_parent_email(data_dir, user):
     if row.empty:
         return None
 
-    return row.iloc[0]["parent_email"]
\ No newline at end of file
+    return row.iloc[0]["parent_email"]
+
+
+def get_parent_emails(data_dir):
+    """user -> parent_email for every user with one (one CSV read)."""
+    file_path = os.path.join(data_dir, "users.csv")
+    if not os.path.exists(file_path):
+        return {}
+
+    try:
+        df = pd.read_csv(file_path)
+    except Exception:
+        return {}
+
+    df = df.dropna(subset=["parent_email"])
+    df["user"] = df["user"].str.lower()
+    df = df.drop_duplicates("user")
+    return dict(zip(df["user"], df["parent_email"]))
+
+
+def weekly_report_body(user, report):
+    return f"""
+Weekly Focus Report for {user}
+
+Total Focus Time: {report['total_focus_minutes']} minutes
+Average Daily Focus: {report['average_daily_minutes']} minutes
+Days Tracked: {report['days_tracked']}
+Goal Achieved Days: {report['goal_days']}
+
+– SmartFocus System
+"""
+
+
+def queue_weekly_parent_reports(data_dir, outbox):
+    """
+    Queue this week's report for every parent in one pass.
+    Keyed by user and ISO week, so a re-run never mails a parent twice.
+    Returns the number of messages queued.
+    """
+    from smart_focus.analytics.reports import get_weekly_reports
+
+    year, week, _ = datetime.now().isocalendar()
+    emails = get_parent_emails(data_dir)
+
+    queued = 0
+    for user, report in get_weekly_reports(data_dir).items():
+        parent_email = emails.get(user)
+        if not parent_email:
+            continue
+        if outbox.enqueue(
+            parent_email,
+            "Weekly Focus Report",
+            weekly_report_body(user, report),
+            dedupe_key=f"weekly:{user}:{year}-W{week:02d}"
+        ):
+            queued += 1
+    return queued
@@ -3,9 +3,8 @@ from datetime import datetime, timedelta
 import os
 
 
-def get_weekly_report(data_dir, user):
-    if not user:
-        return None
+def _load_week(data_dir):
+    """Last 7 days of sessions (user lower-cased), or None if no sessions file."""
     session_file = os.path.join(data_dir, "sessions.csv")
 
     if not os.path.exists(session_file):
@@ -15,21 +14,15 @@ def get_weekly_report(data_dir, user):
     df["user"] = df["user"].str.lower()
     df["timestamp"] = pd.to_datetime(df["timestamp"])
 
-    user = user.lower()
-
     end_date = datetime.now()
     start_date = end_date - timedelta(days=7)
 
-    df = df[
-        (df["user"] == user) &
-        (df["timestamp"] >= start_date)
-    ]
-
-    if df.empty:
-        return None
-
+    df = df[df["timestamp"] >= start_date].copy()
     df["focused_minutes"] = df["focused_seconds"] / 60
+    return df
+
 
+def _weekly_summary(df):
     return {
         "total_focus_minutes": int(df["focused_minutes"].sum()),
         "average_daily_minutes": int(df["focused_minutes"].mean()),
@@ -39,6 +32,31 @@ def get_weekly_report(data_dir, user):
         "days_tracked": len(df)
     }
 
+
+def get_weekly_report(data_dir, user):
+    if not user:
+        return None
+
+    df = _load_week(data_dir)
+    if df is None:
+        return None
+
+    df = df[df["user"] == user.lower()]
+
+    if df.empty:
+        return None
+
+    return _weekly_summary(df)
+
+
+def get_weekly_reports(data_dir):
+    """Weekly report of every user with sessions this week (one CSV read)."""
+    df = _load_week(data_dir)
+    if df is None or df.empty:
+        return {}
+
+    return {user: _weekly_summary(group) for user, group in df.groupby("user")}
+
 def get_monthly_report(data_dir, user):
     if not user:
         return None
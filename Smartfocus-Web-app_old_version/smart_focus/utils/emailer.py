@@ -1,25 +1,118 @@
+import os
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
-def send_email(to_email, subject, body):
-    sender_email = "mrsiri507@gmail.com"
-    sender_password = "gjms spvp ksas oaci"
+SMTP_HOST = os.environ.get("SMARTFOCUS_SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("SMARTFOCUS_SMTP_PORT", 587))
+SMTP_STARTTLS = os.environ.get("SMARTFOCUS_SMTP_STARTTLS", "1") == "1"
+
+# The password only comes from the environment; without it nothing is sent
+# (set SMARTFOCUS_SMTP_USER="" for a relay that needs no login)
+sender_email = os.environ.get("SMARTFOCUS_SMTP_USER", "mrsiri507@gmail.com")
+sender_password = os.environ.get("SMARTFOCUS_SMTP_PASSWORD", "")
+
+# An idle connection is checked with NOOP before reuse after this many seconds
+NOOP_AFTER = 30
+
+
+class EmailNotConfigured(smtplib.SMTPException):
+    """A login user is set but SMARTFOCUS_SMTP_PASSWORD is not."""
 
+
+def email_configured():
+    return not sender_email or bool(sender_password)
+
+
+def build_message(to_email, subject, body):
     msg = MIMEMultipart()
     msg["From"] = sender_email
     msg["To"] = to_email
     msg["Subject"] = subject
 
     msg.attach(MIMEText(body, "plain"))
+    return msg
+
+
+class SMTPConnection:
+    """
+    One authenticated SMTP session reused for many messages.
 
+    - Connects, runs STARTTLS and logs in on the first send
+      (raises EmailNotConfigured if there is a user but no password)
+    - A connection idle for NOOP_AFTER seconds is probed with NOOP,
+      and re-opened if the server dropped it
+    - Not thread-safe: owned by a single sender (the outbox worker)
+    """
+
+    def __init__(self, host=None, port=None, user=None, password=None, starttls=None, timeout=30):
+        self.host = host or SMTP_HOST
+        self.port = port or SMTP_PORT
+        self.user = sender_email if user is None else user
+        self.password = sender_password if password is None else password
+        self.starttls = SMTP_STARTTLS if starttls is None else starttls
+        self.timeout = timeout
+
+        self._server = None
+        self._last_used = 0.0
+        self.connects = 0
+
+    def send(self, msg):
+        server = self._connection()
+        try:
+            server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            # Dropped between the check and the send: one fresh attempt
+            self.close()
+            self._connection().send_message(msg)
+        self._last_used = time.monotonic()
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except Exception:
+                pass
+            self._server = None
+
+    @property
+    def idle_seconds(self):
+        return time.monotonic() - self._last_used
+
+    def _connection(self):
+        if self._server is not None and self.idle_seconds > NOOP_AFTER:
+            try:
+                if self._server.noop()[0] != 250:
+                    self.close()
+            except Exception:
+                self._server = None
+
+        if self._server is None:
+            if self.user and not self.password:
+                raise EmailNotConfigured("SMARTFOCUS_SMTP_PASSWORD is not set")
+            server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            try:
+                if self.starttls:
+                    server.starttls()
+                if self.user:
+                    server.login(self.user, self.password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+            self.connects += 1
+        return self._server
+
+
+def send_email(to_email, subject, body):
+    """Send one message on its own connection (outside the outbox)."""
+    conn = SMTPConnection()
     try:
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        server.send_message(msg)
-        server.quit()
+        conn.send(build_message(to_email, subject, body))
         return True
     except Exception as e:
         print("Email error:", e)
-        return False
\ No newline at end of file
+        return False
+    finally:
+        conn.close()
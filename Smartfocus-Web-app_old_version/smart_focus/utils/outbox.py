@@ -0,0 +1,302 @@
+import os
+import random
+import smtplib
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+
+from smart_focus.utils.emailer import SMTPConnection, build_message
+
+# Retries: BACKOFF_BASE * 2^(attempt-1) seconds (+ jitter), capped
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 30
+BACKOFF_MAX = 3600
+
+# Messages sent per batch before the worker looks at the queue again
+BATCH_SIZE = 50
+
+# Close the SMTP connection after this long without mail
+IDLE_CLOSE = 120
+
+# Longest the worker sleeps without being woken
+POLL_SECONDS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    last_error TEXT,
+    dedupe_key TEXT UNIQUE,
+    created_at TEXT NOT NULL,
+    sent_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt);
+"""
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+# -----------------------------
+# OUTBOX TABLE
+# -----------------------------
+class Outbox:
+    """
+    Queued emails in data/outbox.db.
+    Rows go queued -> sent, or queued -> failed after MAX_ATTEMPTS
+    (or a permanent SMTP error). dedupe_key makes enqueue idempotent.
+    """
+
+    def __init__(self, data_dir):
+        self.path = os.path.join(data_dir, "outbox.db")
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self.wakeup = threading.Event()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, to_email, subject, body, dedupe_key=None):
+        """Queue a message. Returns its id, or None if dedupe_key was already queued."""
+        conn = self._connect()
+        with conn:
+            cur = conn.execute("""
+            INSERT OR IGNORE INTO outbox (to_email, subject, body, next_attempt, dedupe_key, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (to_email, subject, body, time.time(), dedupe_key, _now()))
+        conn.close()
+
+        if cur.rowcount:
+            self.wakeup.set()
+            return cur.lastrowid
+        return None
+
+    def due(self, limit=BATCH_SIZE):
+        conn = self._connect()
+        rows = conn.execute("""
+        SELECT * FROM outbox
+        WHERE status = 'queued' AND next_attempt <= ?
+        ORDER BY next_attempt, id
+        LIMIT ?
+        """, (time.time(), limit)).fetchall()
+        conn.close()
+        return rows
+
+    def next_due(self):
+        """Epoch of the earliest queued message, or None."""
+        conn = self._connect()
+        row = conn.execute("""
+        SELECT MIN(next_attempt) FROM outbox WHERE status = 'queued'
+        """).fetchone()
+        conn.close()
+        return row[0]
+
+    def mark_sent(self, conn, row_id):
+        conn.execute("""
+        UPDATE outbox SET status = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL
+        WHERE id = ?
+        """, (_now(), row_id))
+
+    def mark_failed(self, conn, row, error, permanent=False):
+        attempts = row["attempts"] + 1
+        if permanent or attempts >= MAX_ATTEMPTS:
+            status, next_attempt = "failed", row["next_attempt"]
+        else:
+            status, next_attempt = "queued", time.time() + _backoff(attempts)
+
+        conn.execute("""
+        UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ?
+        WHERE id = ?
+        """, (status, attempts, next_attempt, str(error)[:500], row["id"]))
+
+    def note_error(self, conn, row_id, error):
+        """Record an error that was not the message's fault (attempts unchanged)."""
+        conn.execute("""
+        UPDATE outbox SET last_error = ? WHERE id = ?
+        """, (str(error)[:500], row_id))
+
+    def counts(self):
+        conn = self._connect()
+        rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        conn.close()
+        return {status: n for status, n in rows}
+
+
+# -----------------------------
+# WORKER
+# -----------------------------
+def _message_error(error):
+    """Errors about this message, not the connection (others pause the worker)."""
+    return isinstance(error, (
+        smtplib.SMTPRecipientsRefused,
+        smtplib.SMTPSenderRefused,
+        smtplib.SMTPDataError
+    ))
+
+
+def _backoff(attempts):
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempts - 1))
+    return delay * random.uniform(1, 1.25)
+
+
+def _is_permanent(error):
+    """Errors a retry cannot fix (refused recipient, 5xx reply other than auth)."""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class OutboxWorker:
+    """
+    Background thread draining the outbox over one reused SMTP connection.
+
+    - Woken at once by enqueue(), otherwise sleeps until the next retry
+      is due (at most POLL_SECONDS)
+    - The connection stays open across messages and batches and is
+      closed after IDLE_CLOSE seconds without mail
+    - A failed message is retried with exponential backoff; the
+      connection is dropped so the retry starts from a fresh session
+    - If the server itself is unreachable (connect, TLS, login) the
+      whole worker backs off instead of trying every queued message;
+      the message keeps its attempts, so outages never fail it
+    """
+
+    def __init__(self, outbox, connection_factory=SMTPConnection):
+        self.outbox = outbox
+        self.connection_factory = connection_factory
+        self.conn = None
+        self.down_until = 0.0
+        self._outages = 0
+
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.sent = 0
+        self.failures = 0
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.outbox.wakeup.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.outbox.wakeup.clear()
+            try:
+                while not self._stop.is_set() and self.drain():
+                    pass
+            except Exception:
+                traceback.print_exc()
+
+            next_due = self.outbox.next_due()
+            if next_due is None:
+                wait = POLL_SECONDS
+            else:
+                wait = min(POLL_SECONDS, max(0, max(next_due, self.down_until) - time.time()))
+            if self.conn is not None:
+                wait = min(wait, max(0, IDLE_CLOSE - self.conn.idle_seconds))
+
+            self.outbox.wakeup.wait(wait)
+
+            if self.conn is not None and self.conn.idle_seconds >= IDLE_CLOSE:
+                self.conn.close()
+                self.conn = None
+
+        if self.conn is not None:
+            self.conn.close()
+
+    def drain(self):
+        """Send one batch of due messages. Returns the number sent."""
+        if time.time() < self.down_until:
+            return 0
+        rows = self.outbox.due()
+        if not rows:
+            return 0
+
+        if self.conn is None:
+            self.conn = self.connection_factory()
+
+        sent = 0
+        db = self.outbox._connect()
+        for row in rows:
+            if self._stop.is_set():
+                break
+            try:
+                self.conn.send(build_message(row["to_email"], row["subject"], row["body"]))
+            except Exception as e:
+                print("Email error:", e)
+                self.failures += 1
+                self.conn.close()
+                if _message_error(e):
+                    with db:
+                        self.outbox.mark_failed(db, row, e, permanent=_is_permanent(e))
+                    continue
+
+                with db:
+                    self.outbox.note_error(db, row["id"], e)
+                self._outages += 1
+                self.down_until = time.time() + _backoff(self._outages)
+                break
+
+            self._outages = 0
+            self.sent += 1
+            sent += 1
+            with db:
+                self.outbox.mark_sent(db, row["id"])
+        db.close()
+        return sent
+
+
+# -----------------------------
+# WEEKLY SCHEDULE
+# -----------------------------
+def next_weekly_run(now, weekday, hour):
+    """Next datetime on `weekday` (0 = Monday) at `hour`:00 after `now`."""
+    run = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    run += timedelta(days=(weekday - now.weekday()) % 7)
+    if run <= now:
+        run += timedelta(days=7)
+    return run
+
+
+def schedule_weekly(callback, weekday=6, hour=18):
+    """Run callback() every week on `weekday` at `hour`:00 (daemon thread)."""
+
+    def loop():
+        while True:
+            run = next_weekly_run(datetime.now(), weekday, hour)
+            # Short sleeps so clock changes / suspend don't skip a week
+            while datetime.now() < run:
+                time.sleep(min(3600, max(1, (run - datetime.now()).total_seconds())))
+            try:
+                callback()
+            except Exception:
+                traceback.print_exc()
+
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    return thread
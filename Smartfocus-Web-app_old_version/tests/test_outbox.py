@@ -0,0 +1,164 @@
+import smtplib
+from datetime import datetime
+
+import pytest
+
+from smart_focus.analytics.parents import queue_weekly_parent_reports
+from smart_focus.utils.outbox import MAX_ATTEMPTS, Outbox, OutboxWorker
+
+
+class FakeConnection:
+    """
+    Stands in for SMTPConnection. `script` holds one entry per send():
+    None to accept the message, or an exception to raise.
+    """
+
+    def __init__(self, script=()):
+        self.script = list(script)
+        self.sent = []
+        self.closes = 0
+        self.idle_seconds = 0
+
+    def send(self, msg):
+        outcome = self.script.pop(0) if self.script else None
+        if outcome is not None:
+            raise outcome
+        self.sent.append(msg["To"])
+
+    def close(self):
+        self.closes += 1
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return Outbox(str(tmp_path))
+
+
+def make_worker(outbox, script=()):
+    conn = FakeConnection(script)
+    return OutboxWorker(outbox, connection_factory=lambda: conn), conn
+
+
+def rows(outbox):
+    db = outbox._connect()
+    result = {r["to_email"]: dict(r) for r in db.execute("SELECT * FROM outbox")}
+    db.close()
+    return result
+
+
+# -----------------------------
+# SEND / REFUSE
+# -----------------------------
+def test_drain_sends_every_due_message_on_one_connection(outbox):
+    outbox.enqueue("a@example.com", "s", "b")
+    outbox.enqueue("b@example.com", "s", "b")
+    worker, conn = make_worker(outbox)
+
+    assert worker.drain() == 2
+    assert conn.sent == ["a@example.com", "b@example.com"]
+    assert outbox.counts() == {"sent": 2}
+    assert rows(outbox)["a@example.com"]["attempts"] == 1
+
+
+def test_refused_recipient_fails_only_that_message(outbox):
+    outbox.enqueue("bad@example.com", "s", "b")
+    outbox.enqueue("good@example.com", "s", "b")
+    refused = smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no such user")})
+    worker, conn = make_worker(outbox, [refused])
+
+    assert worker.drain() == 1
+    assert conn.sent == ["good@example.com"]
+    assert outbox.counts() == {"failed": 1, "sent": 1}
+
+    bad = rows(outbox)["bad@example.com"]
+    assert bad["attempts"] == 1
+    assert "no such user" in bad["last_error"]
+    assert worker.down_until == 0.0
+
+
+def test_temporary_message_error_is_retried_later(outbox):
+    outbox.enqueue("a@example.com", "s", "b")
+    worker, _ = make_worker(outbox, [smtplib.SMTPDataError(451, b"try again")])
+
+    assert worker.drain() == 0
+    row = rows(outbox)["a@example.com"]
+    assert row["status"] == "queued"
+    assert row["attempts"] == 1
+    assert outbox.due() == []
+
+
+# -----------------------------
+# OUTAGE
+# -----------------------------
+def test_outage_backs_off_the_worker_without_charging_the_message(outbox):
+    outbox.enqueue("a@example.com", "s", "b")
+    outbox.enqueue("b@example.com", "s", "b")
+    down = smtplib.SMTPServerDisconnected("connection refused")
+    worker, conn = make_worker(outbox, [down])
+
+    assert worker.drain() == 0
+    assert conn.sent == []
+    assert worker.down_until > 0
+
+    a = rows(outbox)["a@example.com"]
+    assert a["status"] == "queued"
+    assert a["attempts"] == 0
+    assert "connection refused" in a["last_error"]
+    assert rows(outbox)["b@example.com"]["last_error"] is None
+
+    # Still backed off: nothing is tried
+    assert worker.drain() == 0
+    assert conn.sent == []
+
+
+def test_repeated_outages_never_fail_a_message(outbox):
+    outbox.enqueue("a@example.com", "s", "b")
+    login = smtplib.SMTPAuthenticationError(535, b"bad credentials")
+    worker, conn = make_worker(outbox, [login] * (MAX_ATTEMPTS + 2))
+
+    for _ in range(MAX_ATTEMPTS + 2):
+        worker.down_until = 0.0
+        assert worker.drain() == 0
+
+    assert outbox.counts() == {"queued": 1}
+    assert rows(outbox)["a@example.com"]["attempts"] == 0
+
+    # Server back: the message goes out and the outage count resets
+    worker.down_until = 0.0
+    assert worker.drain() == 1
+    assert conn.sent == ["a@example.com"]
+    assert worker._outages == 0
+
+
+# -----------------------------
+# WEEKLY BATCH
+# -----------------------------
+def test_weekly_reports_are_queued_once_per_week(tmp_path, outbox):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    (tmp_path / "users.csv").write_text(
+        "user,grade,student_phone,parent_name,parent_email,parent_phone\n"
+        "Asha,6,1,P1,p1@example.com,1\n"
+        "Ravi,7,2,P2,p2@example.com,2\n"
+        "Noemail,7,3,P3,,3\n"
+    )
+    (tmp_path / "sessions.csv").write_text(
+        "timestamp,user,mode,focused_seconds,distracted_seconds,goal_hours,goal_achieved,focus_score\n"
+        f"{now},asha,no_camera,600,60,0.1,True,90\n"
+        f"{now},ravi,no_camera,300,30,0.1,False,80\n"
+        f"{now},noemail,no_camera,300,30,0.1,False,80\n"
+    )
+
+    assert queue_weekly_parent_reports(str(tmp_path), outbox) == 2
+    assert queue_weekly_parent_reports(str(tmp_path), outbox) == 0
+    assert outbox.counts() == {"queued": 2}
+
+    year, week, _ = datetime.now().isocalendar()
+    db = outbox._connect()
+    keys = sorted(r[0] for r in db.execute("SELECT dedupe_key FROM outbox"))
+    db.close()
+    assert keys == [f"weekly:asha:{year}-W{week:02d}", f"weekly:ravi:{year}-W{week:02d}"]
+
+    worker, conn = make_worker(outbox)
+    assert worker.drain() == 2
+    assert sorted(conn.sent) == ["p1@example.com", "p2@example.com"]
+    assert queue_weekly_parent_reports(str(tmp_path), outbox) == 0
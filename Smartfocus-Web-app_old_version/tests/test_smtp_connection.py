@@ -0,0 +1,228 @@
+"""
+SMTPConnection and OutboxWorker against a local aiosmtpd server
+(pip install aiosmtpd; skipped without it). STARTTLS tests also need
+the openssl command for a throwaway certificate.
+"""
+
+import shutil
+import smtplib
+import socket
+import ssl
+import subprocess
+
+import pytest
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+from aiosmtpd.smtp import AuthResult
+
+from smart_focus.utils import emailer
+from smart_focus.utils.emailer import EmailNotConfigured, SMTPConnection, build_message
+from smart_focus.utils.outbox import Outbox, OutboxWorker
+
+USER = "sender@example.com"
+PASSWORD = "app-password"
+
+
+class Handler:
+    """Records what the server saw; `drop_next_mail` hangs up on the next MAIL."""
+
+    def __init__(self):
+        self.messages = []
+        self.noops = 0
+        self.logins = []
+        self.drop_next_mail = False
+
+    async def handle_NOOP(self, server, session, envelope, arg):
+        self.noops += 1
+        return "250 OK"
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        if self.drop_next_mail:
+            self.drop_next_mail = False
+            server.transport.close()
+            return "421 closing"
+        envelope.mail_from = address
+        envelope.mail_options.extend(mail_options)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, session.ssl is not None))
+        return "250 OK"
+
+    def authenticate(self, server, session, envelope, mechanism, auth_data):
+        login, password = auth_data.login.decode(), auth_data.password.decode()
+        self.logins.append(login)
+        return AuthResult(success=(login, password) == (USER, PASSWORD), handled=False)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(handler, **smtp_kwargs):
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port(), **smtp_kwargs)
+    controller.start()
+    return controller
+
+
+@pytest.fixture
+def handler():
+    return Handler()
+
+
+@pytest.fixture
+def plain_server(handler):
+    controller = start_server(
+        handler,
+        authenticator=handler.authenticate,
+        auth_require_tls=False
+    )
+    yield controller
+    controller.stop()
+
+
+@pytest.fixture(scope="module")
+def tls_context(tmp_path_factory):
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl not available")
+    folder = tmp_path_factory.mktemp("tls")
+    cert, key = folder / "cert.pem", folder / "key.pem"
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+        "-keyout", str(key), "-out", str(cert), "-days", "1", "-subj", "/CN=localhost"
+    ], check=True, capture_output=True)
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    return context
+
+
+def connection(server, **kwargs):
+    options = {"user": USER, "password": PASSWORD, "starttls": False, "timeout": 5}
+    options.update(kwargs)
+    return SMTPConnection(host=server.hostname, port=server.port, **options)
+
+
+def message(to_email="parent@example.com"):
+    return build_message(to_email, "Weekly Focus Report", "body")
+
+
+# -----------------------------
+# SMTPConnection
+# -----------------------------
+def test_messages_reuse_one_authenticated_connection(plain_server, handler):
+    conn = connection(plain_server)
+    try:
+        for i in range(3):
+            conn.send(message(f"parent{i}@example.com"))
+    finally:
+        conn.close()
+
+    assert conn.connects == 1
+    assert handler.logins == [USER]
+    assert [rcpt for rcpt, _ in handler.messages] == [
+        ["parent0@example.com"], ["parent1@example.com"], ["parent2@example.com"]
+    ]
+
+
+def test_starttls_then_login(handler, tls_context):
+    server = start_server(
+        handler,
+        tls_context=tls_context,
+        require_starttls=True,
+        authenticator=handler.authenticate
+    )
+    conn = connection(server, starttls=True)
+    try:
+        conn.send(message())
+    finally:
+        conn.close()
+        server.stop()
+
+    assert handler.logins == [USER]
+    assert handler.messages == [(["parent@example.com"], True)]
+
+
+def test_wrong_password_is_an_authentication_error(plain_server, handler):
+    conn = connection(plain_server, password="wrong")
+    with pytest.raises(smtplib.SMTPAuthenticationError):
+        conn.send(message())
+
+    assert conn.connects == 0
+    assert handler.messages == []
+
+
+def test_missing_password_never_connects(plain_server, handler):
+    conn = connection(plain_server, password="")
+    with pytest.raises(EmailNotConfigured):
+        conn.send(message())
+
+    assert conn.connects == 0
+    assert handler.logins == []
+
+
+def test_idle_connection_is_probed_with_noop(plain_server, handler, monkeypatch):
+    monkeypatch.setattr(emailer, "NOOP_AFTER", 0)
+    conn = connection(plain_server)
+    try:
+        conn.send(message())
+        conn.send(message())
+    finally:
+        conn.close()
+
+    assert handler.noops == 1
+    assert conn.connects == 1
+    assert len(handler.messages) == 2
+
+
+def test_reconnects_when_the_server_hangs_up(plain_server, handler):
+    conn = connection(plain_server)
+    try:
+        conn.send(message())
+        handler.drop_next_mail = True
+        conn.send(message())
+    finally:
+        conn.close()
+
+    assert conn.connects == 2
+    assert len(handler.messages) == 2
+
+
+# -----------------------------
+# OutboxWorker over a real connection
+# -----------------------------
+def test_worker_drains_the_outbox_over_one_connection(plain_server, handler, tmp_path):
+    outbox = Outbox(str(tmp_path))
+    outbox.enqueue("a@example.com", "s", "b")
+    outbox.enqueue("b@example.com", "s", "b")
+    conns = []
+
+    def factory():
+        conns.append(connection(plain_server))
+        return conns[-1]
+
+    worker = OutboxWorker(outbox, connection_factory=factory)
+    assert worker.drain() == 2
+    worker.conn.close()
+
+    assert len(conns) == 1 and conns[0].connects == 1
+    assert outbox.counts() == {"sent": 2}
+    assert [rcpt for rcpt, _ in handler.messages] == [["a@example.com"], ["b@example.com"]]
+
+
+def test_login_outage_leaves_the_message_queued(plain_server, handler, tmp_path):
+    outbox = Outbox(str(tmp_path))
+    outbox.enqueue("a@example.com", "s", "b")
+
+    worker = OutboxWorker(outbox, connection_factory=lambda: connection(plain_server, password="wrong"))
+    assert worker.drain() == 0
+
+    assert worker.down_until > 0
+    db = outbox._connect()
+    row = db.execute("SELECT status, attempts FROM outbox").fetchone()
+    db.close()
+    assert tuple(row) == ("queued", 0)
+    assert handler.messages == []